@@ -1,11 +1,16 @@
 from flask import Flask , request
 from backend.presentation.routes import bp as routes
+from backend.dal import unitOfWork
+from backend.dal.dbconfig import dbconfig
+from backend.service.notificationService import get_notification_manager
 
 
 
 app = Flask(__name__)
 app.secret_key = 'replace_with_a_secure_random_key'  # Required for session support
 app.register_blueprint(routes)
+unitOfWork.init_app(app)  # One DB connection per request, committed once
+get_notification_manager(dbconfig())  # Register notification observers once at startup
 
 
 if __name__ == '__main__':
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout"""
+    pass
+
+
+class PooledConnection:
+    """Proxy around a raw MySQL connection that returns itself to the pool on close()"""
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._raw = raw_conn
+        self._released = False
+
+    def close(self):
+        """Return the connection to the pool instead of closing the socket"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._raw)
+
+    def is_connected(self):
+        return not self._released and self._raw.is_connected()
+
+    def __getattr__(self, name):
+        if self._released:
+            raise RuntimeError("Connection has already been returned to the pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for callers that never close (e.g. UserDAL keeps its connection)
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections with health checks and metrics"""
+
+    def __init__(self, connect, min_size=2, max_size=10, checkout_timeout=5.0, max_idle_time=300):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle_time = max_idle_time
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (raw_conn, returned_at)
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+
+        # Metrics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._total_checkout_time = 0.0
+        self._max_checkout_time = 0.0
+
+        self._prefill()
+
+    def _prefill(self):
+        """Open min_size connections up front; failures are retried lazily on checkout"""
+        for _ in range(self.min_size):
+            try:
+                raw = self._connect()
+            except Exception:
+                break
+            with self._lock:
+                self._idle.append((raw, time.monotonic()))
+                self._size += 1
+
+    def get_connection(self):
+        """Borrow a healthy connection, waiting up to checkout_timeout seconds"""
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+
+        while True:
+            raw = None
+            create = False
+            with self._lock:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.checkout_timeout}s "
+                            f"(pool size {self.max_size}, in use {self._in_use})"
+                        )
+                    self._waiters += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                else:
+                    # Reserve a slot before connecting outside the lock
+                    self._size += 1
+                    create = True
+                self._in_use += 1
+
+            if create:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._forget_slot()
+                    raise
+            elif not self._is_healthy(raw, returned_at):
+                self._discard(raw)
+                continue
+
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._checkouts += 1
+                self._total_checkout_time += elapsed
+                self._max_checkout_time = max(self._max_checkout_time, elapsed)
+            return PooledConnection(self, raw)
+
+    def _is_healthy(self, raw, returned_at):
+        """Health check on borrow: drop stale connections and ping the rest"""
+        if time.monotonic() - returned_at > self.max_idle_time:
+            return False
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _release(self, raw):
+        """Reset transaction state and put the connection back on the idle stack"""
+        try:
+            raw.rollback()
+            healthy = raw.is_connected()
+        except Exception:
+            healthy = False
+
+        if not healthy:
+            self._discard(raw)
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            self._idle.append((raw, time.monotonic()))
+            self._lock.notify()
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._discarded += 1
+        self._forget_slot()
+
+    def _forget_slot(self):
+        with self._lock:
+            self._size -= 1
+            self._in_use -= 1
+            self._lock.notify()
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones are closed when released)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for raw, _ in idle:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def get_metrics(self):
+        """Snapshot of pool usage for monitoring"""
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "avg_checkout_ms": round(self._total_checkout_time / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_checkout_ms": round(self._max_checkout_time * 1000, 3)
+            }
@@ -1,3 +1,9 @@
+from backend.dal.metadataCache import invalidate_course
+from backend.dal.courseCatalogCache import course_catalog, invalidate_catalog_course
+from backend.dal.scheduleCache import invalidate_all_schedules
+from backend.dal.studentProgress import get_course_student_ids, refresh_student_progress
+
+
 class Course():
     def __init__(self, db):
         self.db = db        
@@ -7,30 +13,39 @@ class Course():
             VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
         cursor.execute(query, (courseName,description,capacity,availableSeats,credits,degree_ID,dept_Id,preReqYear,allowedDeptID,facultyMem_Id,addedBy))
         conn.commit()
+        invalidate_catalog_course(cursor.lastrowid)
         return {"status": "Success", "message": "Course added successfully"}
     
     def getAllCourses(self, cursor):
+        """Catalog listing, served from the in-process catalog cache"""
+        return course_catalog.get_all_courses(cursor)
+    
+    def getCoursesPage(self, cursor, fields=None, after=None, limit=50):
+        """Keyset page of the catalog listing, served from the catalog cache"""
+        return course_catalog.get_page(cursor, fields, after, limit)
+    
+    def getCoursesForEligibility(self, cursor, course_ids=None):
+        """Get the catalog columns needed to evaluate enrollment eligibility"""
         query = """
-        SELECT C.courseName,U.firstName,U.lastName,dept.deptName,C.availableSeats,C.capacity,C.course_id
+        SELECT C.course_id, C.courseName, U.firstName, U.lastName, dept.deptName,
+               C.availableSeats, C.capacity, C.preReqYear
         FROM Course AS C
         JOIN Users as U ON C.facultyMem_Id = U.user_id
         JOIN Department as dept ON C.dept_Id = dept.dept_Id
         """
-        cursor.execute(query)
+        params = ()
+        if course_ids is not None:
+            if not course_ids:
+                return []
+            placeholders = ", ".join(["%s"] * len(course_ids))
+            query += f" WHERE C.course_id IN ({placeholders})"
+            params = tuple(course_ids)
+        cursor.execute(query, params)
         courses = cursor.fetchall()
         return courses
     
     def getCourseById(self, cursor, course_id):
-        query = """
-        SELECT C.course_id, C.courseName, C.description, C.capacity, C.availableSeats, 
-               C.credits, C.degree_ID, C.dept_Id, C.preReqYear, C.allowedDeptID, 
-               C.facultyMem_Id, C.addedBy
-        FROM Course AS C
-        WHERE C.course_id = %s
-        """
-        cursor.execute(query, (course_id,))
-        course = cursor.fetchone()
-        return course
+        return course_catalog.get_course(cursor, course_id)
     
     def updateCourse(self, cursor, conn, course_id, courseName, description, capacity, availableSeats, credits, degree_ID, dept_Id, preReqYear, allowedDeptID, facultyMem_Id):
         query = """
@@ -42,7 +57,13 @@ class Course():
         """
         cursor.execute(query, (courseName, description, capacity, availableSeats, credits, 
                               degree_ID, dept_Id, preReqYear, allowedDeptID, facultyMem_Id, course_id))
+        # Credits count towards the enrolled students' progress
+        student_ids = get_course_student_ids(cursor, course_id)
         conn.commit()
+        refresh_student_progress(student_ids)
+        invalidate_course(course_id)
+        invalidate_catalog_course(course_id)
+        invalidate_all_schedules()
         return {"status": "Success", "message": "Course updated successfully"}
     
     def deleteCourse(self, cursor, conn, course_id):
@@ -53,75 +74,27 @@ class Course():
             return {"status": "Error", "message": "Course not found"}
         
         # Delete the course
+        student_ids = get_course_student_ids(cursor, course_id)
         delete_query = "DELETE FROM Course WHERE course_id = %s"
         cursor.execute(delete_query, (course_id,))
         conn.commit()
+        refresh_student_progress(student_ids)
+        invalidate_course(course_id)
+        invalidate_catalog_course(course_id)
+        invalidate_all_schedules()
         return {"status": "Success", "message": "Course deleted successfully"}
     
     def searchCourses(self, cursor, department=None, course_number=None, keyword=None, instructor_name=None):
         """
-        Search courses with various filters
+        Search courses with various filters, evaluated against the cached
+        catalog; keyword results are ranked by the catalog search index
         """
-        query = """
-        SELECT C.course_id, C.courseName, C.description, C.capacity, C.availableSeats, 
-               C.credits, C.preReqYear, dept.deptName, U.firstName, U.lastName,
-               deg.name
-        FROM Course AS C
-        JOIN Users as U ON C.facultyMem_Id = U.user_id
-        JOIN Department as dept ON C.dept_Id = dept.dept_Id
-        JOIN Degree as deg ON C.degree_ID = deg.degree_ID
-        WHERE 1=1
-        """
-        
-        params = []
-        
-        # Add department filter
-        if department:
-            query += " AND dept.deptName LIKE %s"
-            params.append(f"%{department}%")
-        
-        # Add course number filter (assuming course number is part of courseName)
-        if course_number:
-            query += " AND C.courseName LIKE %s"
-            params.append(f"%{course_number}%")
-        
-        # Add keyword filter (search in course name and description)
-        if keyword:
-            query += " AND (C.courseName LIKE %s OR C.description LIKE %s)"
-            params.append(f"%{keyword}%")
-            params.append(f"%{keyword}%")
-        
-        # Add instructor name filter
-        if instructor_name:
-            query += " AND (U.firstName LIKE %s OR U.lastName LIKE %s OR CONCAT(U.firstName, ' ', U.lastName) LIKE %s)"
-            params.append(f"%{instructor_name}%")
-            params.append(f"%{instructor_name}%")
-            params.append(f"%{instructor_name}%")
-        
-        query += " ORDER BY dept.deptName, C.courseName"
-        
-        cursor.execute(query, params)
-        courses = cursor.fetchall()
-        return courses
+        return course_catalog.search(cursor, department=department, course_number=course_number,
+                                     keyword=keyword, instructor_name=instructor_name)
     
     def getCoursesByDepartmentAndInstructor(self, cursor, department, instructor_name):
         """
         Specific use case: Get all courses from a department taught by a specific instructor
         """
-        query = """
-        SELECT C.course_id, C.courseName, C.description, C.capacity, C.availableSeats, 
-               C.credits, C.preReqYear, dept.deptName, U.firstName, U.lastName,
-               deg.name
-        FROM Course AS C
-        JOIN Users as U ON C.facultyMem_Id = U.user_id
-        JOIN Department as dept ON C.dept_Id = dept.dept_Id
-        JOIN Degree as deg ON C.degree_ID = deg.degree_ID
-        WHERE dept.deptName LIKE %s 
-        AND (U.firstName LIKE %s OR U.lastName LIKE %s OR CONCAT(U.firstName, ' ', U.lastName) LIKE %s)
-        ORDER BY C.courseName
-        """
-        
-        params = [f"%{department}%", f"%{instructor_name}%", f"%{instructor_name}%", f"%{instructor_name}%"]
-        cursor.execute(query, params)
-        courses = cursor.fetchall()
-        return courses
\ No newline at end of file
+        return course_catalog.search(cursor, department=department, instructor_name=instructor_name,
+                                     order_by_department=False)
@@ -0,0 +1,371 @@
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from collections import namedtuple
+from flask import g, has_request_context
+from backend.dal.dbconfig import dbconfig
+from backend.dal.unitOfWork import after_commit
+from backend.dal.courseSearchIndex import CourseSearchIndex
+from backend.dal.keysetQuery import encode_cursor, decode_cursor
+
+# Static course attributes plus the joined names the catalog queries return.
+# has_* flags record whether the inner joins of the original queries matched.
+CatalogCourse = namedtuple("CatalogCourse", [
+    "course_id", "courseName", "description", "capacity", "credits", "degree_ID", "dept_Id",
+    "preReqYear", "allowedDeptID", "facultyMem_Id", "addedBy", "firstName", "lastName",
+    "deptName", "degreeName", "has_instructor", "has_department", "has_degree"
+])
+
+# Fields a catalog page can project
+PAGE_FIELDS = ("course_id", "courseName", "description", "capacity", "availableSeats", "credits",
+               "preReqYear", "firstName", "lastName", "deptName", "degreeName")
+
+
+class CourseCatalogCache:
+    """In-process read-through cache for the course catalog.
+
+    Static attributes change only through course writes and are reloaded per
+    invalidated course. availableSeats changes on every enroll/drop, so seats
+    are kept in a separate map and refreshed for just the courses whose seats
+    were touched. Every change bumps `version`, which callers can use as an
+    ETag. Both parts also expire after a TTL, to pick up writes made by other
+    processes. Keyword search goes through an inverted index (`index`) that
+    is updated course by course as static attributes are reloaded.
+
+    Reloads run on a connection from the reserved pool, so a request's
+    uncommitted writes are never published to the whole process and a reload
+    never waits for a request connection. Courses the current request wrote
+    are read on the caller's cursor instead, so the request sees its own
+    seat and course updates.
+    """
+
+    STATIC_QUERY = """
+    SELECT C.course_id, C.courseName, C.description, C.capacity, C.credits, C.degree_ID,
+           C.dept_Id, C.preReqYear, C.allowedDeptID, C.facultyMem_Id, C.addedBy,
+           U.firstName, U.lastName, dept.deptName, deg.name,
+           U.user_id IS NOT NULL, dept.dept_Id IS NOT NULL, deg.degree_ID IS NOT NULL,
+           C.availableSeats
+    FROM Course AS C
+    LEFT JOIN Users as U ON C.facultyMem_Id = U.user_id
+    LEFT JOIN Department as dept ON C.dept_Id = dept.dept_Id
+    LEFT JOIN Degree as deg ON C.degree_ID = deg.degree_ID
+    """
+
+    def __init__(self, static_ttl=300.0, seat_ttl=10.0):
+        self.static_ttl = static_ttl
+        self.seat_ttl = seat_ttl
+        self.instance_id = uuid.uuid4().hex[:8]
+        self._courses = {}       # course_id -> CatalogCourse
+        self._seats = {}         # course_id -> availableSeats
+        self._full_reload = True
+        self._static_dirty = set()
+        self._seat_dirty = set()
+        self._static_loaded_at = 0.0
+        self._seats_loaded_at = 0.0
+        self._version = 0
+        self.index = CourseSearchIndex()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._stats = {"hits": 0, "full_loads": 0, "course_reloads": 0, "seat_reloads": 0}
+
+    # ---- reads ----
+
+    def get_all_courses(self, cursor):
+        """Rows shaped like Course.getAllCourses"""
+        return self.get_all_courses_versioned(cursor)[0]
+
+    def get_all_courses_versioned(self, cursor):
+        """(getAllCourses rows, version they were built from)"""
+        courses, seats, version = self.snapshot(cursor)
+        rows = [
+            (c.courseName, c.firstName, c.lastName, c.deptName, seats.get(c.course_id), c.capacity, c.course_id)
+            for c in courses if c.has_instructor and c.has_department
+        ]
+        return rows, version
+
+    def get_page(self, cursor, fields=None, after=None, limit=50):
+        """Keyset page of the catalog listing ordered by course id, as row dicts"""
+        if fields:
+            unknown = [name for name in fields if name not in PAGE_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        names = [name for name in PAGE_FIELDS if not fields or name in fields]
+        courses, seats, _ = self.snapshot(cursor)
+        courses = [c for c in courses if c.has_instructor and c.has_department]
+
+        start = 0
+        if after:
+            last_id = decode_cursor(after, 1)[0]
+            start = bisect_right([c.course_id for c in courses], last_id)
+        page = courses[start:start + limit]
+        has_more = start + limit < len(courses)
+        return {
+            "data": [
+                {name: seats.get(c.course_id) if name == "availableSeats" else getattr(c, name) for name in names}
+                for c in page
+            ],
+            "next_cursor": encode_cursor([page[-1].course_id]) if page and has_more else None,
+            "has_more": has_more
+        }
+
+    def get_course(self, cursor, course_id):
+        """Row shaped like Course.getCourseById, or None"""
+        if course_id in _written_by_request():
+            c, seats = self._read_own(cursor, [course_id]).get(course_id, (None, None))
+        else:
+            self._refresh_if_stale(cursor)
+            with self._lock:
+                c = self._courses.get(course_id)
+                seats = self._seats.get(course_id)
+        if c is None:
+            return None
+        return (c.course_id, c.courseName, c.description, c.capacity, seats, c.credits, c.degree_ID,
+                c.dept_Id, c.preReqYear, c.allowedDeptID, c.facultyMem_Id, c.addedBy)
+
+    def search(self, cursor, department=None, course_number=None, keyword=None, instructor_name=None,
+               order_by_department=True):
+        """Rows shaped like Course.searchCourses.
+
+        The keyword is matched through the search index (prefix and fuzzy term
+        matches, best ranked first); the other filters are case-insensitive
+        substring matches on their column.
+        """
+        courses, seats, _ = self.snapshot(cursor)
+        department = department.casefold() if department else None
+        course_number = course_number.casefold() if course_number else None
+        instructor_name = instructor_name.casefold() if instructor_name else None
+
+        if keyword:
+            by_id = {c.course_id: c for c in courses}
+            courses = [by_id[course_id] for course_id, _ in self.index.search(keyword) if course_id in by_id]
+
+        matches = []
+        for c in courses:
+            if not (c.has_instructor and c.has_department and c.has_degree):
+                continue
+            if department and department not in (c.deptName or "").casefold():
+                continue
+            if course_number and course_number not in (c.courseName or "").casefold():
+                continue
+            if instructor_name:
+                first, last = (c.firstName or "").casefold(), (c.lastName or "").casefold()
+                if instructor_name not in first and instructor_name not in last \
+                        and instructor_name not in f"{first} {last}":
+                    continue
+            matches.append(c)
+
+        # Keyword results keep their rank order
+        if not keyword:
+            if order_by_department:
+                matches.sort(key=lambda c: ((c.deptName or "").casefold(), (c.courseName or "").casefold()))
+            else:
+                matches.sort(key=lambda c: (c.courseName or "").casefold())
+        return [
+            (c.course_id, c.courseName, c.description, c.capacity, seats.get(c.course_id), c.credits,
+             c.preReqYear, c.deptName, c.firstName, c.lastName, c.degreeName)
+            for c in matches
+        ]
+
+    def snapshot(self, cursor):
+        """(courses ordered by id, seats by id, version), refreshed if anything is stale"""
+        self._refresh_if_stale(cursor)
+        with self._lock:
+            courses, seats, version = dict(self._courses), dict(self._seats), self._version
+        # Overlay what the current request wrote, as its own connection sees it
+        for course_id, (course, seat) in self._read_own(cursor, _written_by_request()).items():
+            if course is None:
+                courses.pop(course_id, None)
+                seats.pop(course_id, None)
+            else:
+                courses[course_id] = course
+                seats[course_id] = seat
+        return [courses[course_id] for course_id in sorted(courses)], seats, version
+
+    def current_version(self, cursor):
+        self._refresh_if_stale(cursor)
+        with self._lock:
+            return self._version
+
+    def etag(self, version):
+        return f"courses-{self.instance_id}-{version}"
+
+    def get_stats(self):
+        with self._lock:
+            return {**self._stats, "courses": len(self._courses), "indexed": len(self.index), "version": self._version,
+                    "static_ttl": self.static_ttl, "seat_ttl": self.seat_ttl}
+
+    # ---- invalidation ----
+
+    def invalidate_course(self, course_id):
+        """Static attributes (and seats) of one course changed, or it was added/deleted"""
+        with self._lock:
+            self._static_dirty.add(course_id)
+            self._version += 1
+
+    def invalidate_seats(self, course_id):
+        with self._lock:
+            self._seat_dirty.add(course_id)
+            self._version += 1
+
+    def invalidate_related(self, field, value):
+        """Joined names changed: reload the courses whose facultyMem_Id, dept_Id or degree_ID equals value"""
+        with self._lock:
+            ids = {course_id for course_id, c in self._courses.items() if getattr(c, field) == value}
+            if ids:
+                self._static_dirty |= ids
+                self._version += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            self._full_reload = True
+            self._version += 1
+
+    # ---- loading ----
+
+    def _is_stale(self, now):
+        return (self._full_reload or self._static_dirty or self._seat_dirty
+                or now - self._static_loaded_at > self.static_ttl
+                or now - self._seats_loaded_at > self.seat_ttl)
+
+    def _refresh_if_stale(self, cursor):
+        with self._lock:
+            if not self._is_stale(time.monotonic()):
+                self._stats["hits"] += 1
+                return
+        with self._load_lock:
+            with self._lock:
+                now = time.monotonic()
+                if not self._is_stale(now):
+                    return
+                # Take ownership of the pending work; invalidations arriving while
+                # we query mark their courses dirty again for the next read
+                full = self._full_reload or now - self._static_loaded_at > self.static_ttl
+                all_seats = now - self._seats_loaded_at > self.seat_ttl
+                static_ids, seat_ids = set(self._static_dirty), set(self._seat_dirty)
+                self._full_reload = False
+                self._static_dirty.clear()
+                self._seat_dirty.clear()
+            try:
+                self._load_committed(full, all_seats, static_ids, seat_ids)
+            except Exception:
+                with self._lock:
+                    self._full_reload = self._full_reload or full
+                    self._static_dirty |= static_ids
+                    self._seat_dirty |= seat_ids
+                    if all_seats:
+                        self._seats_loaded_at = 0.0
+                raise
+
+    def _read_own(self, cursor, course_ids):
+        """{course_id: (CatalogCourse or None if deleted, seats)} read on the caller's cursor"""
+        ids = sorted(course_ids)
+        if not ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(self.STATIC_QUERY + f" WHERE C.course_id IN ({placeholders})", tuple(ids))
+        rows = {row[0]: row for row in cursor.fetchall()}
+        return {
+            course_id: (CatalogCourse(*rows[course_id][:15], *map(bool, rows[course_id][15:18])), rows[course_id][18])
+            if course_id in rows else (None, None)
+            for course_id in ids
+        }
+
+    def _load_committed(self, full, all_seats, static_ids, seat_ids):
+        conn = dbconfig().get_reserved_connection()
+        cursor = conn.cursor()
+        try:
+            self._load(cursor, full, all_seats, static_ids, seat_ids)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _load(self, cursor, full, all_seats, static_ids, seat_ids):
+        now = time.monotonic()
+        if full:
+            cursor.execute(self.STATIC_QUERY)
+            rows = cursor.fetchall()
+            with self._lock:
+                self._courses = {row[0]: CatalogCourse(*row[:15], *map(bool, row[15:18])) for row in rows}
+                self._seats = {row[0]: row[18] for row in rows}
+                self._static_loaded_at = self._seats_loaded_at = now
+                self._stats["full_loads"] += 1
+                self.index.rebuild(self._courses.values())
+            return
+
+        if static_ids:
+            ids = sorted(static_ids)
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(self.STATIC_QUERY + f" WHERE C.course_id IN ({placeholders})", tuple(ids))
+            rows = {row[0]: row for row in cursor.fetchall()}
+            with self._lock:
+                for course_id in ids:
+                    row = rows.get(course_id)
+                    if row is None:
+                        self._courses.pop(course_id, None)
+                        self._seats.pop(course_id, None)
+                        self.index.remove(course_id)
+                    else:
+                        course = self._courses[course_id] = CatalogCourse(*row[:15], *map(bool, row[15:18]))
+                        self._seats[course_id] = row[18]
+                        self.index.update(course)
+                self._stats["course_reloads"] += len(ids)
+
+        seat_ids = seat_ids - static_ids
+        if all_seats:
+            cursor.execute("SELECT course_id, availableSeats FROM Course")
+            seats = dict(cursor.fetchall())
+            with self._lock:
+                for course_id in self._courses:
+                    if course_id in seats:
+                        self._seats[course_id] = seats[course_id]
+                self._seats_loaded_at = now
+                self._stats["seat_reloads"] += len(seats)
+        elif seat_ids:
+            ids = sorted(seat_ids)
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"SELECT course_id, availableSeats FROM Course WHERE course_id IN ({placeholders})",
+                           tuple(ids))
+            seats = dict(cursor.fetchall())
+            with self._lock:
+                for course_id in ids:
+                    if course_id in seats and course_id in self._courses:
+                        self._seats[course_id] = seats[course_id]
+                self._stats["seat_reloads"] += len(ids)
+
+
+course_catalog = CourseCatalogCache(
+    static_ttl=float(os.getenv("NEXUS_CATALOG_TTL", "300")),
+    seat_ttl=float(os.getenv("NEXUS_CATALOG_SEAT_TTL", "10"))
+)
+
+
+def _written_by_request():
+    """Courses the current request wrote; its reads of them bypass the cache"""
+    return g.get("_catalog_written", set()) if has_request_context() else set()
+
+
+def _mark_written(course_id):
+    if has_request_context():
+        g.setdefault("_catalog_written", set()).add(course_id)
+
+
+def invalidate_catalog_course(course_id):
+    """A course was added, changed or deleted; reload it now and after the request commits"""
+    _mark_written(course_id)
+    course_catalog.invalidate_course(course_id)
+    after_commit(lambda: course_catalog.invalidate_course(course_id))
+
+
+def invalidate_catalog_seats(course_id):
+    """A course's availableSeats changed; refresh it now and after the request commits"""
+    _mark_written(course_id)
+    course_catalog.invalidate_seats(course_id)
+    after_commit(lambda: course_catalog.invalidate_seats(course_id))
+
+
+def invalidate_catalog_related(field, value):
+    """An instructor, department or degree name changed; reload the courses showing it now and after commit"""
+    course_catalog.invalidate_related(field, value)
+    after_commit(lambda: course_catalog.invalidate_related(field, value))
@@ -1,3 +1,32 @@
+from backend.dal.metadataCache import invalidate_course
+from backend.dal.courseCatalogCache import invalidate_catalog_course
+from backend.dal.keysetQuery import ListQuery
+
+PENDING_REQUEST_LIST = ListQuery(
+    "CourseRequest cr",
+    fields={
+        "request_id": ("cr.request_id", ()),
+        "facultyMem_Id": ("cr.facultyMem_Id", ()),
+        "course_id": ("cr.course_id", ()),
+        "requestType": ("cr.requestType", ()),
+        "details": ("cr.details", ()),
+        "requestDate": ("cr.requestDate", ()),
+        "status": ("cr.status", ()),
+        "firstName": ("u.firstName", ("faculty",)),
+        "lastName": ("u.lastName", ("faculty",)),
+        "courseName": ("c.courseName", ("course",))
+    },
+    joins={
+        "faculty": "JOIN Users u ON cr.facultyMem_Id = u.user_id",
+        "course": "JOIN Course c ON cr.course_id = c.course_id"
+    },
+    # Like the full listing, requests whose faculty or course row is gone are never listed
+    base_joins=("faculty", "course"),
+    where="cr.status = 'Pending'",
+    key=[("requestDate", "cr.requestDate"), ("request_id", "cr.request_id")]
+)
+
+
 class CourseRequest:
     def __init__(self, db):
         self.db = db
@@ -27,6 +56,10 @@ class CourseRequest:
         """
         cursor.execute(query)
         return cursor.fetchall()
+
+    def get_pending_page(self, cursor, fields=None, after=None, limit=50):
+        """One keyset page of pending requests, oldest first"""
+        return PENDING_REQUEST_LIST.fetch_page(cursor, fields, after, limit)
     
     def get_faculty_requests(self, cursor, faculty_id):
         """Get all requests submitted by a specific faculty member"""
@@ -120,6 +153,10 @@ class CourseRequest:
             """
             cursor.execute(update_query, (admin_id, request_id))
             conn.commit()
+            if request_type == "ChangeCapacity":
+                invalidate_course(course_id)
+            if request_type in ("UpdateDescription", "ChangeCapacity"):
+                invalidate_catalog_course(course_id)
             
             return {"status": "Success", "message": "Request approved and changes applied"}
             
@@ -0,0 +1,156 @@
+import re
+import threading
+from bisect import bisect_left, insort
+
+# Relative weight of a match per field of the course
+FIELD_WEIGHTS = {"name": 3.0, "department": 2.0, "instructor": 2.0, "degree": 1.5, "description": 1.0}
+# Score multiplier by how a query term matched an indexed token
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+
+_WORD = re.compile(r"[0-9a-z]+")
+_ALNUM_SPLIT = re.compile(r"[a-z]+|[0-9]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens; mixed tokens like 'cs101' also yield 'cs' and '101'"""
+    tokens = []
+    for word in _WORD.findall((text or "").casefold()):
+        tokens.append(word)
+        parts = _ALNUM_SPLIT.findall(word)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _deletes(token):
+    """The token with each single character removed (for edit-distance-1 lookups)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class CourseSearchIndex:
+    """Inverted index over course name, description, department, degree and instructor.
+
+    Postings map token -> {course_id: weight}. A sorted token list answers
+    prefix lookups with bisect, and a single-deletion map finds tokens within
+    one edit of a misspelt term without scanning the vocabulary. Courses are
+    added, replaced or removed one at a time as the catalog changes.
+    """
+
+    def __init__(self):
+        self._postings = {}   # token -> {course_id: weight}
+        self._tokens = []     # sorted vocabulary
+        self._deletes = {}    # token with one char removed -> set of tokens
+        self._documents = {}  # course_id -> {token: weight}
+        self._lock = threading.Lock()
+
+    def rebuild(self, courses):
+        with self._lock:
+            self._postings, self._tokens, self._deletes, self._documents = {}, [], {}, {}
+            for course in courses:
+                self._add(course)
+
+    def update(self, course):
+        with self._lock:
+            self._remove(course.course_id)
+            self._add(course)
+
+    def remove(self, course_id):
+        with self._lock:
+            self._remove(course_id)
+
+    def search(self, query, limit=None):
+        """[(course_id, score)] best first; every query term must match some field"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for term in terms:
+                term_scores = self._match_term(term)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {course_id: score + term_scores[course_id]
+                              for course_id, score in scores.items() if course_id in term_scores}
+                if not scores:
+                    return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def __len__(self):
+        with self._lock:
+            return len(self._documents)
+
+    def _match_term(self, term):
+        """{course_id: best score} for one query term over exact, prefix and fuzzy token matches"""
+        matches = {term: EXACT} if term in self._postings else {}
+        if len(term) >= MIN_PREFIX_LENGTH:
+            i = bisect_left(self._tokens, term)
+            while i < len(self._tokens) and self._tokens[i].startswith(term):
+                matches.setdefault(self._tokens[i], PREFIX)
+                i += 1
+        if len(term) >= MIN_FUZZY_LENGTH:
+            for candidate in self._fuzzy_candidates(term):
+                matches.setdefault(candidate, FUZZY)
+
+        scores = {}
+        for token, quality in matches.items():
+            for course_id, weight in self._postings[token].items():
+                score = weight * quality
+                if score > scores.get(course_id, 0.0):
+                    scores[course_id] = score
+        return scores
+
+    def _fuzzy_candidates(self, term):
+        # Insertion, deletion, substitution and adjacent transposition all leave
+        # the two words sharing a single-deletion variant (or one being the other's)
+        variants = _deletes(term)
+        candidates = set(self._deletes.get(term, ()))
+        for variant in variants:
+            if variant in self._postings:
+                candidates.add(variant)
+            candidates.update(self._deletes.get(variant, ()))
+        candidates.discard(term)
+        return candidates
+
+    def _add(self, course):
+        fields = {
+            "name": course.courseName,
+            "description": course.description,
+            "department": course.deptName,
+            "degree": course.degreeName,
+            "instructor": f"{course.firstName or ''} {course.lastName or ''}",
+        }
+        document = {}
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                if weight > document.get(token, 0.0):
+                    document[token] = weight
+
+        self._documents[course.course_id] = document
+        for token, weight in document.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._tokens, token)
+                for variant in _deletes(token):
+                    self._deletes.setdefault(variant, set()).add(token)
+            postings[course.course_id] = weight
+
+    def _remove(self, course_id):
+        document = self._documents.pop(course_id, None)
+        for token in document or ():
+            postings = self._postings[token]
+            postings.pop(course_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+                for variant in _deletes(token):
+                    tokens = self._deletes.get(variant)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._deletes[variant]
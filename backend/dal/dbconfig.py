@@ -1,12 +1,38 @@
+import os
+import threading
 import mysql.connector
+from backend.dal.connectionPool import ConnectionPool
+from backend.dal.unitOfWork import current_unit_of_work
+
+
 class dbconfig:
+    # Process-wide pool shared by every dbconfig instance
+    _pool = None
+    _pool_lock = threading.Lock()
+    # Small pool of its own for reads made while a request holds its connection
+    _reserved_pool = None
+
+    # Pool settings (override with environment variables or configure_pool())
+    pool_settings = {
+        "min_size": int(os.environ.get("NEXUS_DB_POOL_MIN", 2)),
+        "max_size": int(os.environ.get("NEXUS_DB_POOL_MAX", 10)),
+        "checkout_timeout": float(os.environ.get("NEXUS_DB_POOL_TIMEOUT", 5)),
+        "max_idle_time": float(os.environ.get("NEXUS_DB_POOL_MAX_IDLE", 300))
+    }
+    reserved_pool_settings = {
+        "min_size": 0,
+        "max_size": int(os.environ.get("NEXUS_DB_RESERVED_POOL_MAX", 2)),
+        "checkout_timeout": float(os.environ.get("NEXUS_DB_POOL_TIMEOUT", 5)),
+        "max_idle_time": float(os.environ.get("NEXUS_DB_POOL_MAX_IDLE", 300))
+    }
+
     def __init__(self):
         self.host = "mysql-nexusenroll.alwaysdata.net"
         self.user = "427694"
         self.password = "Ugvle@123"
         self.database = "nexusenroll_db"
 
-    def get_db_connection(self):
+    def _connect(self):
         conn = mysql.connector.connect(
             host=self.host,
             user=self.user,
@@ -16,4 +42,67 @@ class dbconfig:
 
         if conn.is_connected():
             return conn
-        return None
+        raise mysql.connector.Error("Could not connect to the database")
+
+    def _get_pool(self):
+        if dbconfig._pool is None:
+            with dbconfig._pool_lock:
+                if dbconfig._pool is None:
+                    dbconfig._pool = ConnectionPool(self._connect, **dbconfig.pool_settings)
+        return dbconfig._pool
+
+    def get_db_connection(self):
+        """Borrow a connection; conn.close() returns it.
+
+        Inside a Flask request every call shares the request's unit of work,
+        elsewhere the connection comes straight from the pool.
+        """
+        uow = current_unit_of_work(self._get_pool().get_connection)
+        if uow is not None:
+            return uow.lease()
+        return self._get_pool().get_connection()
+
+    # Alias used by CourseRequestService
+    get_connection = get_db_connection
+
+    def get_dedicated_connection(self):
+        """Borrow a pool connection outside the request's unit of work.
+
+        For work that outlives the view function, such as streamed responses
+        reading from an unbuffered cursor. The caller must close it.
+        """
+        return self._get_pool().get_connection()
+
+    def get_reserved_connection(self):
+        """Borrow a connection from the reserved pool; the caller must close it.
+
+        For short internal reads, such as cache reloads, that run while the
+        request already holds its unit-of-work connection. Request connections
+        never come from this pool, so requests waiting on it cannot exhaust it.
+        """
+        if dbconfig._reserved_pool is None:
+            with dbconfig._pool_lock:
+                if dbconfig._reserved_pool is None:
+                    dbconfig._reserved_pool = ConnectionPool(self._connect, **dbconfig.reserved_pool_settings)
+        return dbconfig._reserved_pool.get_connection()
+
+    def get_pool_metrics(self):
+        """Current pool usage (in-use, waiters, checkout latency, ...)"""
+        if dbconfig._pool is None:
+            return {"initialized": False, **dbconfig.pool_settings}
+        metrics = {"initialized": True, **dbconfig._pool.get_metrics()}
+        if dbconfig._reserved_pool is not None:
+            metrics["reserved"] = dbconfig._reserved_pool.get_metrics()
+        return metrics
+
+    @classmethod
+    def configure_pool(cls, **settings):
+        """Change pool settings; takes effect the next time the pool is created"""
+        with cls._pool_lock:
+            cls.pool_settings.update(settings)
+            if cls._pool is not None:
+                cls._pool.close_all()
+                cls._pool = None
+            if cls._reserved_pool is not None:
+                cls._reserved_pool.close_all()
+                cls._reserved_pool = None
@@ -1,4 +1,7 @@
 
+from backend.dal.courseCatalogCache import invalidate_catalog_related
+
+
 class Degree():
     def __init__(self,db):
         self.db = db
@@ -10,6 +13,8 @@ class Degree():
             query = "INSERT INTO Degree (name, credit, dept_Id) VALUES (%s, %s, %s)"
             cursor.execute(query, (name, credit, dept_Id))
             conn.commit()
+            # Courses already pointing at this id now resolve their degree name
+            invalidate_catalog_related("degree_ID", cursor.lastrowid)
             return {"status": "Success", "message": "Degree added successfully"}
         except Exception as e:
             conn.rollback()
@@ -1,4 +1,12 @@
 from abc import ABC, abstractmethod
+from backend.dal.keysetQuery import ListQuery
+from backend.dal.courseCatalogCache import invalidate_catalog_related
+
+DEPARTMENT_LIST = ListQuery(
+    "Department",
+    fields={"dept_Id": ("dept_Id", ()), "deptName": ("deptName", ())},
+    key=[("dept_Id", "dept_Id")]
+)
 # Department Factory
 class DefaultDepartmentFactory(ABC):
     @abstractmethod
@@ -13,6 +21,8 @@ class Department():
         cursor.execute("INSERT INTO Department (deptName) VALUES (%s)", (self.name,))
         conn.commit()
         self.id = cursor.lastrowid if hasattr(cursor, 'lastrowid') else cursor.lastrowid
+        # Courses already pointing at this id now resolve their department name
+        invalidate_catalog_related("dept_Id", self.id)
         return self.id
     
     def get(self, cursor):
@@ -20,6 +30,10 @@ class Department():
         cursor.execute(query)
         departments = cursor.fetchall()
         return departments
+
+    def get_page(self, cursor, fields=None, after=None, limit=50):
+        """One keyset page of departments ordered by id"""
+        return DEPARTMENT_LIST.fetch_page(cursor, fields, after, limit)
     
 
     @staticmethod
@@ -1,3 +1,29 @@
+from backend.dal.metadataCache import invalidate_course
+from backend.dal.courseCatalogCache import invalidate_catalog_seats
+from backend.dal.studentProgress import refresh_student_progress
+from backend.dal.scheduleCache import invalidate_student_schedules
+from backend.dal.keysetQuery import ListQuery
+from backend.dal.unitOfWork import commit_now
+
+ROSTER_LIST = ListQuery(
+    "Enrollment e JOIN Users u ON e.student_id = u.user_id",
+    fields={
+        "enrollment_id": ("e.enrollment_id", ()),
+        "student_id": ("e.student_id", ()),
+        "firstName": ("u.firstName", ()),
+        "lastName": ("u.lastName", ()),
+        "email": ("u.email", ()),
+        "mobileNo": ("u.mobileNo", ()),
+        "enrollmentStatus": ("e.enrollmentStatus", ()),
+        "markStatus": ("e.markStatus", ())
+    },
+    joins={"student": "JOIN Student s ON e.student_id = s.student_Id"},
+    base_joins=("student",),
+    where="e.course_id = %s AND e.enrollmentStatus = 'Active'",
+    key=[("lastName", "u.lastName"), ("firstName", "u.firstName"), ("enrollment_id", "e.enrollment_id")]
+)
+
+
 class Enrollment:
     def __init__(self, db):
         self.db = db
@@ -10,22 +36,115 @@ class Enrollment:
         """
         cursor.execute(query, (student_id, course_id))
         conn.commit()
+        invalidate_course(course_id)
+        refresh_student_progress([student_id])
+        invalidate_student_schedules([student_id])
         return {"status": "Success", "message": "Student enrolled successfully"}
 
+    def reserve_seat(self, cursor, course_id):
+        """Atomically take one seat; False means the course is full"""
+        query = """
+        UPDATE Course SET availableSeats = availableSeats - 1
+        WHERE course_id = %s AND availableSeats > 0
+        """
+        cursor.execute(query, (course_id,))
+        return cursor.rowcount == 1
+
+    def reserve_seat_and_enroll(self, cursor, conn, student_id, course_id):
+        """Take a seat and insert the enrollment in one transaction with one (immediate) commit"""
+        if not self.reserve_seat(cursor, course_id):
+            conn.rollback()
+            return {"status": "Error", "message": "Course is full. No available seats."}
+
+        query = """
+        INSERT INTO Enrollment (student_id, course_id, markStatus, enrollmentStatus)
+        VALUES (%s, %s, 'In Progress', 'Active')
+        """
+        cursor.execute(query, (student_id, course_id))
+
+        # The Course row is locked by our UPDATE, so this read is exact
+        cursor.execute("SELECT availableSeats FROM Course WHERE course_id = %s", (course_id,))
+        available_seats = cursor.fetchone()[0]
+
+        # Committed at once so the Course row lock is not held for the rest of the request
+        commit_now(conn)
+        invalidate_course(course_id)
+        invalidate_catalog_seats(course_id)
+        refresh_student_progress([student_id])
+        invalidate_student_schedules([student_id])
+        return {"status": "Success", "message": "Student enrolled successfully", "available_seats": available_seats}
+
+    def lock_course_seats(self, cursor, course_id):
+        """Lock the Course row for the rest of the transaction and return its available seats"""
+        cursor.execute("SELECT availableSeats FROM Course WHERE course_id = %s FOR UPDATE", (course_id,))
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def reserve_seats_and_enroll_many(self, cursor, conn, course_id, student_ids):
+        """Take len(student_ids) seats and insert all enrollments with one commit.
+
+        The caller must already hold the Course row lock (lock_course_seats) and
+        pass no more students than there are seats.
+        """
+        if not student_ids:
+            return {"status": "Success", "enrolled": 0}
+
+        seat_query = """
+        UPDATE Course SET availableSeats = availableSeats - %s
+        WHERE course_id = %s AND availableSeats >= %s
+        """
+        cursor.execute(seat_query, (len(student_ids), course_id, len(student_ids)))
+        if cursor.rowcount != 1:
+            conn.rollback()
+            return {"status": "Error", "message": "Course is full. No available seats."}
+
+        insert_query = """
+        INSERT INTO Enrollment (student_id, course_id, markStatus, enrollmentStatus)
+        VALUES (%s, %s, 'In Progress', 'Active')
+        """
+        cursor.executemany(insert_query, [(student_id, course_id) for student_id in student_ids])
+        commit_now(conn)
+        invalidate_course(course_id)
+        invalidate_catalog_seats(course_id)
+        refresh_student_progress(student_ids)
+        invalidate_student_schedules(student_ids)
+        return {"status": "Success", "enrolled": len(student_ids)}
+
     def drop_enrollment(self, cursor, conn, enrollment_id):
         """Drop/cancel an enrollment"""
         # First check if enrollment exists and is active
-        check_query = "SELECT enrollment_id FROM Enrollment WHERE enrollment_id = %s AND enrollmentStatus = 'Active'"
+        check_query = "SELECT enrollment_id, student_id FROM Enrollment WHERE enrollment_id = %s AND enrollmentStatus = 'Active'"
         cursor.execute(check_query, (enrollment_id,))
-        if not cursor.fetchone():
+        enrollment = cursor.fetchone()
+        if not enrollment:
             return {"status": "Error", "message": "Active enrollment not found"}
         
         # Update enrollment status to 'Dropped'
         update_query = "UPDATE Enrollment SET enrollmentStatus = 'Dropped' WHERE enrollment_id = %s"
         cursor.execute(update_query, (enrollment_id,))
         conn.commit()
+        refresh_student_progress([enrollment[1]])
+        invalidate_student_schedules([enrollment[1]])
         return {"status": "Success", "message": "Course dropped successfully"}
 
+    def release_enrollment(self, cursor, enrollment_id):
+        """Mark an active enrollment Dropped without committing; False if it was not active"""
+        query = "UPDATE Enrollment SET enrollmentStatus = 'Dropped' WHERE enrollment_id = %s AND enrollmentStatus = 'Active'"
+        cursor.execute(query, (enrollment_id,))
+        return cursor.rowcount == 1
+
+    def insert_enrollment(self, cursor, student_id, course_id):
+        """Insert an active enrollment without touching seats or committing"""
+        query = """
+        INSERT INTO Enrollment (student_id, course_id, markStatus, enrollmentStatus)
+        VALUES (%s, %s, 'In Progress', 'Active')
+        """
+        cursor.execute(query, (student_id, course_id))
+
+    def release_seat(self, cursor, course_id):
+        """Give one seat back without committing"""
+        cursor.execute("UPDATE Course SET availableSeats = availableSeats + 1 WHERE course_id = %s", (course_id,))
+
     def get_student_enrollments(self, cursor, student_id):
         """Get all active enrollments for a student"""
         query = """
@@ -92,6 +211,53 @@ class Enrollment:
         schedule = cursor.fetchall()
         return schedule
 
+    def get_student_enrolled_course_ids(self, cursor, student_id):
+        """Get the IDs of all courses a student is actively enrolled in"""
+        query = """
+        SELECT course_id FROM Enrollment
+        WHERE student_id = %s AND enrollmentStatus = 'Active'
+        """
+        cursor.execute(query, (student_id,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def get_course_schedules(self, cursor, course_ids=None):
+        """Get meeting times for many courses in one query, grouped by course_id"""
+        query = "SELECT course_id, day, startTime, endTime FROM CourseSchedule"
+        params = ()
+        if course_ids is not None:
+            if not course_ids:
+                return {}
+            placeholders = ", ".join(["%s"] * len(course_ids))
+            query += f" WHERE course_id IN ({placeholders})"
+            params = tuple(course_ids)
+        cursor.execute(query, params)
+
+        schedules = {}
+        for course_id, day, start_time, end_time in cursor.fetchall():
+            schedules.setdefault(course_id, []).append((day, start_time, end_time))
+        return schedules
+
+    def get_course_prerequisites(self, cursor, course_ids=None):
+        """Get prerequisite course IDs and names for many courses, grouped by course_id"""
+        query = """
+        SELECT p.course_id, p.prerequisite_course_id, c.courseName
+        FROM Prerequisite p
+        JOIN Course c ON p.prerequisite_course_id = c.course_id
+        """
+        params = ()
+        if course_ids is not None:
+            if not course_ids:
+                return {}
+            placeholders = ", ".join(["%s"] * len(course_ids))
+            query += f" WHERE p.course_id IN ({placeholders})"
+            params = tuple(course_ids)
+        cursor.execute(query, params)
+
+        prerequisites = {}
+        for course_id, prereq_id, prereq_name in cursor.fetchall():
+            prerequisites.setdefault(course_id, []).append((prereq_id, prereq_name))
+        return prerequisites
+
     def update_course_capacity(self, cursor, conn, course_id, increment=False):
         """Update course available seats when student enrolls or drops"""
         if increment:
@@ -103,6 +269,8 @@ class Enrollment:
         
         cursor.execute(query, (course_id,))
         conn.commit()
+        invalidate_course(course_id)
+        invalidate_catalog_seats(course_id)
 
     def get_course_schedule(self, cursor, course_id):
         """Get schedule for a specific course"""
@@ -139,9 +307,8 @@ class Enrollment:
         statistics = cursor.fetchall()
         return statistics
 
-    def get_class_roster(self, cursor, faculty_id, course_id):
-        """Get class roster for a specific course taught by a faculty member"""
-        # First verify that the faculty member teaches this course
+    def get_roster_course_info(self, cursor, faculty_id, course_id):
+        """(course_id, courseName, instructor name) if the faculty member teaches the course"""
         verification_query = """
         SELECT c.course_id, c.courseName, 
                CONCAT(u.firstName, ' ', u.lastName) as instructor_name
@@ -150,7 +317,12 @@ class Enrollment:
         WHERE c.course_id = %s AND c.facultyMem_Id = %s
         """
         cursor.execute(verification_query, (course_id, faculty_id))
-        course_info = cursor.fetchone()
+        return cursor.fetchone()
+
+    def get_class_roster(self, cursor, faculty_id, course_id):
+        """Get class roster for a specific course taught by a faculty member"""
+        # First verify that the faculty member teaches this course
+        course_info = self.get_roster_course_info(cursor, faculty_id, course_id)
         
         if not course_info:
             return {"status": "Error", "message": "Course not found or access denied"}
@@ -185,6 +357,63 @@ class Enrollment:
             "students": students
         }
 
+    def get_class_roster_page(self, cursor, faculty_id, course_id, fields=None, after=None, limit=50):
+        """One keyset page of a class roster, ordered by student name"""
+        course_info = self.get_roster_course_info(cursor, faculty_id, course_id)
+        if not course_info:
+            return {"status": "Error", "message": "Course not found or access denied"}
+
+        page = ROSTER_LIST.fetch_page(cursor, fields, after, limit, params=(course_id,))
+        return {
+            "status": "Success",
+            "course_info": {
+                "course_id": course_info[0],
+                "course_name": course_info[1],
+                "instructor": course_info[2]
+            },
+            **page
+        }
+
+    def has_active_enrollments(self, cursor, course_id):
+        cursor.execute("SELECT 1 FROM Enrollment WHERE course_id = %s AND enrollmentStatus = 'Active' LIMIT 1", (course_id,))
+        return cursor.fetchone() is not None
+
+    def iter_roster_rows(self, cursor, course_ids=None, dept_id=None, faculty_id=None, batch_size=500):
+        """Yield active roster rows for some courses or a whole department, batch by batch.
+
+        Rows are (course_id, courseName, student_id, firstName, lastName, email,
+        mobileNo, enrollmentStatus, markStatus), ordered by course then student
+        name. faculty_id limits them to courses that faculty member teaches.
+        Use an unbuffered cursor so only one batch is held in memory.
+        """
+        query = """
+        SELECT c.course_id, c.courseName, e.student_id, u.firstName, u.lastName,
+               u.email, u.mobileNo, e.enrollmentStatus, e.markStatus
+        FROM Enrollment e
+        JOIN Course c ON e.course_id = c.course_id
+        JOIN Student s ON e.student_id = s.student_Id
+        JOIN Users u ON s.student_Id = u.user_id
+        WHERE e.enrollmentStatus = 'Active'
+        """
+        params = []
+        if course_ids:
+            query += f" AND c.course_id IN ({', '.join(['%s'] * len(course_ids))})"
+            params.extend(course_ids)
+        if dept_id is not None:
+            query += " AND c.dept_Id = %s"
+            params.append(dept_id)
+        if faculty_id is not None:
+            query += " AND c.facultyMem_Id = %s"
+            params.append(faculty_id)
+        query += " ORDER BY c.courseName, c.course_id, u.lastName, u.firstName"
+
+        cursor.execute(query, tuple(params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
     def get_faculty_courses(self, cursor, faculty_id):
         """Get all courses taught by a specific faculty member"""
         query = """
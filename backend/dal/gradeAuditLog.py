@@ -0,0 +1,348 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections import deque, namedtuple
+from datetime import datetime
+from backend.dal.dbconfig import dbconfig
+from backend.dal.unitOfWork import after_commit
+from backend.shared.structuredLog import get_logger
+
+logger = get_logger("grades.audit")
+
+# One changed enrollment; logged_at is when the change was made, not when it was written.
+# entry_id makes a write idempotent, so replaying a journal never duplicates rows.
+GradeAuditEntry = namedtuple("GradeAuditEntry", [
+    "entry_id", "enrollment_id", "course_id", "faculty_id", "action",
+    "old_marks", "new_marks", "old_status", "new_status", "logged_at"
+])
+
+
+class GradeAuditLog:
+    """Append-only GradeAuditLog table: one row per changed enrollment"""
+
+    TABLE = "GradeAuditLog"
+
+    CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS GradeAuditLog (
+        audit_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        entry_id CHAR(32) NOT NULL,
+        enrollment_id INT NOT NULL,
+        course_id INT NULL,
+        faculty_id INT NULL,
+        action VARCHAR(32) NOT NULL,
+        old_marks VARCHAR(16) NULL,
+        new_marks VARCHAR(16) NULL,
+        old_status VARCHAR(16) NULL,
+        new_status VARCHAR(16) NULL,
+        loggedAt DATETIME(3) NOT NULL,
+        INDEX idx_grade_audit_course (course_id, loggedAt),
+        INDEX idx_grade_audit_enrollment (enrollment_id, loggedAt),
+        UNIQUE KEY uq_grade_audit_entry (entry_id)
+    )
+    """
+
+    # IGNORE skips entries already written (same entry_id), e.g. on a journal replay
+    INSERT = """
+    INSERT IGNORE INTO GradeAuditLog
+        (entry_id, enrollment_id, course_id, faculty_id, action, old_marks, new_marks, old_status, new_status, loggedAt)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def insert_entries(self, cursor, conn, entries):
+        """Write a batch of GradeAuditEntry rows in one multi-row INSERT"""
+        cursor.executemany(self.INSERT, [tuple(entry) for entry in entries])
+        conn.commit()
+
+    def get_course_log(self, cursor, course_id, limit=200):
+        """Most recent audit rows of a course, newest first"""
+        query = """
+        SELECT audit_id, enrollment_id, faculty_id, action, old_marks, new_marks,
+               old_status, new_status, loggedAt
+        FROM GradeAuditLog
+        WHERE course_id = %s
+        ORDER BY loggedAt DESC, audit_id DESC
+        LIMIT %s
+        """
+        cursor.execute(query, (course_id, limit))
+        return cursor.fetchall()
+
+
+class GradeAuditJournal:
+    """Write-ahead file of the entries a GradeAuditWriter has not written yet.
+
+    Each process appends to its own <pid>.jsonl in the directory and empties
+    it once its buffer is fully written, so entries survive the process dying
+    before the background write. Journals left behind by processes that are
+    no longer running are claimed and replayed by the next writer to start.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.jsonl")
+        self.lines = 0
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, entries):
+        self._file.write("".join(_journal_line(entry) for entry in entries))
+        self._file.flush()
+        self.lines += len(entries)
+
+    def reset(self, entries=()):
+        """Rewrite the journal with only the entries still unwritten"""
+        self._file.close()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("".join(_journal_line(entry) for entry in entries))
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.lines = len(entries)
+
+    def recover(self):
+        """Take over the journals of processes that are no longer running; returns their entries"""
+        entries = []
+        for name in sorted(os.listdir(self.directory)):
+            pid = name[:-len(".jsonl")] if name.endswith(".jsonl") else ""
+            if not pid.isdigit() or int(pid) == os.getpid() or _process_running(int(pid)):
+                continue
+            # Rename first so two starting processes cannot both replay it
+            claimed = os.path.join(self.directory, f"{name}.replay-{os.getpid()}")
+            try:
+                os.rename(os.path.join(self.directory, name), claimed)
+            except FileNotFoundError:
+                continue
+            claimed_entries = []
+            with open(claimed, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        claimed_entries.append(_journal_entry(line))
+                    except (ValueError, TypeError, KeyError):
+                        # A line torn by the crash
+                        logger.warning("Skipping unreadable grade audit journal line in %s", name)
+            # Journaled here before the old file goes, so a crash now loses nothing
+            self.append(claimed_entries)
+            os.remove(claimed)
+            entries.extend(claimed_entries)
+        return entries
+
+
+class GradeAuditWriter:
+    """Buffers audit entries in memory and writes them in batches from a background thread.
+
+    Grade changes only append to the buffer (and the journal, if any); the
+    thread inserts up to batch_size rows per statement on its own connection,
+    every flush_interval seconds or sooner once a batch is full. Entries leave
+    the buffer only once written, and failed batches are retried. Past
+    max_buffer the appending caller writes the backlog itself; if that fails
+    too the entries stay buffered and an error is logged, never dropped.
+    """
+
+    def __init__(self, db=None, batch_size=200, flush_interval=2.0, max_buffer=50000, journal=None):
+        self.db = db or dbconfig()
+        self.audit_log = GradeAuditLog(self.db)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.journal = journal
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"appended": 0, "written": 0, "batches": 0, "failures": 0,
+                       "recovered": 0, "overflow_flushes": 0, "journal_failures": 0}
+        if journal is not None:
+            self._recover()
+
+    def append(self, entries):
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock:
+            self._buffer.extend(entries)
+            self._stats["appended"] += len(entries)
+            self._journal_append(entries)
+            overflow = len(self._buffer) > self.max_buffer
+            full = len(self._buffer) >= self.batch_size
+        self._start()
+        if overflow:
+            # Backpressure: the caller waits for the backlog to be written
+            with self._lock:
+                self._stats["overflow_flushes"] += 1
+            if not self.flush():
+                logger.error("Grade audit buffer holds %d entries and writing them failed; keeping them buffered",
+                             self.pending_count())
+        elif full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything buffered so far; returns False if a batch failed"""
+        with self._flush_lock:
+            while True:
+                # Only flush() removes entries, so the batch stays at the front until written
+                with self._lock:
+                    batch = [self._buffer[i] for i in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    return True
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    with self._lock:
+                        self._stats["failures"] += 1
+                    logger.warning("Writing %d grade audit entries failed: %s", len(batch), e)
+                    return False
+                with self._lock:
+                    for _ in batch:
+                        self._buffer.popleft()
+                    self._stats["written"] += len(batch)
+                    self._stats["batches"] += 1
+                    if self.journal is not None and (not self._buffer or self.journal.lines >= self.max_buffer):
+                        self._journal_reset()
+
+    def pending_count(self, course_id=None):
+        """Entries not written yet (of one course when given)"""
+        with self._lock:
+            if course_id is None:
+                return len(self._buffer)
+            return sum(1 for entry in self._buffer if entry.course_id == course_id)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self._stats, "pending": len(self._buffer), "batch_size": self.batch_size,
+                    "journal": self.journal.path if self.journal is not None else None}
+
+    def shutdown(self):
+        self._stop.set()
+        self._wakeup.set()
+        self.flush()
+
+    def _recover(self):
+        try:
+            entries = self.journal.recover()
+        except OSError as e:
+            logger.error("Reading grade audit journals in %s failed: %s", self.journal.directory, e)
+            return
+        if entries:
+            logger.warning("Replaying %d grade audit entries left unwritten by a stopped process", len(entries))
+            self._buffer.extend(entries)
+            self._stats["recovered"] += len(entries)
+            self._start()
+            self._wakeup.set()
+
+    def _journal_append(self, entries):
+        """Called with the lock held"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(entries)
+        except OSError as e:
+            self._stats["journal_failures"] += 1
+            logger.error("Journaling %d grade audit entries failed: %s", len(entries), e)
+
+    def _journal_reset(self):
+        """Called with the lock held"""
+        try:
+            self.journal.reset(list(self._buffer))
+        except OSError as e:
+            self._stats["journal_failures"] += 1
+            logger.error("Rewriting the grade audit journal failed: %s", e)
+
+    def _write(self, batch):
+        conn = self.db.get_dedicated_connection()
+        cursor = conn.cursor()
+        try:
+            self.audit_log.insert_entries(cursor, conn, batch)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="grade-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_grade_audit_writer():
+    """Process-wide audit writer, configured from NEXUS_GRADE_AUDIT_* environment variables.
+
+    NEXUS_GRADE_AUDIT_JOURNAL_DIR is where unwritten entries are journaled;
+    set it to an empty string to keep them in memory only.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            journal_dir = os.getenv("NEXUS_GRADE_AUDIT_JOURNAL_DIR",
+                                    os.path.join(tempfile.gettempdir(), "nexus-grade-audit"))
+            journal = None
+            if journal_dir:
+                try:
+                    journal = GradeAuditJournal(journal_dir)
+                except OSError as e:
+                    logger.error("Grade audit journal unavailable in %s: %s", journal_dir, e)
+            _writer = GradeAuditWriter(
+                batch_size=int(os.getenv("NEXUS_GRADE_AUDIT_BATCH_SIZE", "200")),
+                flush_interval=float(os.getenv("NEXUS_GRADE_AUDIT_FLUSH_INTERVAL", "2")),
+                max_buffer=int(os.getenv("NEXUS_GRADE_AUDIT_MAX_BUFFER", "50000")),
+                journal=journal
+            )
+            atexit.register(_writer.shutdown)
+        return _writer
+
+
+def record_grade_changes(action, course_id, faculty_id, changes):
+    """Audit (enrollment_id, old_marks, new_marks, old_status, new_status) changes once they are committed"""
+    logged_at = datetime.now()
+    entries = [
+        GradeAuditEntry(uuid.uuid4().hex, enrollment_id, course_id, faculty_id, action,
+                        _marks(old_marks), _marks(new_marks), old_status, new_status, logged_at)
+        for enrollment_id, old_marks, new_marks, old_status, new_status in changes
+    ]
+    if entries:
+        after_commit(lambda: get_grade_audit_writer().append(entries))
+
+
+def _marks(value):
+    return None if value is None else str(value)
+
+
+def _journal_line(entry):
+    return json.dumps({**entry._asdict(), "logged_at": entry.logged_at.isoformat()}) + "\n"
+
+
+def _journal_entry(line):
+    fields = json.loads(line)
+    fields["logged_at"] = datetime.fromisoformat(fields["logged_at"])
+    return GradeAuditEntry(**fields)
+
+
+def _process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
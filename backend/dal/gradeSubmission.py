@@ -1,3 +1,8 @@
+from backend.dal.gradeAuditLog import record_grade_changes
+from backend.dal.studentProgress import refresh_student_progress
+from backend.dal.scheduleCache import invalidate_student_schedules
+
+
 class GradeSubmission:
     def __init__(self, db):
         self.db = db
@@ -107,44 +112,171 @@ class GradeSubmission:
         except Exception as e:
             return {"status": "Error", "message": str(e)}
 
-    def batch_submit_grades(self, cursor, conn, grade_submissions):
-        """Submit multiple grades in batch with individual validation"""
+    # Enrollment ids per ownership lookup / CASE update statement
+    BATCH_CHUNK_SIZE = 500
+
+    def batch_submit_grades(self, cursor, conn, grade_submissions, course_id=None, mark_status="Pending", faculty_id=None):
+        """Submit multiple grades in batch with individual validation.
+
+        The whole payload is validated in memory, the enrollments are looked up
+        and locked with one IN (...) ... FOR UPDATE query per chunk (restricted
+        to course_id when given)
+        and the grades are written with one CASE-based UPDATE per chunk.
+        Each submission still gets its own entry in `results`.
+        """
         results = []
-        successful_submissions = []
-        
+        grades = {}     # enrollment id -> normalized grade (a repeated enrollment keeps the last one)
+        positions = {}  # enrollment id -> indexes of its submissions in results
+
         for submission in grade_submissions:
             enrollment_id = submission.get("enrollment_id")
-            grade = submission.get("grade")
-            
             if not enrollment_id:
-                results.append({
-                    "enrollment_id": enrollment_id,
-                    "status": "Error",
-                    "message": "Missing enrollment_id"
-                })
+                results.append({"status": "Error", "message": "Missing enrollment_id", "enrollment_id": enrollment_id})
                 continue
-            
-            # Submit individual grade
-            result = self.submit_single_grade(cursor, conn, enrollment_id, grade, "Pending")
-            result["enrollment_id"] = enrollment_id
-            results.append(result)
-            
-            if result["status"] == "Success":
-                successful_submissions.append(enrollment_id)
-        
+
+            validation = self.validate_grade(submission.get("grade"))
+            if not validation["valid"]:
+                results.append({"status": "Error", "message": validation["message"], "enrollment_id": enrollment_id})
+                continue
+
+            try:
+                key = int(enrollment_id)
+            except (TypeError, ValueError):
+                results.append({"status": "Error", "message": "Enrollment not found or inactive", "enrollment_id": enrollment_id})
+                continue
+
+            grades[key] = validation["normalized_grade"]
+            positions.setdefault(key, []).append(len(results))
+            results.append({"enrollment_id": enrollment_id})
+
+        outcomes = {}
+        updatable = {}
+        try:
+            # Locked until the commit, so a concurrent finalize or drop cannot change them under us
+            current = self._get_grading_state(cursor, sorted(grades), course_id, lock=True)
+            for key, grade in grades.items():
+                if key not in current:
+                    outcomes[key] = {"status": "Error", "message": "Enrollment not found or inactive"}
+                elif current[key][0] == "Submitted":
+                    outcomes[key] = {"status": "Error", "message": "Grade already submitted and locked"}
+                else:
+                    outcomes[key] = {"status": "Success", "message": "Grade updated successfully"}
+                    updatable[key] = grade
+            self._apply_grades(cursor, updatable, mark_status)
+        except Exception as e:
+            conn.rollback()
+            outcomes = {key: {"status": "Error", "message": str(e)} for key in grades}
+            updatable = {}
+
+        for key, indexes in positions.items():
+            for index in indexes:
+                results[index] = {**outcomes[key], "enrollment_id": results[index]["enrollment_id"]}
+
+        successful = sum(1 for result in results if result["status"] == "Success")
+
         # Commit only if at least one grade was successfully processed
-        if successful_submissions:
+        if updatable:
             conn.commit()
-        
+            # Graded courses are no longer current
+            refresh_student_progress({current[key][3] for key in updatable})
+            invalidate_student_schedules({current[key][3] for key in updatable})
+            changes = {}  # course -> audited changes
+            for key, grade in updatable.items():
+                old_status, old_marks, enrollment_course, _ = current[key]
+                changes.setdefault(enrollment_course, []).append((key, old_marks, grade, old_status, mark_status))
+            for enrollment_course, course_changes in changes.items():
+                record_grade_changes("SUBMIT_GRADE", enrollment_course, faculty_id, course_changes)
+
         return {
-            "status": "Completed" if successful_submissions else "Error",
+            "status": "Completed" if successful else "Error",
             "total_submitted": len(grade_submissions),
-            "successful": len(successful_submissions),
-            "failed": len(grade_submissions) - len(successful_submissions),
+            "successful": successful,
+            "failed": len(grade_submissions) - successful,
             "results": results
         }
 
-    def update_pending_grade(self, cursor, conn, enrollment_id, new_grade):
+    def _get_grading_state(self, cursor, enrollment_ids, course_id=None, lock=False):
+        """{enrollment_id: (markStatus, marks, course_id, student_id)} of the active enrollments among enrollment_ids (in course_id when given).
+
+        With lock=True the rows are read FOR UPDATE and stay locked until the transaction ends.
+        """
+        state = {}
+        for start in range(0, len(enrollment_ids), self.BATCH_CHUNK_SIZE):
+            chunk = enrollment_ids[start:start + self.BATCH_CHUNK_SIZE]
+            query = f"""
+            SELECT enrollment_id, markStatus, marks, course_id, student_id FROM Enrollment
+            WHERE enrollment_id IN ({", ".join(["%s"] * len(chunk))}) AND enrollmentStatus = 'Active'
+            """
+            params = list(chunk)
+            if course_id is not None:
+                query += " AND course_id = %s"
+                params.append(course_id)
+            if lock:
+                query += " FOR UPDATE"
+            cursor.execute(query, tuple(params))
+            state.update({row[0]: tuple(row[1:]) for row in cursor.fetchall()})
+        return state
+
+    def _apply_grades(self, cursor, grades, mark_status):
+        """Write {enrollment_id: grade} with one UPDATE per chunk"""
+        enrollment_ids = list(grades)
+        for start in range(0, len(enrollment_ids), self.BATCH_CHUNK_SIZE):
+            chunk = enrollment_ids[start:start + self.BATCH_CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            update_query = f"""
+            UPDATE Enrollment
+            SET marks = CASE enrollment_id {" ".join(["WHEN %s THEN %s"] * len(chunk))} END,
+                markStatus = %s, lastUpdated = CURRENT_TIMESTAMP
+            WHERE enrollment_id IN ({placeholders}) AND enrollmentStatus = 'Active'
+              AND (markStatus IS NULL OR markStatus <> 'Submitted')
+            """
+            params = [value for enrollment_id in chunk for value in (enrollment_id, grades[enrollment_id])]
+            cursor.execute(update_query, tuple(params + [mark_status] + chunk))
+
+    def get_grading_course(self, cursor, faculty_id, course_id):
+        """(course_id, courseName, instructor name) if faculty_id teaches course_id, else None"""
+        verification_query = """
+        SELECT c.course_id, c.courseName,
+               CONCAT(u.firstName, ' ', u.lastName) as instructor_name
+        FROM Course c
+        JOIN Users u ON c.facultyMem_Id = u.user_id
+        WHERE c.course_id = %s AND c.facultyMem_Id = %s
+        """
+        cursor.execute(verification_query, (course_id, faculty_id))
+        return cursor.fetchone()
+
+    def get_enrollments_by_student(self, cursor, course_id, student_ids, emails):
+        """Active enrollments in course_id for the given student ids or emails.
+
+        Returns ({student_id: enrollment_id}, {lowercased email: enrollment_id}).
+        """
+        conditions = []
+        params = [course_id]
+        if student_ids:
+            conditions.append(f"e.student_id IN ({', '.join(['%s'] * len(student_ids))})")
+            params.extend(student_ids)
+        if emails:
+            conditions.append(f"u.email IN ({', '.join(['%s'] * len(emails))})")
+            params.extend(emails)
+        if not conditions:
+            return {}, {}
+
+        query = f"""
+        SELECT e.enrollment_id, e.student_id, u.email
+        FROM Enrollment e
+        JOIN Users u ON e.student_id = u.user_id
+        WHERE e.course_id = %s AND e.enrollmentStatus = 'Active'
+        AND ({" OR ".join(conditions)})
+        """
+        cursor.execute(query, tuple(params))
+        by_id, by_email = {}, {}
+        for enrollment_id, student_id, email in cursor.fetchall():
+            by_id[student_id] = enrollment_id
+            if email:
+                by_email[email.lower()] = enrollment_id
+        return by_id, by_email
+
+    def update_pending_grade(self, cursor, conn, enrollment_id, new_grade, faculty_id=None):
         """Update a pending grade"""
         try:
             # Validate the new grade
@@ -154,7 +286,7 @@ class GradeSubmission:
             
             # Check if enrollment exists and is pending
             check_query = """
-            SELECT enrollment_id, markStatus FROM Enrollment 
+            SELECT enrollment_id, markStatus, marks, course_id, student_id FROM Enrollment 
             WHERE enrollment_id = %s AND enrollmentStatus = 'Active'
             """
             cursor.execute(check_query, (enrollment_id,))
@@ -179,6 +311,9 @@ class GradeSubmission:
                 return {"status": "Error", "message": "No pending grade found to update"}
             
             conn.commit()
+            invalidate_student_schedules([enrollment[4]])
+            record_grade_changes("UPDATE_GRADE", enrollment[3], faculty_id,
+                                 [(enrollment_id, enrollment[2], validation["normalized_grade"], "Pending", "Pending")])
             return {"status": "Success", "message": "Grade updated successfully"}
             
         except Exception as e:
@@ -197,18 +332,19 @@ class GradeSubmission:
             if not cursor.fetchone():
                 return {"status": "Error", "message": "Course not found or access denied"}
             
-            # Get pending grades count
-            count_query = """
-            SELECT COUNT(*) FROM Enrollment 
+            # Lock the grades being finalized; their marks go into the audit log
+            pending_query = """
+            SELECT enrollment_id, marks, student_id FROM Enrollment 
             WHERE course_id = %s AND markStatus = 'Pending' AND enrollmentStatus = 'Active'
+            FOR UPDATE
             """
-            cursor.execute(count_query, (course_id,))
-            pending_count = cursor.fetchone()[0]
+            cursor.execute(pending_query, (course_id,))
+            pending = cursor.fetchall()
             
-            if pending_count == 0:
+            if not pending:
                 return {"status": "Error", "message": "No pending grades found to finalize"}
             
-            # Update all pending grades to submitted
+            # Update all pending grades to submitted in one statement
             finalize_query = """
             UPDATE Enrollment 
             SET markStatus = 'Submitted', lastUpdated = CURRENT_TIMESTAMP 
@@ -217,7 +353,14 @@ class GradeSubmission:
             cursor.execute(finalize_query, (course_id,))
             
             finalized_count = cursor.rowcount
+            if finalized_count != len(pending):
+                conn.rollback()
+                return {"status": "Error", "message": "Grades changed during finalization, please try again"}
             conn.commit()
+            refresh_student_progress([student_id for _, _, student_id in pending])
+            invalidate_student_schedules([student_id for _, _, student_id in pending])
+            record_grade_changes("FINALIZE_GRADES", course_id, faculty_id,
+                                 [(enrollment_id, marks, marks, "Pending", "Submitted") for enrollment_id, marks, _ in pending])
             
             return {
                 "status": "Success", 
@@ -0,0 +1,104 @@
+import base64
+import json
+
+
+def encode_cursor(values):
+    """Opaque cursor for the key values of the last row of a page"""
+    raw = json.dumps(list(values), default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Key values from encode_cursor; ValueError if the cursor is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class ListQuery:
+    """Keyset-paginated SELECT with field projection.
+
+    `fields` maps each public field name to (SQL expression, joins it needs);
+    `joins` maps join names to their JOIN clause. Only the requested fields
+    and their joins are selected, plus the key columns, which fix the order.
+    Pages continue from an opaque cursor with `WHERE key > last key` instead
+    of OFFSET, so every page costs the same however deep it is.
+
+    Projection must never change which rows come back: joins that filter rows
+    go in `base_joins` and are always applied, and only LEFT JOINs may be
+    dropped when no requested field needs them.
+    """
+
+    def __init__(self, from_clause, fields, key, joins=None, where=None, base_joins=()):
+        self.from_clause = from_clause
+        self.fields = fields
+        self.key = key            # [(field name, SQL expression)], all ascending
+        self.joins = joins or {}
+        self.where = where
+        self.base_joins = tuple(base_joins)
+        for name, clause in self.joins.items():
+            if name not in self.base_joins and not clause.lstrip().upper().startswith("LEFT JOIN"):
+                raise ValueError(f"Join '{name}' filters rows; list it in base_joins or make it a LEFT JOIN")
+
+    def resolve_fields(self, fields=None):
+        """Requested field names in declared order; ValueError for unknown names"""
+        if not fields:
+            return list(self.fields)
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return [name for name in self.fields if name in fields]
+
+    def fetch_page(self, cursor, fields=None, after=None, limit=50, params=()):
+        """{'data': [row dicts], 'next_cursor': ..., 'has_more': ...}"""
+        names = self.resolve_fields(fields)
+        key_names = [name for name, _ in self.key]
+        key_exprs = [expr for _, expr in self.key]
+
+        needed = list(self.base_joins)
+        for name in names:
+            needed.extend(self.fields[name][1])
+        for name in key_names:
+            if name in self.fields:
+                needed.extend(self.fields[name][1])
+        joins = [self.joins[join] for join in dict.fromkeys(needed)]
+
+        columns = [self.fields[name][0] for name in names] + key_exprs
+        conditions = [self.where] if self.where else []
+        query_params = list(params)
+        if after:
+            condition, values = self._after_condition(key_exprs, decode_cursor(after, len(key_exprs)))
+            conditions.append(condition)
+            query_params.extend(values)
+
+        query = f"SELECT {', '.join(columns)} FROM {self.from_clause} {' '.join(joins)}"
+        if conditions:
+            query += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+        query += f" ORDER BY {', '.join(key_exprs)} LIMIT %s"
+        query_params.append(limit + 1)
+
+        cursor.execute(query, tuple(query_params))
+        rows = cursor.fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        width = len(names)
+        return {
+            "data": [dict(zip(names, row[:width])) for row in rows],
+            "next_cursor": encode_cursor(rows[-1][width:]) if rows and has_more else None,
+            "has_more": has_more
+        }
+
+    @staticmethod
+    def _after_condition(key_exprs, values):
+        """(a > x) OR (a = x AND b > y) ... for a composite key"""
+        clauses, params = [], []
+        for i, expr in enumerate(key_exprs):
+            parts = [f"{previous} = %s" for previous in key_exprs[:i]] + [f"{expr} > %s"]
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(values[:i] + [values[i]])
+        return " OR ".join(clauses), params
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from backend.dal.unitOfWork import after_commit
+
+_MISSING = object()
+
+
+class MetadataCache:
+    """Thread-safe TTL + LRU cache for small, read-mostly lookups.
+
+    Keys are (namespace, id) tuples such as ("student", 42). Entries expire
+    after `ttl` seconds and the least recently used entry is evicted once
+    `max_size` is reached. Writers call invalidate() so readers never wait out
+    the TTL for their own changes.
+    """
+
+    def __init__(self, max_size=2000, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def get_or_load(self, key, loader):
+        """Cached value for key, calling loader() on a miss (exceptions are not cached)"""
+        value = self._lookup(key)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def get_many_or_load(self, namespace, ids, loader):
+        """Values for many ids of one namespace with a single loader(missing_ids) call.
+
+        loader returns {id: value}; ids it does not return are cached as None.
+        """
+        found, missing = {}, []
+        for item_id in ids:
+            value = self._lookup((namespace, item_id))
+            if value is _MISSING:
+                missing.append(item_id)
+            else:
+                found[item_id] = value
+        if missing:
+            loaded = loader(missing)
+            for item_id in missing:
+                value = loaded.get(item_id)
+                self.set((namespace, item_id), value)
+                found[item_id] = value
+        return found
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else None
+            }
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+
+metadata_cache = MetadataCache(
+    max_size=int(os.getenv("NEXUS_METADATA_CACHE_SIZE", "2000")),
+    ttl=float(os.getenv("NEXUS_METADATA_CACHE_TTL", "300"))
+)
+
+
+def invalidate(*keys):
+    """Drop keys now and again once the current request commits.
+
+    The second pass covers readers that re-cached the old row while the
+    writing transaction was still open.
+    """
+    metadata_cache.invalidate(*keys)
+    after_commit(lambda: metadata_cache.invalidate(*keys))
+
+
+def invalidate_student(student_id):
+    invalidate(("student", student_id))
+
+
+def invalidate_course(course_id):
+    invalidate(("course_stats", course_id))
@@ -0,0 +1,79 @@
+import os
+import threading
+from collections import OrderedDict
+from backend.dal.metadataCache import MetadataCache
+from backend.dal.unitOfWork import after_commit
+
+# Built schedule responses keyed by ("schedule", student_id); each value maps a
+# semester id (None for the current semester) to the response for it, so one
+# key drops every semester of a student
+schedule_cache = MetadataCache(
+    max_size=int(os.getenv("NEXUS_SCHEDULE_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("NEXUS_SCHEDULE_CACHE_TTL", "600"))
+)
+
+# Invalidation generations, so a read that started before an invalidation
+# cannot cache what it read after it: every invalidation bumps _generation and
+# records it per student. The oldest records are forgotten past the cache
+# size; _floor then rejects reads that started before them.
+_lock = threading.Lock()
+_generation = 0
+_invalidated = OrderedDict()  # student_id -> generation of their latest invalidation
+_floor = 0
+
+
+def get_cached_schedule(student_id, semester_id):
+    return (schedule_cache.get(("schedule", student_id)) or {}).get(semester_id)
+
+
+def schedule_generation():
+    """Take before reading a schedule from the database and pass it to cache_schedule"""
+    with _lock:
+        return _generation
+
+
+def cache_schedule(student_id, semester_id, result, generation):
+    """Cache a schedule read since generation, unless the student's schedules were invalidated meanwhile"""
+    key = ("schedule", student_id)
+    with _lock:
+        if generation < _floor or _invalidated.get(student_id, 0) > generation:
+            return False
+        # Copy rather than mutate: readers may hold the previous mapping
+        schedule_cache.set(key, {**(schedule_cache.get(key) or {}), semester_id: result})
+        return True
+
+
+def invalidate_student_schedules(student_ids):
+    """A student's enrollments or grades changed; drop their schedules now and after the request commits"""
+    student_ids = [student_id for student_id in student_ids if student_id is not None]
+    if student_ids:
+        _invalidate_students(student_ids)
+        after_commit(lambda: _invalidate_students(student_ids))
+
+
+def invalidate_all_schedules():
+    """Course details, course times or the current semester changed; every cached schedule may be stale"""
+    _invalidate_all()
+    after_commit(_invalidate_all)
+
+
+def _invalidate_students(student_ids):
+    global _generation, _floor
+    with _lock:
+        _generation += 1
+        for student_id in student_ids:
+            _invalidated[student_id] = _generation
+            _invalidated.move_to_end(student_id)
+        while len(_invalidated) > schedule_cache.max_size:
+            _, forgotten = _invalidated.popitem(last=False)
+            _floor = max(_floor, forgotten)
+        schedule_cache.invalidate(*[("schedule", student_id) for student_id in student_ids])
+
+
+def _invalidate_all():
+    global _generation, _floor
+    with _lock:
+        _generation += 1
+        _floor = _generation
+        _invalidated.clear()
+        schedule_cache.clear()
@@ -1,6 +1,11 @@
+from backend.dal.studentProgress import StudentProgress
+from backend.dal.scheduleCache import invalidate_all_schedules
+
+
 class ScheduleProgress:
     def __init__(self, db):
         self.db = db
+        self.student_progress = StudentProgress(db)
 
     # ============ SCHEDULE MANAGEMENT METHODS ============
     
@@ -94,26 +99,11 @@ class ScheduleProgress:
     # ============ ACADEMIC PROGRESS METHODS ============
     
     def get_student_progress(self, cursor, student_id):
-        """Get comprehensive academic progress for a student"""
-        query = """
-        SELECT 
-            student_Id,
-            student_name,
-            degree_name,
-            degree_ID,
-            YearOfStudy,
-            completed_courses,
-            completed_credits,
-            COALESCE(gpa, 0.0) as gpa,
-            current_courses,
-            current_credits,
-            total_degree_credits,
-            COALESCE(progress_percentage, 0.0) as progress_percentage
-        FROM StudentProgressView
-        WHERE student_Id = %s
-        """
-        cursor.execute(query, (student_id,))
-        progress = cursor.fetchone()
+        """Get comprehensive academic progress for a student (a StudentProgress primary-key read)"""
+        progress = self.student_progress.get(cursor, student_id)
+        if progress is None:
+            # Not materialized yet (new student or table not rebuilt): aggregate without storing
+            progress = self.student_progress.compute(cursor, student_id)
         return progress
 
     def get_completed_courses(self, cursor, student_id):
@@ -189,8 +179,10 @@ class ScheduleProgress:
     
     def get_weekly_schedule_grid(self, cursor, student_id, semester_id=None):
         """Get student's schedule formatted for weekly calendar grid"""
-        schedule_data = self.get_student_schedule(cursor, student_id, semester_id)
-        
+        return self.build_weekly_schedule_grid(self.get_student_schedule(cursor, student_id, semester_id))
+
+    def build_weekly_schedule_grid(self, schedule_data):
+        """Weekly calendar grid from get_student_schedule rows"""
         # Format schedule into daily grid
         weekly_schedule = {
             'Monday': [],
@@ -305,6 +297,8 @@ class ScheduleProgress:
             cursor.execute("UPDATE AcademicSemester SET is_current = TRUE WHERE semester_id = %s", (semester_id,))
             
             conn.commit()
+            # Cached "current semester" schedules now refer to the old one
+            invalidate_all_schedules()
             return {"status": "Success", "message": "Current semester updated successfully"}
         except Exception as e:
             conn.rollback()
@@ -0,0 +1,294 @@
+import atexit
+import os
+import threading
+from backend.dal.dbconfig import dbconfig
+from backend.dal.unitOfWork import after_commit
+from backend.shared.structuredLog import get_logger
+
+logger = get_logger("progress")
+
+# Stored enrollment aggregates; student and degree details are joined when read
+COLUMNS = [
+    "student_Id", "completed_courses", "completed_credits", "gpa", "current_courses", "current_credits"
+]
+
+
+class StudentProgress:
+    """Materialized per-student academic progress (the StudentProgress table).
+
+    Each row holds the Enrollment aggregates the progress dashboard used to
+    compute on every load, with the same definitions as the rest of the
+    progress payload: 'Completed' courses are completed, 'In Progress' ones
+    are current. Names, degree and degree credits are joined from their own
+    tables when read, so editing them needs no refresh. Rows are recomputed
+    for just the students whose enrollments, grades or course credits changed
+    (refresh_students), the whole table can be rebuilt (rebuild), and
+    check_consistency compares the table with a fresh aggregation.
+    """
+
+    TABLE = "StudentProgress"
+
+    CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS StudentProgress (
+        student_Id INT PRIMARY KEY,
+        completed_courses INT NOT NULL DEFAULT 0,
+        completed_credits DECIMAL(10, 2) NOT NULL DEFAULT 0,
+        gpa DECIMAL(6, 2) NULL,
+        current_courses INT NOT NULL DEFAULT 0,
+        current_credits DECIMAL(10, 2) NOT NULL DEFAULT 0,
+        refreshedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """
+
+    # Progress rows computed from Enrollment; {enrollment_filter} and
+    # {student_filter} restrict them to some students
+    COMPUTE_QUERY = """
+    SELECT s.student_Id AS student_Id,
+           COALESCE(agg.completed_courses, 0) AS completed_courses,
+           COALESCE(agg.completed_credits, 0) AS completed_credits,
+           agg.gpa AS gpa,
+           COALESCE(agg.current_courses, 0) AS current_courses,
+           COALESCE(agg.current_credits, 0) AS current_credits
+    FROM Student s
+    LEFT JOIN (
+        SELECT e.student_id,
+               SUM(CASE WHEN e.markStatus = 'Completed' THEN 1 ELSE 0 END) AS completed_courses,
+               SUM(CASE WHEN e.markStatus = 'Completed' THEN c.credits ELSE 0 END) AS completed_credits,
+               ROUND(AVG(CASE WHEN e.markStatus = 'Completed' AND e.marks REGEXP '^[0-9]+(\\\\.[0-9]+)?$' THEN e.marks END), 2) AS gpa,
+               SUM(CASE WHEN e.markStatus = 'In Progress' THEN 1 ELSE 0 END) AS current_courses,
+               SUM(CASE WHEN e.markStatus = 'In Progress' THEN c.credits ELSE 0 END) AS current_credits
+        FROM Enrollment e
+        JOIN Course c ON e.course_id = c.course_id
+        WHERE e.enrollmentStatus = 'Active' {enrollment_filter}
+        GROUP BY e.student_id
+    ) agg ON agg.student_id = s.student_Id
+    {student_filter}
+    """
+
+    # A student's progress summary from {progress} (the table or a fresh
+    # aggregation), in the column order the progress service formats
+    SUMMARY_QUERY = """
+    SELECT s.student_Id,
+           CONCAT(u.firstName, ' ', u.lastName) AS student_name,
+           d.name AS degree_name,
+           s.degree_ID,
+           s.YearOfStudy,
+           p.completed_courses,
+           p.completed_credits,
+           p.gpa,
+           p.current_courses,
+           p.current_credits,
+           d.credit AS total_degree_credits,
+           CASE WHEN d.credit > 0 THEN ROUND(p.completed_credits / d.credit * 100, 2) END AS progress_percentage
+    FROM Student s
+    JOIN Users u ON s.student_Id = u.user_id
+    LEFT JOIN Degree d ON s.degree_ID = d.degree_ID
+    JOIN {progress} p ON p.student_Id = s.student_Id
+    WHERE s.student_Id = %s
+    """
+
+    UPSERT = f"""
+    INSERT INTO StudentProgress ({", ".join(COLUMNS)})
+    {{select}}
+    ON DUPLICATE KEY UPDATE {", ".join(f"{column} = VALUES({column})" for column in COLUMNS[1:])}
+    """
+
+    # Student ids per refresh statement
+    CHUNK_SIZE = 500
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, cursor, student_id):
+        """The progress summary of a student from the stored row (primary-key reads), or None"""
+        cursor.execute(self.SUMMARY_QUERY.format(progress="StudentProgress"), (student_id,))
+        return cursor.fetchone()
+
+    def compute(self, cursor, student_id):
+        """The progress summary of a student aggregated from Enrollment, without storing it"""
+        select = self.COMPUTE_QUERY.format(enrollment_filter="AND e.student_id = %s",
+                                           student_filter="WHERE s.student_Id = %s")
+        cursor.execute(self.SUMMARY_QUERY.format(progress=f"({select})"), (student_id,) * 3)
+        return cursor.fetchone()
+
+    def refresh_students(self, cursor, student_ids):
+        """Recompute the rows of the given students (no commit)"""
+        student_ids = sorted(set(student_ids))
+        for start in range(0, len(student_ids), self.CHUNK_SIZE):
+            chunk = student_ids[start:start + self.CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            select = self.COMPUTE_QUERY.format(
+                enrollment_filter=f"AND e.student_id IN ({placeholders})",
+                student_filter=f"WHERE s.student_Id IN ({placeholders})"
+            )
+            cursor.execute(self.UPSERT.format(select=select), tuple(chunk) * 2)
+
+    def rebuild(self, cursor, conn):
+        """Recompute every row and remove rows of students that no longer exist; returns the row counts"""
+        select = self.COMPUTE_QUERY.format(enrollment_filter="", student_filter="")
+        cursor.execute(self.UPSERT.format(select=select))
+        removed = self.remove_orphans(cursor)
+        conn.commit()
+        cursor.execute("SELECT COUNT(*) FROM StudentProgress")
+        return {"rows": cursor.fetchone()[0], "removed": removed}
+
+    def remove_orphans(self, cursor):
+        """Delete rows of students that no longer exist (no commit); returns how many"""
+        cursor.execute("""
+        DELETE sp FROM StudentProgress sp
+        LEFT JOIN Student s ON sp.student_Id = s.student_Id
+        WHERE s.student_Id IS NULL
+        """)
+        return cursor.rowcount
+
+    def check_consistency(self, cursor, limit=1000):
+        """Rows that differ from a fresh aggregation: missing, stale or orphaned (up to limit)"""
+        select = self.COMPUTE_QUERY.format(enrollment_filter="", student_filter="")
+        differs = " OR ".join(f"NOT (expected.{column} <=> sp.{column})" for column in COLUMNS[1:])
+        query = f"""
+        SELECT {", ".join(f"expected.{column}" for column in COLUMNS)}, sp.student_Id IS NOT NULL,
+               {", ".join(f"sp.{column}" for column in COLUMNS)}
+        FROM ({select}) AS expected
+        LEFT JOIN StudentProgress sp ON sp.student_Id = expected.student_Id
+        WHERE sp.student_Id IS NULL OR {differs}
+        LIMIT %s
+        """
+        cursor.execute(query, (limit,))
+        problems = []
+        width = len(COLUMNS)
+        for row in cursor.fetchall():
+            expected, present, actual = row[:width], row[width], row[width + 1:]
+            if not present:
+                problems.append({"student_id": expected[0], "problem": "missing"})
+                continue
+            columns = {
+                column: {"stored": actual[i], "expected": expected[i]}
+                for i, column in enumerate(COLUMNS) if actual[i] != expected[i]
+            }
+            problems.append({"student_id": expected[0], "problem": "stale", "columns": columns})
+
+        cursor.execute("""
+        SELECT sp.student_Id FROM StudentProgress sp
+        LEFT JOIN Student s ON sp.student_Id = s.student_Id
+        WHERE s.student_Id IS NULL
+        LIMIT %s
+        """, (limit,))
+        problems.extend({"student_id": row[0], "problem": "orphaned"} for row in cursor.fetchall())
+        return problems
+
+
+class StudentProgressRefresher:
+    """Recomputes progress rows from a background thread.
+
+    Committed changes only add their student ids to a pending set; the thread
+    refreshes everything pending on its own connection, so requests never
+    wait for the aggregation or take a second connection. A failed refresh
+    keeps its ids pending and is retried after retry_interval seconds; the
+    rows stay stale meanwhile, and a rebuild or check --repair fixes them too.
+    """
+
+    def __init__(self, db=None, retry_interval=5.0):
+        self.db = db or dbconfig()
+        self.retry_interval = retry_interval
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"submitted": 0, "refreshed": 0, "failures": 0}
+
+    def submit(self, student_ids):
+        with self._lock:
+            self._pending.update(student_ids)
+            self._stats["submitted"] += len(student_ids)
+        self._start()
+        self._wakeup.set()
+
+    def flush(self):
+        """Refresh every pending student; returns False if the refresh failed"""
+        with self._flush_lock:
+            with self._lock:
+                student_ids, self._pending = self._pending, set()
+            if not student_ids:
+                return True
+            try:
+                self._refresh(student_ids)
+            except Exception as e:
+                with self._lock:
+                    self._pending |= student_ids
+                    self._stats["failures"] += 1
+                logger.warning("Refreshing progress of %d student(s) failed: %s", len(student_ids), e)
+                return False
+            with self._lock:
+                self._stats["refreshed"] += len(student_ids)
+            return True
+
+    def get_stats(self):
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+    def shutdown(self):
+        self._stop.set()
+        self._wakeup.set()
+        self.flush()
+
+    def _refresh(self, student_ids):
+        conn = self.db.get_dedicated_connection()
+        cursor = conn.cursor()
+        try:
+            StudentProgress(self.db).refresh_students(cursor, student_ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="progress-refresher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self.flush():
+                # Retry later instead of hammering a failing database
+                self._stop.wait(self.retry_interval)
+                self._wakeup.set()
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_progress_refresher():
+    """Process-wide progress refresher (NEXUS_PROGRESS_RETRY_INTERVAL: seconds before retrying a failed refresh)"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = StudentProgressRefresher(
+                retry_interval=float(os.getenv("NEXUS_PROGRESS_RETRY_INTERVAL", "5"))
+            )
+            atexit.register(_refresher.shutdown)
+        return _refresher
+
+
+def refresh_student_progress(student_ids):
+    """Queue the progress rows of students for a background refresh once their enrollment or grade changes commit"""
+    student_ids = {student_id for student_id in student_ids if student_id is not None}
+    if student_ids:
+        after_commit(lambda: get_progress_refresher().submit(student_ids))
+
+
+def get_course_student_ids(cursor, course_id):
+    """Students actively enrolled in a course, whose rows depend on its credits"""
+    cursor.execute("SELECT DISTINCT student_id FROM Enrollment WHERE course_id = %s AND enrollmentStatus = 'Active'",
+                   (course_id,))
+    return [row[0] for row in cursor.fetchall()]
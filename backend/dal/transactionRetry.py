@@ -0,0 +1,31 @@
+import random
+import time
+import mysql.connector
+from mysql.connector import errorcode
+from backend.dal.unitOfWork import can_replay
+
+# InnoDB errors after which the transaction was rolled back and can simply be replayed
+RETRYABLE_ERRORS = {errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT}
+
+
+def is_retryable(error):
+    """True for deadlocks and lock wait timeouts"""
+    return isinstance(error, mysql.connector.Error) and error.errno in RETRYABLE_ERRORS
+
+
+def run_with_retry(operation, conn, max_attempts=4, base_delay=0.05, max_delay=1.0):
+    """Run a transactional operation, replaying it on deadlock with jittered exponential backoff.
+
+    A deadlock rolls back the whole transaction. Inside a unit of work that
+    already holds earlier DAL commits (or their after-commit callbacks) the
+    error is re-raised instead, since a replay would silently drop that work.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return operation()
+        except Exception as e:
+            if not is_retryable(e) or attempt == max_attempts or not can_replay(conn):
+                raise
+            conn.rollback()
+            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            time.sleep(delay * random.uniform(0.5, 1.0))
@@ -0,0 +1,226 @@
+from flask import g, has_request_context, jsonify
+
+
+class UnitOfWork:
+    """One pooled connection shared by every service and DAL call in a request.
+
+    DAL code keeps calling conn.commit()/conn.close() as before; on a lease a
+    commit only sets a savepoint, and the request commits once after the view
+    returns. Only work up to the last DAL commit is kept, so a service that
+    wrote and returned an error without committing is still discarded, as it
+    was on a private connection. Teardown rolls back if the view raised.
+    """
+
+    SAVEPOINT = "uow_checkpoint"
+
+    def __init__(self, connection):
+        self._conn = connection
+        self._leases = 0
+        self._after_commit = []
+        self._checkpointed = False
+        self._kept_work = False   # a DAL commit since the last real commit
+
+    def lease(self):
+        """Hand out the shared connection to a service or DAL call"""
+        self._leases += 1
+        return ConnectionLease(self)
+
+    def cursor(self, **kwargs):
+        """Cursor factory for the shared connection.
+
+        Cursors are buffered by default so several services can interleave
+        queries on the same connection without "Unread result found" errors.
+        """
+        kwargs.setdefault("buffered", True)
+        return self._conn.cursor(**kwargs)
+
+    def after_commit(self, callback):
+        """Run callback once the request's work is actually committed (dropped on rollback)"""
+        self._after_commit.append(callback)
+
+    def checkpoint(self):
+        """A deferred DAL commit: keep the work done so far when the request completes"""
+        self._execute(f"SAVEPOINT {self.SAVEPOINT}")
+        self._checkpointed = True
+        self._kept_work = True
+
+    def can_replay(self):
+        """True if a full rollback would lose nothing the request already committed (through a DAL commit)"""
+        return not self._kept_work and not self._after_commit
+
+    def commit_now(self):
+        """Commit everything written so far at once (releasing row locks) and keep going.
+
+        A fresh checkpoint follows, so callbacks registered afterwards still
+        run when the request completes.
+        """
+        self.commit()
+        self.checkpoint()
+        self._kept_work = False
+
+    def complete(self):
+        """Commit the work up to the last checkpoint and drop anything after it"""
+        if not self._checkpointed:
+            self.rollback()
+            return
+        self._execute(f"ROLLBACK TO SAVEPOINT {self.SAVEPOINT}")
+        self.commit()
+
+    def commit(self):
+        self._conn.commit()
+        self._checkpointed = False
+        self._kept_work = False
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # The data is committed; a failed hook must not turn that into an error
+                pass
+
+    def rollback(self):
+        self._after_commit = []
+        self._checkpointed = False
+        self._kept_work = False
+        self._conn.rollback()
+
+    def rollback_to_checkpoint(self):
+        """A DAL rollback: undo the work since the last checkpoint, keeping earlier commits"""
+        if self._checkpointed:
+            try:
+                self._execute(f"ROLLBACK TO SAVEPOINT {self.SAVEPOINT}")
+                return
+            except Exception:
+                # A deadlock already rolled back the whole transaction, savepoint included
+                pass
+        self.rollback()
+
+    def _execute(self, statement):
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    def finish(self, error=None):
+        """Complete any trailing work (or roll back on error) and release the connection"""
+        try:
+            if error is None:
+                self.complete()
+            else:
+                self.rollback()
+        except Exception:
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+        finally:
+            self._conn.close()
+
+    @property
+    def lease_count(self):
+        return self._leases
+
+
+class ConnectionLease:
+    """Connection handle lent out by a UnitOfWork"""
+
+    def __init__(self, unit_of_work):
+        self._uow = unit_of_work
+
+    def cursor(self, **kwargs):
+        return self._uow.cursor(**kwargs)
+
+    def commit(self):
+        # Deferred: marks a savepoint, the unit of work commits once at the end of the request
+        self._uow.checkpoint()
+
+    def rollback(self):
+        # Rolls back to the last DAL commit, like a private connection would
+        self._uow.rollback_to_checkpoint()
+
+    def close(self):
+        # The connection is released by the unit of work, not by the borrower
+        pass
+
+    def is_connected(self):
+        return self._uow._conn.is_connected()
+
+    def __getattr__(self, name):
+        return getattr(self._uow._conn, name)
+
+
+def init_app(app):
+    """Enable request-scoped units of work for every request handled by app"""
+    app.before_request(_begin_request)
+    app.after_request(_commit_request)
+    app.teardown_request(_end_request)
+
+
+def after_commit(callback):
+    """Run callback after the current request commits, or right away outside a unit of work"""
+    uow = g.get("_uow") if has_request_context() else None
+    if uow is None:
+        callback()
+    else:
+        uow.after_commit(callback)
+
+
+def commit_now(conn):
+    """Commit for real, even on a unit-of-work lease.
+
+    For writes that lock hot rows (seat reservations), so the lock is not held
+    until the end of the request. On a lease this commits everything the
+    request wrote so far and runs its after-commit callbacks.
+    """
+    if isinstance(conn, ConnectionLease):
+        conn._uow.commit_now()
+    else:
+        conn.commit()
+
+
+def can_replay(conn):
+    """True if conn's transaction can be rolled back entirely and replayed without losing earlier work"""
+    return not isinstance(conn, ConnectionLease) or conn._uow.can_replay()
+
+
+def current_unit_of_work(open_connection):
+    """Return the request's unit of work, opening it lazily on first use.
+
+    Returns None outside a request (background threads, CLI tools), in which
+    case callers should borrow a connection from the pool directly.
+    """
+    if not has_request_context() or not g.get("_uow_enabled"):
+        return None
+    uow = g.get("_uow")
+    if uow is None:
+        uow = UnitOfWork(open_connection())
+        g._uow = uow
+    return uow
+
+
+def _begin_request():
+    g._uow_enabled = True
+
+
+def _commit_request(response):
+    # Commit before the response is sent so a failed commit can still turn into a 500.
+    # Error responses are completed the same way: committed DAL work is kept,
+    # uncommitted writes are rolled back.
+    uow = g.get("_uow")
+    if uow is None:
+        return response
+    try:
+        uow.complete()
+    except Exception as e:
+        uow.rollback()
+        response = jsonify({"status": "Error", "message": f"Transaction failed: {str(e)}"})
+        response.status_code = 500
+    return response
+
+
+def _end_request(error=None):
+    uow = g.pop("_uow", None)
+    g.pop("_uow_enabled", None)
+    if uow is not None:
+        uow.finish(error)
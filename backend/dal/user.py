@@ -2,6 +2,40 @@
 from abc import ABC, abstractmethod
 from flask import request
 from backend.dal.dbconfig import dbconfig
+from backend.dal.metadataCache import invalidate_student
+from backend.dal.courseCatalogCache import invalidate_catalog_related
+from backend.dal.scheduleCache import invalidate_student_schedules, invalidate_all_schedules
+from backend.dal.keysetQuery import ListQuery
+
+STUDENT_LIST = ListQuery(
+    "Users AS u JOIN Student AS s ON u.user_id = s.student_Id",
+    fields={
+        "user_id": ("u.user_id", ()),
+        "firstName": ("u.firstName", ()),
+        "lastName": ("u.lastName", ()),
+        "email": ("u.email", ()),
+        "accountStatus": ("u.accountStatus", ()),
+        "yearOfStudy": ("s.YearOfStudy", ()),
+        "degree": ("d.name", ("degree",))
+    },
+    # Students without a Degree row are not listed, whatever the projection
+    joins={"degree": "JOIN Degree AS d ON s.degree_ID = d.degree_ID"},
+    base_joins=("degree",),
+    key=[("user_id", "u.user_id")]
+)
+
+FACULTY_LIST = ListQuery(
+    "Users AS U JOIN FacultyStaff AS Fac ON U.user_id = Fac.facultyMem_Id",
+    fields={
+        "user_id": ("U.user_id", ()),
+        "firstName": ("U.firstName", ()),
+        "lastName": ("U.lastName", ()),
+        "email": ("U.email", ()),
+        "accountStatus": ("U.accountStatus", ()),
+        "role": ("Fac.role", ())
+    },
+    key=[("user_id", "U.user_id")]
+)
 
 
 class User(ABC):
@@ -80,6 +114,10 @@ class Student(User):
         cursor.close()
         conn.close()
         return result
+
+    def get_students_page(self, cursor, fields=None, after=None, limit=50):
+        """One keyset page of students ordered by user id"""
+        return STUDENT_LIST.fetch_page(cursor, fields, after, limit)
         
     def update_user(self, user_id, firstName=None, lastName=None, email=None, mobileNo=None, yearOfStudy=None, degreeID=None):
         conn = self.db.get_db_connection()
@@ -130,6 +168,9 @@ class Student(User):
                 cursor.execute(query2, tuple(student_update_values))
                 conn.commit()
             
+            invalidate_student(user_id)
+            # Cached schedules are served without re-validating the student
+            invalidate_student_schedules([user_id])
             result = {"status": "Success", "message": "Student updated successfully"}
         except Exception as e:
             result = {"status": "Error", "message": str(e)}
@@ -156,6 +197,8 @@ class Student(User):
             cursor.execute(query, (new_status, user_id))
             conn.commit()
             
+            invalidate_student_schedules([user_id])
+            
             action = "deactivated" if new_status == "inactive" else "activated"
             result = {"status": "Success", "message": f"Student {action} successfully", "new_status": new_status}
         except Exception as e:
@@ -240,6 +283,11 @@ class FacultyMember(User):
                 query2 = "UPDATE FacultyStaff SET role = %s WHERE facultyMem_Id = %s"
                 cursor.execute(query2, (role, user_id))
                 conn.commit()
+
+            # Course listings and student schedules show the instructor's name
+            if firstName is not None or lastName is not None:
+                invalidate_catalog_related("facultyMem_Id", user_id)
+                invalidate_all_schedules()
             
             result = {"status": "Success", "message": "Faculty member updated successfully"}
         except Exception as e:
@@ -276,6 +324,10 @@ class FacultyMember(User):
             conn.close()
         return result
 
+    def get_faculty_page(self, cursor, fields=None, after=None, limit=50):
+        """One keyset page of faculty members ordered by user id"""
+        return FACULTY_LIST.fetch_page(cursor, fields, after, limit)
+
     def get_faculty_members(self,cursor):
         query = """SELECT U.user_id, U.firstName, U.lastName, U.accountStatus, Fac.role
         FROM Users AS U 
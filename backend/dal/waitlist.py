@@ -0,0 +1,109 @@
+class Waitlist:
+    """FIFO course waitlists.
+
+    Queue order is the auto-increment waitlist_id, and the composite index on
+    (course_id, status, waitlist_id) serves "next in line" as a single index
+    seek and a student's position as one index range count. The table is
+    created by backend/tools/schema.py.
+    """
+
+    TABLE = "Waitlist"
+
+    # `waiting` is 1 while an entry waits and NULL once resolved, so the unique
+    # key allows one waiting entry per student and course but any number of
+    # resolved ones
+    CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS Waitlist (
+        waitlist_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        course_id INT NOT NULL,
+        status ENUM('Waiting', 'Promoted', 'Left', 'Skipped') NOT NULL DEFAULT 'Waiting',
+        joinedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        resolvedAt DATETIME NULL,
+        waiting TINYINT AS (IF(status = 'Waiting', 1, NULL)) VIRTUAL,
+        INDEX idx_waitlist_queue (course_id, status, waitlist_id),
+        INDEX idx_waitlist_student (student_id, status),
+        UNIQUE KEY uq_waitlist_waiting (student_id, course_id, waiting)
+    )
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_entry(self, cursor, student_id, course_id):
+        """waitlist_id of the student's waiting entry for a course, or None"""
+        query = """
+        SELECT waitlist_id FROM Waitlist
+        WHERE student_id = %s AND course_id = %s AND status = 'Waiting'
+        """
+        cursor.execute(query, (student_id, course_id))
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def add_student(self, cursor, conn, student_id, course_id):
+        """Append a student to the end of a course waitlist (ER_DUP_ENTRY if they already wait)"""
+        query = "INSERT INTO Waitlist (student_id, course_id) VALUES (%s, %s)"
+        cursor.execute(query, (student_id, course_id))
+        conn.commit()
+        return cursor.lastrowid
+
+    def remove_student(self, cursor, conn, student_id, course_id):
+        """Take a student off a course waitlist; False if they were not waiting"""
+        query = """
+        UPDATE Waitlist SET status = 'Left', resolvedAt = NOW()
+        WHERE student_id = %s AND course_id = %s AND status = 'Waiting'
+        """
+        cursor.execute(query, (student_id, course_id))
+        removed = cursor.rowcount > 0
+        conn.commit()
+        return removed
+
+    def get_position(self, cursor, course_id, waitlist_id):
+        """1-based place in line of a waiting entry"""
+        query = """
+        SELECT COUNT(*) FROM Waitlist
+        WHERE course_id = %s AND status = 'Waiting' AND waitlist_id <= %s
+        """
+        cursor.execute(query, (course_id, waitlist_id))
+        return cursor.fetchone()[0]
+
+    def get_waiting_count(self, cursor, course_id):
+        query = "SELECT COUNT(*) FROM Waitlist WHERE course_id = %s AND status = 'Waiting'"
+        cursor.execute(query, (course_id,))
+        return cursor.fetchone()[0]
+
+    def get_waitlisted_students(self, cursor, course_id, limit=None):
+        """(student_id, full name, email) of waiting students in queue order"""
+        query = """
+        SELECT w.student_id, CONCAT(u.firstName, ' ', u.lastName), u.email
+        FROM Waitlist w
+        JOIN Users u ON w.student_id = u.user_id
+        WHERE w.course_id = %s AND w.status = 'Waiting'
+        ORDER BY w.waitlist_id
+        """
+        params = [course_id]
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        cursor.execute(query, tuple(params))
+        return cursor.fetchall()
+
+    def lock_next(self, cursor, course_id):
+        """Lock the head of a course waitlist; returns (waitlist_id, student_id) or None.
+
+        Does not commit: promotion belongs to the caller's drop transaction.
+        """
+        query = """
+        SELECT waitlist_id, student_id FROM Waitlist
+        WHERE course_id = %s AND status = 'Waiting'
+        ORDER BY waitlist_id
+        LIMIT 1
+        FOR UPDATE
+        """
+        cursor.execute(query, (course_id,))
+        return cursor.fetchone()
+
+    def resolve_entry(self, cursor, waitlist_id, status):
+        """Mark a locked entry Promoted, Left or Skipped without committing"""
+        query = "UPDATE Waitlist SET status = %s, resolvedAt = NOW() WHERE waitlist_id = %s"
+        cursor.execute(query, (status, waitlist_id))
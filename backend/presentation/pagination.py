@@ -0,0 +1,35 @@
+from flask import Response, current_app, jsonify
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def page_args(args):
+    """{'fields', 'after', 'limit'} when the request asks for a page (limit, after or fields), else None"""
+    if not any(name in args for name in ("limit", "after", "fields")):
+        return None
+    limit = args.get("limit", DEFAULT_LIMIT, type=int)
+    fields = [name.strip() for name in args.get("fields", "").split(",") if name.strip()]
+    return {
+        "fields": fields or None,
+        "after": args.get("after") or None,
+        "limit": max(1, min(limit, MAX_LIMIT))
+    }
+
+
+def page_response(result, status=200):
+    """Stream a page result as JSON, one row at a time; errors are returned as-is"""
+    if status != 200:
+        return jsonify(result), status
+
+    dumps = current_app.json.dumps
+    rows = result.get("data", [])
+    meta = {key: value for key, value in result.items() if key != "data"}
+
+    def generate():
+        yield dumps(meta)[:-1] + (', "data": [' if meta else '"data": [')
+        for i, row in enumerate(rows):
+            yield ("," if i else "") + dumps(row)
+        yield "]}"
+
+    return Response(generate(), mimetype="application/json")
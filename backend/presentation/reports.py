@@ -1,34 +1,66 @@
 from abc import ABC, abstractmethod
 from backend.dal.dbconfig import dbconfig
+import csv
+import io
+import itertools
 import json
 from datetime import datetime
+from html import escape
 
 class GenerateReport(ABC):
     @abstractmethod
-    def getData(self):
-        # Execute query and fetch data
+    def getQuery(self):
+        # (query, params) that fetch the report rows
         pass
 
     @abstractmethod
-    def processData(self):
-        # Logic to process self.data
+    def processRow(self, row, position):
+        # Logic to turn one fetched row (1-based position) into a report entry
         pass
 
-    @abstractmethod
+    def getData(self):
+        # Execute query and fetch data; the connection is only borrowed for the query
+        query, params = self.getQuery()
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def processData(self):
+        return [self.processRow(row, position) for position, row in enumerate(self.getData(), 1)]
+
     def outputData(self):
-        # Logic to output the processed data
-        pass
+        return self.processData()
+
+    def iterData(self, cursor, batch_size=500):
+        """Yield report entries one at a time from `cursor`.
+
+        With an unbuffered cursor only one batch of rows is in memory, which
+        is what the streaming exports use.
+        """
+        query, params = self.getQuery()
+        cursor.execute(query, params)
+        position = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                position += 1
+                yield self.processRow(row, position)
 
 class EnrollmentStatisticsReport(GenerateReport):
     def __init__(self, dept_id=None, semester=None):
         self.db = dbconfig()
-        self.conn = self.db.get_db_connection()
-        self.cursor = self.conn.cursor()
         self.dept_id = dept_id
         self.semester = semester
 
-    def getData(self):
-        # Execute query and fetch enrollment statistics data
+    def getQuery(self):
+        # Enrollment statistics for one department or all departments
         if self.dept_id:
             query = """
             SELECT C.course_id, C.courseName, dept.deptName, C.availableSeats, C.capacity,
@@ -40,9 +72,8 @@ class EnrollmentStatisticsReport(GenerateReport):
             WHERE dept.dept_Id = %s
             ORDER BY C.courseName;
             """
-            self.cursor.execute(query, (self.dept_id,))
-        else:
-            query = """
+            return query, (self.dept_id,)
+        query = """
             SELECT C.course_id, C.courseName, dept.deptName, C.availableSeats, C.capacity,
                    (C.capacity - C.availableSeats) as filled_seats,
                    CONCAT(U.firstName, ' ', U.lastName) as instructor_name
@@ -51,44 +82,32 @@ class EnrollmentStatisticsReport(GenerateReport):
             JOIN Users as U ON C.facultyMem_Id = U.user_id
             ORDER BY dept.deptName, C.courseName;
             """
-            self.cursor.execute(query)
-        courses = self.cursor.fetchall()
-        return courses
+        return query, ()
+
+    def processRow(self, course, position):
+        # Logic to process one course of the enrollment statistics
+        course_id, course_name, dept_name, available_seats, capacity, filled_seats, instructor = course
+        utilization_percentage = (filled_seats / capacity * 100) if capacity > 0 else 0
+        return {
+            "course_id": course_id,
+            "courseName": course_name,
+            "department": dept_name,
+            "instructor": instructor,
+            "availableSeats": available_seats,
+            "capacity": capacity,
+            "filledSeats": filled_seats,
+            "utilizationPercentage": round(utilization_percentage, 2),
+            "status": "Full" if available_seats == 0 else "Open"
+        }
 
-    def processData(self):
-        # Logic to process enrollment statistics data
-        courses = self.getData()
-        processed_data = []
-        for course in courses:
-            course_id, course_name, dept_name, available_seats, capacity, filled_seats, instructor = course
-            utilization_percentage = (filled_seats / capacity * 100) if capacity > 0 else 0
-            
-            processed_data.append({
-                "course_id": course_id,
-                "courseName": course_name,
-                "department": dept_name,
-                "instructor": instructor,
-                "availableSeats": available_seats,
-                "capacity": capacity,
-                "filledSeats": filled_seats,
-                "utilizationPercentage": round(utilization_percentage, 2),
-                "status": "Full" if available_seats == 0 else "Open"
-            })
-        return processed_data
 
-    def outputData(self):
-        # Logic to output the processed enrollment statistics data
-        departmentCourses = self.processData()
-        return departmentCourses
 class FacultyWorkloadReport(GenerateReport):
     def __init__(self, faculty_id=None):
         self.db = dbconfig()
-        self.conn = self.db.get_db_connection()
-        self.cursor = self.conn.cursor()
         self.faculty_id = faculty_id
 
-    def getData(self):
-        # Execute query and fetch faculty workload data
+    def getQuery(self):
+        # Faculty workload for one faculty member or all of them
         if self.faculty_id:
             query = """
             SELECT f.facultyMem_Id, CONCAT(u.firstName, ' ', u.lastName) as facultyName, 
@@ -102,9 +121,8 @@ class FacultyWorkloadReport(GenerateReport):
             WHERE f.facultyMem_Id = %s
             GROUP BY f.facultyMem_Id, u.firstName, u.lastName, d.deptName;
             """
-            self.cursor.execute(query, (self.faculty_id,))
-        else:
-            query = """
+            return query, (self.faculty_id,)
+        query = """
             SELECT f.facultyMem_Id, CONCAT(u.firstName, ' ', u.lastName) as facultyName, 
                    d.deptName, COUNT(C.course_Id) AS numberOfCourses,
                    SUM(C.capacity - C.availableSeats) AS totalEnrolledStudents,
@@ -116,39 +134,26 @@ class FacultyWorkloadReport(GenerateReport):
             GROUP BY f.facultyMem_Id, u.firstName, u.lastName, d.deptName
             ORDER BY d.deptName, u.lastName;
             """
-            self.cursor.execute(query)
-        results = self.cursor.fetchall()
-        return results
+        return query, ()
 
-    def processData(self):
-        # Process the data to a list of dicts
-        results = self.getData()
-        processed = []
-        for row in results:
-            processed.append({
-                "facultyId": row[0],
-                "facultyName": row[1],
-                "department": row[2] or "Unassigned",
-                "numberOfCourses": row[3] or 0,
-                "totalEnrolledStudents": row[4] or 0,
-                "avgStudentsPerCourse": round(row[5] or 0, 2)
-            })
-        return processed
-
-    def outputData(self):
-        # Output the processed faculty workload data
-        return self.processData()
+    def processRow(self, row, position):
+        return {
+            "facultyId": row[0],
+            "facultyName": row[1],
+            "department": row[2] or "Unassigned",
+            "numberOfCourses": row[3] or 0,
+            "totalEnrolledStudents": row[4] or 0,
+            "avgStudentsPerCourse": round(row[5] or 0, 2)
+        }
 
 
 class CoursePopularityReport(GenerateReport):
     def __init__(self, semester=None, limit=10):
         self.db = dbconfig()
-        self.conn = self.db.get_db_connection()
-        self.cursor = self.conn.cursor()
         self.semester = semester
         self.limit = limit
 
-    def getData(self):
+    def getQuery(self):
         # Get course popularity data based on enrollment
         query = """
         SELECT C.course_id, C.courseName, dept.deptName,
@@ -163,40 +168,29 @@ class CoursePopularityReport(GenerateReport):
         ORDER BY enrolled_count DESC, popularity_percentage DESC
         LIMIT %s;
         """
-        self.cursor.execute(query, (self.limit,))
-        results = self.cursor.fetchall()
-        return results
-
-    def processData(self):
-        results = self.getData()
-        processed = []
-        for i, row in enumerate(results, 1):
-            processed.append({
-                "rank": i,
-                "course_id": row[0],
-                "courseName": row[1],
-                "department": row[2],
-                "instructor": row[3],
-                "capacity": row[4],
-                "availableSeats": row[5],
-                "enrolledCount": row[6],
-                "popularityPercentage": row[7]
-            })
-        return processed
+        return query, (self.limit,)
 
-    def outputData(self):
-        return self.processData()
+    def processRow(self, row, position):
+        return {
+            "rank": position,
+            "course_id": row[0],
+            "courseName": row[1],
+            "department": row[2],
+            "instructor": row[3],
+            "capacity": row[4],
+            "availableSeats": row[5],
+            "enrolledCount": row[6],
+            "popularityPercentage": row[7]
+        }
 
 
 class HighCapacityCoursesReport(GenerateReport):
     def __init__(self, department_name=None, threshold_percentage=90):
         self.db = dbconfig()
-        self.conn = self.db.get_db_connection()
-        self.cursor = self.conn.cursor()
         self.department_name = department_name
         self.threshold_percentage = threshold_percentage
 
-    def getData(self):
+    def getQuery(self):
         # Get courses above the capacity threshold
         if self.department_name:
             query = """
@@ -213,9 +207,8 @@ class HighCapacityCoursesReport(GenerateReport):
             AND ((C.capacity - C.availableSeats) / C.capacity) * 100 >= %s
             ORDER BY utilization_percentage DESC;
             """
-            self.cursor.execute(query, (f"%{self.department_name}%", self.threshold_percentage))
-        else:
-            query = """
+            return query, (f"%{self.department_name}%", self.threshold_percentage)
+        query = """
             SELECT C.course_id, C.courseName, dept.deptName,
                    CONCAT(U.firstName, ' ', U.lastName) as instructor_name,
                    C.capacity, C.availableSeats,
@@ -228,39 +221,28 @@ class HighCapacityCoursesReport(GenerateReport):
             AND ((C.capacity - C.availableSeats) / C.capacity) * 100 >= %s
             ORDER BY utilization_percentage DESC;
             """
-            self.cursor.execute(query, (self.threshold_percentage,))
-        results = self.cursor.fetchall()
-        return results
+        return query, (self.threshold_percentage,)
 
-    def processData(self):
-        results = self.getData()
-        processed = []
-        for row in results:
-            processed.append({
-                "course_id": row[0],
-                "courseName": row[1],
-                "department": row[2],
-                "instructor": row[3],
-                "capacity": row[4],
-                "availableSeats": row[5],
-                "enrolledCount": row[6],
-                "utilizationPercentage": row[7],
-                "status": "Critical" if row[7] >= 95 else "High"
-            })
-        return processed
-
-    def outputData(self):
-        return self.processData()
+    def processRow(self, row, position):
+        return {
+            "course_id": row[0],
+            "courseName": row[1],
+            "department": row[2],
+            "instructor": row[3],
+            "capacity": row[4],
+            "availableSeats": row[5],
+            "enrolledCount": row[6],
+            "utilizationPercentage": row[7],
+            "status": "Critical" if row[7] >= 95 else "High"
+        }
 
 
 class DepartmentAnalyticsReport(GenerateReport):
     def __init__(self, semester=None):
         self.db = dbconfig()
-        self.conn = self.db.get_db_connection()
-        self.cursor = self.conn.cursor()
         self.semester = semester
 
-    def getData(self):
+    def getQuery(self):
         # Get comprehensive department analytics
         query = """
         SELECT 
@@ -278,103 +260,160 @@ class DepartmentAnalyticsReport(GenerateReport):
         GROUP BY dept.dept_Id, dept.deptName
         ORDER BY avg_utilization DESC;
         """
-        self.cursor.execute(query)
-        results = self.cursor.fetchall()
-        return results
+        return query, ()
 
-    def processData(self):
-        results = self.getData()
-        processed = []
-        for row in results:
-            processed.append({
-                "departmentId": row[0],
-                "departmentName": row[1],
-                "totalCourses": row[2] or 0,
-                "totalCapacity": row[3] or 0,
-                "totalEnrolled": row[4] or 0,
-                "totalAvailable": row[5] or 0,
-                "avgUtilization": row[6] or 0,
-                "facultyCount": row[7] or 0
-            })
-        return processed
-
-    def outputData(self):
-        return self.processData()
+    def processRow(self, row, position):
+        return {
+            "departmentId": row[0],
+            "departmentName": row[1],
+            "totalCourses": row[2] or 0,
+            "totalCapacity": row[3] or 0,
+            "totalEnrolled": row[4] or 0,
+            "totalAvailable": row[5] or 0,
+            "avgUtilization": row[6] or 0,
+            "facultyCount": row[7] or 0
+        }
 
 
 class ReportExporter:
+    """Report exports as generators of text chunks.
+
+    Rows can be any iterable of dicts (including a generator reading from a
+    cursor), so an export starts sending before the whole report is read and
+    holds at most `chunk_rows` formatted rows at a time.
+    """
+
+    FORMATS = {
+        "json": "application/json",
+        "html": "text/html",
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson"
+    }
+
+    HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+        .high-capacity {{ background-color: #ffebee; }}
+        .critical-capacity {{ background-color: #ffcdd2; }}
+        h1 {{ color: #333; }}
+        .report-meta {{ color: #666; font-size: 0.9em; margin-bottom: 20px; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <div class="report-meta">Generated on: {generated}</div>
+"""
+
+    @classmethod
+    def stream(cls, export_format, rows, title="Report", chunk_rows=200):
+        """Chunks of `rows` exported as json, html, csv or ndjson"""
+        if export_format == "json":
+            return cls.stream_json(rows, chunk_rows)
+        if export_format == "html":
+            return cls.stream_html_table(rows, title, chunk_rows)
+        if export_format == "csv":
+            return cls.stream_csv(rows, chunk_rows)
+        if export_format == "ndjson":
+            return cls.stream_ndjson(rows, chunk_rows)
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    @staticmethod
+    def stream_json(rows, chunk_rows=200):
+        """{"generated_at": ..., "data": [...]} with the array written row by row"""
+        yield '{"generated_at": %s, "data": [' % json.dumps(datetime.now().isoformat())
+        chunk = []
+        for i, row in enumerate(rows):
+            chunk.append(("," if i else "") + json.dumps(row, default=str))
+            if len(chunk) >= chunk_rows:
+                yield "".join(chunk)
+                chunk = []
+        chunk.append("]}")
+        yield "".join(chunk)
+
+    @staticmethod
+    def stream_ndjson(rows, chunk_rows=200):
+        """One JSON object per line"""
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps(row, default=str) + "\n")
+            if len(chunk) >= chunk_rows:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+    @staticmethod
+    def stream_csv(rows, chunk_rows=200):
+        """Header from the first row's keys, then one line per row"""
+        buffer = io.StringIO()
+        writer = None
+        for i, row in enumerate(rows, 1):
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(row)
+            if i % chunk_rows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.getvalue():
+            yield buffer.getvalue()
+
+    @classmethod
+    def stream_html_table(cls, rows, title="Report", chunk_rows=200):
+        """HTML page with one table row per report row; headers come from the first row"""
+        rows = iter(rows)
+        first = next(rows, None)
+        safe_title = escape(title)
+        if first is None:
+            yield f"<h2>{safe_title}</h2><p>No data available</p>"
+            return
+
+        headers = list(first.keys())
+        yield cls.HTML_HEAD.format(title=safe_title, generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        yield "    <table>\n        <thead>\n            <tr>"
+        yield "".join(f"<th>{escape(header.replace('_', ' ').title())}</th>" for header in headers)
+        yield "</tr>\n        </thead>\n        <tbody>\n"
+
+        chunk = []
+        for row in itertools.chain([first], rows):
+            chunk.append(cls._html_row(row, headers))
+            if len(chunk) >= chunk_rows:
+                yield "".join(chunk)
+                chunk = []
+        chunk.append("        </tbody>\n    </table>\n</body>\n</html>\n")
+        yield "".join(chunk)
+
+    @staticmethod
+    def _html_row(row, headers):
+        # Add CSS class based on utilization percentage if available
+        css_class = ""
+        if 'utilizationPercentage' in row:
+            if row['utilizationPercentage'] >= 95:
+                css_class = ' class="critical-capacity"'
+            elif row['utilizationPercentage'] >= 90:
+                css_class = ' class="high-capacity"'
+
+        cells = []
+        for header in headers:
+            value = row.get(header, "")
+            if isinstance(value, float):
+                value = f"{value:.2f}"
+            cells.append(f"<td>{escape(str(value))}</td>")
+        return f"<tr{css_class}>{''.join(cells)}</tr>\n"
+
     @staticmethod
     def export_to_json(data, filename=None):
         """Export report data to JSON format"""
-        if not filename:
-            filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        export_data = {
-            "generated_at": datetime.now().isoformat(),
-            "data": data
-        }
-        
-        return json.dumps(export_data, indent=2, default=str)
-    
+        return "".join(ReportExporter.stream_json(data))
+
     @staticmethod
     def export_to_html_table(data, title="Report"):
         """Export report data to HTML table format"""
-        if not data:
-            return f"<h2>{title}</h2><p>No data available</p>"
-        
-        # Get column headers from the first item
-        headers = list(data[0].keys()) if data else []
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{title}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                .high-capacity {{ background-color: #ffebee; }}
-                .critical-capacity {{ background-color: #ffcdd2; }}
-                h1 {{ color: #333; }}
-                .report-meta {{ color: #666; font-size: 0.9em; margin-bottom: 20px; }}
-            </style>
-        </head>
-        <body>
-            <h1>{title}</h1>
-            <div class="report-meta">Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-            <table>
-                <thead>
-                    <tr>
-                        {"".join(f"<th>{header.replace('_', ' ').title()}</th>" for header in headers)}
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for row in data:
-            # Add CSS class based on utilization percentage if available
-            css_class = ""
-            if 'utilizationPercentage' in row:
-                if row['utilizationPercentage'] >= 95:
-                    css_class = ' class="critical-capacity"'
-                elif row['utilizationPercentage'] >= 90:
-                    css_class = ' class="high-capacity"'
-            
-            html += f'<tr{css_class}>'
-            for header in headers:
-                value = row.get(header, "")
-                if isinstance(value, float):
-                    value = f"{value:.2f}"
-                html += f"<td>{value}</td>"
-            html += "</tr>"
-        
-        html += """
-                </tbody>
-            </table>
-        </body>
-        </html>
-        """
-        
-        return html
\ No newline at end of file
+        return "".join(ReportExporter.stream_html_table(data, title))
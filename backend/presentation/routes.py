@@ -1,19 +1,29 @@
 from turtle import st
-from flask import request,Blueprint,jsonify,render_template,session,redirect,url_for,make_response
+import io
+from flask import request,Blueprint,jsonify,render_template,session,redirect,url_for,make_response,Response
 from backend.service.adminService import AdminService
 from backend.dal.course import Course
 from backend.service.courseService import CourseService
 from backend.dal.dbconfig import dbconfig
+from backend.dal.metadataCache import metadata_cache
+from backend.dal.courseCatalogCache import course_catalog
+from backend.dal.gradeAuditLog import get_grade_audit_writer
+from backend.dal.studentProgress import get_progress_refresher
+from backend.dal.scheduleCache import schedule_cache
+from backend.presentation.pagination import page_args, page_response
 from backend.service.departmentService import DepartmentService
 from backend.service.facService import FacultyService
 from backend.service.studentService import StudentService
 from backend.dal.degree import Degree
 from backend.service.degreeService import DegreeService
-from backend.presentation.reports import FacultyWorkloadReport, EnrollmentStatisticsReport
+from backend.presentation.reports import FacultyWorkloadReport, EnrollmentStatisticsReport, ReportExporter
 from backend.service.userService import UserService
 from backend.service.enrollmentService import EnrollmentService
+from backend.service.waitlistService import WaitlistService
+from backend.service.admissionQueue import get_admission_queue, AdmissionQueueFull
 from backend.service.scheduleProgressService import ScheduleProgressService
 from backend.service.reportingService import ReportingService
+from backend.service.reportSnapshots import get_report_snapshots
 from backend.service.rosterService import RosterService
 from backend.service.gradeSubmissionService import GradeSubmissionService
 from backend.service.courseRequestService import CourseRequestService
@@ -198,6 +208,13 @@ def add_course():
 
 @bp.route('/api/users')
 def api_users():
+    # ?limit/after/fields return one page of students, or of faculty with type=faculty
+    page = page_args(request.args)
+    if page is not None:
+        if request.args.get('type') == 'faculty':
+            return page_response(*FacultyService(dbconfig()).get_faculty_page(**page))
+        return page_response(*StudentService(dbconfig()).get_students_page(**page))
+
     student_service = StudentService(dbconfig())
     users = student_service.displayStudents()
     faculty_service = FacultyService(dbconfig())
@@ -215,8 +232,22 @@ def api_reports():
 @bp.route('/api/courses')
 def api_courses():
     service = CourseService(dbconfig())
-    courses = service.getAllCourses()
-    return jsonify(courses)
+    page = page_args(request.args)
+    if page is not None:
+        return page_response(*service.getCoursesPage(**page))
+
+    catalog = service.getCourseCatalog()
+    if catalog["status"] != "Success":
+        return jsonify(catalog), 500
+
+    # The ETag is the catalog cache version, so unchanged catalogs cost a 304
+    if catalog["etag"] in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = jsonify(catalog["courses"])
+    response.set_etag(catalog["etag"])
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 @bp.route('/api/courses/search')
 def api_search_courses():
@@ -295,6 +326,9 @@ def api_delete_course(course_id):
 @bp.route('/api/departments')
 def api_departments():
     service = DepartmentService(dbconfig())
+    page = page_args(request.args)
+    if page is not None:
+        return page_response(*service.getDepartmentsPage(**page))
     departments = service.getDepartments()
     return jsonify(departments)
 
@@ -310,12 +344,50 @@ def api_faculty():
     faculty = service.get_faculty_members()
     return jsonify(faculty)
 
+@bp.route('/api/system/db-pool')
+def api_db_pool_metrics():
+    """Get database connection pool metrics"""
+    return jsonify({"status": "Success", "data": dbconfig().get_pool_metrics()}), 200
+
+@bp.route('/api/system/metadata-cache')
+def api_metadata_cache_metrics():
+    """Get metadata cache hit/miss counters"""
+    return jsonify({"status": "Success", "data": metadata_cache.get_stats()}), 200
+
+@bp.route('/api/system/course-catalog')
+def api_course_catalog_metrics():
+    """Get course catalog cache counters and version"""
+    return jsonify({"status": "Success", "data": course_catalog.get_stats()}), 200
+
+@bp.route('/api/system/schedule-cache')
+def api_schedule_cache_metrics():
+    """Get weekly schedule cache hit/miss counters"""
+    return jsonify({"status": "Success", "data": schedule_cache.get_stats()}), 200
+
+@bp.route('/api/system/grade-audit')
+def api_grade_audit_metrics():
+    """Get grade audit writer counters (buffered, written, failed batches)"""
+    return jsonify({"status": "Success", "data": get_grade_audit_writer().get_stats()}), 200
+
+@bp.route('/api/system/progress-refresher')
+def api_progress_refresher_metrics():
+    """Get student progress refresher counters (submitted, refreshed, pending)"""
+    return jsonify({"status": "Success", "data": get_progress_refresher().get_stats()}), 200
+
+@bp.route('/api/system/admission-queue')
+def api_admission_queue_metrics():
+    """Get enrollment admission queue metrics"""
+    return jsonify({"status": "Success", "data": get_admission_queue().get_metrics()}), 200
+
 # ============= ROSTER MANAGEMENT ENDPOINTS =============
 
 @bp.route('/api/roster/<int:faculty_id>/<int:course_id>')
 def api_get_class_roster(faculty_id, course_id):
     """Get class roster for a specific course taught by a faculty member"""
     service = RosterService(dbconfig())
+    page = page_args(request.args)
+    if page is not None:
+        return page_response(*service.get_class_roster_page(faculty_id, course_id, **page))
     result = service.get_class_roster(faculty_id, course_id)
     
     if result["status"] == "Success":
@@ -341,13 +413,40 @@ def api_export_roster_csv(faculty_id, course_id):
     result = service.export_roster_csv(faculty_id, course_id)
     
     if result["status"] == "Success":
-        response = make_response(result["content"])
-        response.headers["Content-Disposition"] = f"attachment; filename={result['filename']}"
-        response.headers["Content-type"] = "text/csv"
-        return response
+        return _csv_download(result)
     else:
         return jsonify(result), 400
 
+@bp.route('/api/roster/<int:faculty_id>/export')
+def api_export_faculty_rosters_csv(faculty_id):
+    """Export the rosters of a faculty member's courses (?course_id=1&course_id=2 or ?dept_id=3) to CSV"""
+    service = RosterService(dbconfig())
+    result = service.export_rosters_csv(request.args.getlist('course_id', type=int),
+                                        request.args.get('dept_id', type=int), faculty_id)
+    if result["status"] == "Success":
+        return _csv_download(result)
+    else:
+        return jsonify(result), 400
+
+@bp.route('/api/roster/export')
+def api_export_rosters_csv():
+    """Export the rosters of any courses (?course_id=1&course_id=2) or a department (?dept_id=3) to CSV (admins only)"""
+    if session.get('module') != 'admin':
+        return jsonify({"status": "Error", "message": "Admin access required"}), 403
+    service = RosterService(dbconfig())
+    result = service.export_rosters_csv(request.args.getlist('course_id', type=int),
+                                        request.args.get('dept_id', type=int))
+    if result["status"] == "Success":
+        return _csv_download(result)
+    else:
+        return jsonify(result), 400
+
+def _csv_download(result):
+    """Stream a generator of CSV chunks as a file download"""
+    response = Response(result["content"], mimetype="text/csv")
+    response.headers.set("Content-Disposition", "attachment", filename=result["filename"])
+    return response
+
 # ============= GRADE SUBMISSION ENDPOINTS =============
 
 @bp.route('/api/grades/<int:faculty_id>/<int:course_id>')
@@ -385,6 +484,39 @@ def api_submit_batch_grades():
     else:
         return jsonify(result), 400
 
+@bp.route('/api/grades/import', methods=['POST'])
+def api_import_grades_csv():
+    """Import grades from an uploaded CSV file (student ID or email, grade)"""
+    faculty_id = request.form.get('faculty_id', type=int)
+    course_id = request.form.get('course_id', type=int)
+    upload = request.files.get('file')
+
+    if not faculty_id or not course_id or upload is None:
+        return jsonify({
+            "status": "Error",
+            "message": "Missing required fields: faculty_id, course_id, file"
+        }), 400
+
+    # Read the upload line by line rather than loading it
+    lines = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+    service = GradeSubmissionService(dbconfig())
+    result = service.import_grades_csv(faculty_id, course_id, lines)
+
+    if result["status"] in ["Success", "Completed"]:
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
+
+@bp.route('/api/grades/import/errors/<token>')
+def api_download_grade_import_errors(token):
+    """Download the error report of a CSV grade import"""
+    service = GradeSubmissionService(dbconfig())
+    result = service.get_import_error_report(token)
+    if result["status"] == "Success":
+        return _csv_download(result)
+    else:
+        return jsonify(result), 404
+
 @bp.route('/api/grades/update/<int:enrollment_id>', methods=['PUT'])
 def api_update_pending_grade(enrollment_id):
     """Update/correct a pending grade"""
@@ -439,6 +571,17 @@ def api_get_grading_summary(faculty_id, course_id):
     else:
         return jsonify(result), 400
 
+@bp.route('/api/grades/audit/<int:faculty_id>/<int:course_id>')
+def api_get_grade_audit_log(faculty_id, course_id):
+    """Get the grade audit trail of a course, newest first (?limit=200)"""
+    service = GradeSubmissionService(dbconfig())
+    result = service.get_grade_audit_log(faculty_id, course_id, min(request.args.get('limit', 200, type=int), 1000))
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
+
 @bp.route('/api/grades/courses/<int:faculty_id>')
 def api_get_faculty_courses_grading_status(faculty_id):
     """Get faculty courses with grading status information"""
@@ -563,8 +706,17 @@ def api_enroll_student():
     if not student_id or not course_id:
         return jsonify({"status": "Error", "message": "Both student_id and course_id are required"}), 400
     
-    service = EnrollmentService(dbconfig())
-    result = service.enroll_student_in_course(student_id, course_id)
+    try:
+        course_id = int(course_id)
+    except (TypeError, ValueError):
+        return jsonify({"status": "Error", "message": "Invalid course ID format"}), 400
+    
+    try:
+        result = get_admission_queue().submit(student_id, course_id)
+    except AdmissionQueueFull as e:
+        response = jsonify({"status": "Error", "message": "Too many enrollment requests for this course, please retry shortly"})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -597,6 +749,57 @@ def api_drop_enrollment(enrollment_id):
     else:
         return jsonify(result), 400
 
+@bp.route('/api/waitlist', methods=['POST'])
+def api_join_waitlist():
+    """Join the waitlist of a full course"""
+    data = request.get_json()
+    student_id = data.get('student_id')
+    course_id = data.get('course_id')
+    
+    if not student_id or not course_id:
+        return jsonify({"status": "Error", "message": "Both student_id and course_id are required"}), 400
+    
+    service = WaitlistService(dbconfig())
+    result = service.join_waitlist(student_id, course_id)
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
+
+@bp.route('/api/waitlist/<int:student_id>/<int:course_id>', methods=['DELETE'])
+def api_leave_waitlist(student_id, course_id):
+    """Leave a course waitlist"""
+    service = WaitlistService(dbconfig())
+    result = service.leave_waitlist(student_id, course_id)
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
+
+@bp.route('/api/waitlist/<int:student_id>/<int:course_id>')
+def api_get_waitlist_position(student_id, course_id):
+    """Get a student's position on a course waitlist"""
+    service = WaitlistService(dbconfig())
+    result = service.get_waitlist_position(student_id, course_id)
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 404
+
+@bp.route('/api/courses/<int:course_id>/waitlist')
+def api_get_course_waitlist(course_id):
+    """Get the waiting students for a course in queue order"""
+    service = WaitlistService(dbconfig())
+    result = service.get_course_waitlist(course_id)
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
+
 @bp.route('/api/enrollments/<int:student_id>')
 def api_get_student_enrollments(student_id):
     """Get all active enrollments for a student"""
@@ -636,48 +839,24 @@ def api_enrollment_statistics():
 def api_get_available_courses_for_student(student_id):
     """Get courses available for enrollment for a specific student"""
     service = EnrollmentService(dbconfig())
-    course_service = CourseService(dbconfig())
-    
-    # Get all courses
-    all_courses = course_service.getAllCourses()
-    
-    # Get student's current enrollments
-    enrollments_result = service.get_student_enrollments(student_id)
-    enrolled_course_ids = []
-    
-    if enrollments_result["status"] == "Success":
-        enrolled_course_ids = [enrollment[2] for enrollment in enrollments_result["data"]]
-    
-    # Filter out courses the student is already enrolled in
-    available_courses = []
-    for course in all_courses:
-        course_id = course[6]  # Assuming course_id is at index 6 in getAllCourses result
-        if course_id not in enrolled_course_ids:
-            # Validate if student can enroll
-            validation = service.validate_enrollment_requirements(student_id, course_id)
-            course_data = {
-                "course_id": course_id,
-                "courseName": course[0],
-                "instructor": f"{course[1]} {course[2]}",
-                "department": course[3],
-                "availableSeats": course[4],
-                "capacity": course[5],
-                "can_enroll": validation["can_enroll"],
-                "issues": validation.get("issues", [])
-            }
-            available_courses.append(course_data)
-    
-    return jsonify({"status": "Success", "courses": available_courses}), 200
+    result = service.get_available_courses_for_student(student_id)
+    
+    if result["status"] == "Success":
+        return jsonify(result), 200
+    else:
+        return jsonify(result), 400
 
 
 # ============ NOTIFICATION SYSTEM API ENDPOINTS ============
 
 @bp.route('/api/notifications/statistics')
 def api_notification_statistics():
-    """Get notification system statistics"""
+    """Get notification system statistics; page the log with ?after=<cursor>&limit=<n>"""
     try:
+        after = request.args.get('after', type=int)
+        limit = request.args.get('limit', default=10, type=int)
         service = EnrollmentService(dbconfig())
-        result = service.get_notification_statistics()
+        result = service.get_notification_statistics(after, limit)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({"status": "Error", "message": str(e)}), 500
@@ -697,11 +876,12 @@ def api_manage_notification_observers():
     """Manage notification observers (attach/detach)"""
     try:
         data = request.get_json()
-        action = data.get('action')  # 'attach', 'detach', 'attach_all'
+        action = data.get('action')  # 'attach', 'detach', 'attach_all', 'enable_digest', 'disable_digest'
         observer_type = data.get('observer_type')  # 'student', 'advisor', 'admin'
+        window = data.get('window')  # digest window in seconds
         
         service = EnrollmentService(dbconfig())
-        result = service.manage_notification_observers(action, observer_type)
+        result = service.manage_notification_observers(action, observer_type, window)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({"status": "Error", "message": str(e)}), 500
@@ -722,6 +902,8 @@ def api_test_notification_events():
             service.notification_manager.notify_course_dropped(student_id, course_id, course_name)
         elif event_type == 'enrollment_successful':
             service.notification_manager.notify_enrollment_successful(student_id, course_id, course_name)
+        elif event_type == 'waitlist_promoted':
+            service.notification_manager.notify_waitlist_promoted(student_id, course_id, course_name)
         elif event_type == 'enrollment_failed':
             reason = data.get('reason', 'Test failure reason')
             service.notification_manager.notify_enrollment_failed(student_id, course_id, course_name, reason)
@@ -751,13 +933,6 @@ def api_get_personal_schedule(student_id):
     
     service = ScheduleProgressService()
     
-    # Validate student access
-    if not service.validate_student_access(student_id):
-        return jsonify({
-            "status": "Error",
-            "message": "Student not found or access denied"
-        }), 404
-    
     # Convert semester_id to int if provided
     if semester_id:
         try:
@@ -768,6 +943,19 @@ def api_get_personal_schedule(student_id):
                 "message": "Invalid semester ID format"
             }), 400
     
+    # Repeat views are served from the cache without touching the database;
+    # only validated students are cached, and account changes drop their entries
+    cached = service.get_cached_schedule(student_id, semester_id)
+    if cached is not None:
+        return jsonify(cached), 200
+    
+    # Validate student access
+    if not service.validate_student_access(student_id):
+        return jsonify({
+            "status": "Error",
+            "message": "Student not found or access denied"
+        }), 404
+    
     result = service.get_student_schedule(student_id, semester_id)
     
     if result["status"] == "Success":
@@ -816,6 +1004,7 @@ def api_get_student_progress(student_id):
     - Pending degree requirements
     - Academic statistics
     - Progress percentage
+    With ?summary=true only the student info and academic summary are returned.
     """
     service = ScheduleProgressService()
     
@@ -826,7 +1015,7 @@ def api_get_student_progress(student_id):
             "message": "Student not found or access denied"
         }), 404
     
-    result = service.get_student_academic_progress(student_id)
+    result = service.get_student_academic_progress(student_id, request.args.get('summary', '').lower() in ('1', 'true'))
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -861,9 +1050,7 @@ def api_enrollment_statistics_detailed():
     department_id = request.args.get('department_id', type=int)
     semester = request.args.get('semester')
     
-    service = ReportingService()
-    result = service.get_enrollment_statistics_by_department(department_id, semester)
-    service.close_connection()
+    result = get_report_snapshots().get('enrollment-statistics', {"department_id": department_id, "semester": semester})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -875,9 +1062,7 @@ def api_faculty_workload_detailed():
     """Get detailed faculty workload reports"""
     faculty_id = request.args.get('faculty_id', type=int)
     
-    service = ReportingService()
-    result = service.get_faculty_workload_report(faculty_id)
-    service.close_connection()
+    result = get_report_snapshots().get('faculty-workload', {"faculty_id": faculty_id})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -890,9 +1075,7 @@ def api_course_popularity_trends():
     semester = request.args.get('semester')
     limit = request.args.get('limit', default=10, type=int)
     
-    service = ReportingService()
-    result = service.get_course_popularity_trends(semester, limit)
-    service.close_connection()
+    result = get_report_snapshots().get('course-popularity', {"semester": semester, "limit": limit})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -905,9 +1088,8 @@ def api_high_capacity_courses():
     department_name = request.args.get('department')
     threshold = request.args.get('threshold', default=90, type=float)
     
-    service = ReportingService()
-    result = service.get_high_capacity_courses(department_name, threshold)
-    service.close_connection()
+    result = get_report_snapshots().get('high-capacity-courses',
+                                        {"department_name": department_name, "threshold_percentage": threshold})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -922,9 +1104,7 @@ def api_business_school_high_capacity():
     """
     threshold = request.args.get('threshold', default=90, type=float)
     
-    service = ReportingService()
-    result = service.get_business_school_high_capacity_report(threshold)
-    service.close_connection()
+    result = get_report_snapshots().get('business-school-capacity', {"threshold_percentage": threshold})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -936,9 +1116,7 @@ def api_department_analytics():
     """Get comprehensive department analytics"""
     semester = request.args.get('semester')
     
-    service = ReportingService()
-    result = service.get_department_analytics(semester)
-    service.close_connection()
+    result = get_report_snapshots().get('department-analytics', {"semester": semester})
     
     if result["status"] == "Success":
         return jsonify(result), 200
@@ -948,91 +1126,74 @@ def api_department_analytics():
 @bp.route('/api/reports/dashboard')
 def api_comprehensive_dashboard():
     """Get all analytics data for comprehensive dashboard"""
-    service = ReportingService()
-    result = service.get_comprehensive_analytics_dashboard()
-    service.close_connection()
+    result = get_report_snapshots().get('dashboard')
     
     if result["status"] == "Success":
         return jsonify(result), 200
     else:
         return jsonify(result), 400
 
+@bp.route('/api/reports/snapshots')
+def api_report_snapshots():
+    """List stored report snapshots with their age and staleness budget"""
+    store = get_report_snapshots()
+    return jsonify({"status": "Success", "data": store.list_snapshots(), "stats": store.get_stats()}), 200
+
+@bp.route('/api/reports/refresh', methods=['POST'])
+def api_refresh_reports():
+    """Recompute report snapshots now: one (type + params), every snapshot of a type, or all (admins only)"""
+    if session.get('module') != 'admin':
+        return jsonify({"status": "Error", "message": "Admin access required"}), 403
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    try:
+        results = get_report_snapshots().refresh(data.get('type'), data.get('params'))
+    except (KeyError, ValueError) as e:
+        return jsonify({"status": "Error", "message": str(e.args[0])}), 400
+
+    failed = [result for result in results if result["status"] != "Success"]
+    if failed:
+        return jsonify({"status": "Error", "message": failed[0].get("message"), "refreshed": len(results) - len(failed)}), 500
+    return jsonify({"status": "Success", "refreshed": len(results)}), 200
+
 @bp.route('/api/reports/export/json')
 def api_export_report_json():
     """Export report data as JSON"""
-    report_type = request.args.get('type', 'enrollment')
-    department_id = request.args.get('department_id', type=int)
-    
-    service = ReportingService()
-    
-    # Get the appropriate report data
-    if report_type == 'enrollment':
-        report_result = service.get_enrollment_statistics_by_department(department_id)
-    elif report_type == 'faculty':
-        report_result = service.get_faculty_workload_report()
-    elif report_type == 'popularity':
-        report_result = service.get_course_popularity_trends()
-    elif report_type == 'business-capacity':
-        report_result = service.get_business_school_high_capacity_report()
-    else:
-        service.close_connection()
-        return jsonify({"status": "Error", "message": "Invalid report type"}), 400
-    
-    if report_result["status"] == "Success":
-        export_result = service.export_report_as_json(report_result["data"])
-        service.close_connection()
-        
-        if export_result["status"] == "Success":
-            response = make_response(export_result["data"])
-            response.headers['Content-Type'] = 'application/json'
-            response.headers['Content-Disposition'] = f'attachment; filename="{report_type}_report.json"'
-            return response
-        else:
-            return jsonify(export_result), 400
-    else:
-        service.close_connection()
-        return jsonify(report_result), 400
+    return _export_report('json')
 
 @bp.route('/api/reports/export/html')
 def api_export_report_html():
     """Export report data as HTML table"""
+    return _export_report('html')
+
+@bp.route('/api/reports/export/csv')
+def api_export_report_csv():
+    """Export report data as CSV"""
+    return _export_report('csv')
+
+@bp.route('/api/reports/export/ndjson')
+def api_export_report_ndjson():
+    """Export report data as newline-delimited JSON"""
+    return _export_report('ndjson')
+
+def _export_report(export_format):
+    """Stream the report chosen by ?type (and ?department_id) in export_format"""
     report_type = request.args.get('type', 'enrollment')
     department_id = request.args.get('department_id', type=int)
     
     service = ReportingService()
+    report_result = service.stream_report(report_type, department_id)
+    service.close_connection()
     
-    # Get the appropriate report data
-    if report_type == 'enrollment':
-        report_result = service.get_enrollment_statistics_by_department(department_id)
-        title = "Enrollment Statistics Report"
-    elif report_type == 'faculty':
-        report_result = service.get_faculty_workload_report()
-        title = "Faculty Workload Report"
-    elif report_type == 'popularity':
-        report_result = service.get_course_popularity_trends()
-        title = "Course Popularity Report"
-    elif report_type == 'business-capacity':
-        report_result = service.get_business_school_high_capacity_report()
-        title = "Business School High Capacity Report"
-    else:
-        service.close_connection()
-        return jsonify({"status": "Error", "message": "Invalid report type"}), 400
-    
-    if report_result["status"] == "Success":
-        export_result = service.export_report_as_html(report_result["data"], title)
-        service.close_connection()
-        
-        if export_result["status"] == "Success":
-            response = make_response(export_result["data"])
-            response.headers['Content-Type'] = 'text/html'
-            response.headers['Content-Disposition'] = f'attachment; filename="{report_type}_report.html"'
-            return response
-        else:
-            return jsonify(export_result), 400
-    else:
-        service.close_connection()
+    if report_result["status"] != "Success":
         return jsonify(report_result), 400
 
+    chunks = ReportExporter.stream(export_format, report_result["rows"], report_result["title"])
+    response = Response(chunks, mimetype=ReportExporter.FORMATS[export_format])
+    response.headers.set('Content-Disposition', 'attachment', filename=f"{report_type}_report.{export_format}")
+    return response
+
 
 # Course Request Management API Endpoints
 
@@ -1065,6 +1226,9 @@ def get_pending_requests():
     """Admin views all pending course requests"""
     try:
         service = CourseRequestService(dbconfig())
+        page = page_args(request.args)
+        if page is not None:
+            return page_response(*service.get_pending_requests_page(**page))
         result = service.get_pending_requests()
         
         if result["status"] == "Success":
@@ -0,0 +1,170 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from backend.dal.dbconfig import dbconfig
+from backend.service.enrollmentService import EnrollmentService
+
+
+class AdmissionQueueFull(Exception):
+    """Raised when a course already has too many enrollment requests waiting"""
+
+    def __init__(self, course_id, retry_after):
+        super().__init__(f"Admission queue for course {course_id} is full")
+        self.course_id = course_id
+        self.retry_after = retry_after
+
+
+class _CourseLane:
+    """Pending enroll requests for one course and the worker draining them"""
+
+    def __init__(self):
+        self.pending = deque()  # (student_id, future)
+        self.worker = None
+
+
+class AdmissionQueue:
+    """Per-course bounded admission queue for registration rushes.
+
+    Enroll requests for the same course are collected for a short batch window
+    and applied together by one worker per course, so a rush becomes a few
+    batched transactions on the Course row instead of hundreds of transactions
+    fighting over its lock. When a course has max_pending requests waiting,
+    new ones are refused with AdmissionQueueFull instead of piling up.
+    """
+
+    def __init__(self, apply_batch, max_pending=200, batch_window=0.05, max_batch_size=50,
+                 idle_timeout=5.0, result_timeout=30.0):
+        self.apply_batch = apply_batch  # (course_id, [student_id]) -> [result]
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.idle_timeout = idle_timeout
+        self.result_timeout = result_timeout
+        self._lanes = {}
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._batches = 0
+        self._rejected = 0
+
+    def submit(self, student_id, course_id):
+        """Queue an enroll request and wait for its result dict.
+
+        A request still waiting after result_timeout is withdrawn, so it can
+        no longer be enrolled behind the caller's back. One whose batch has
+        already started is waited for, since its outcome is about to be known.
+        """
+        future = self.submit_async(student_id, course_id)
+        try:
+            return future.result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            if self._withdraw(course_id, student_id, future):
+                return {"status": "Error", "message": "Enrollment request timed out before it was processed, please try again"}
+            return future.result()
+
+    def submit_async(self, student_id, course_id):
+        """Queue an enroll request and return a Future for its result dict"""
+        future = Future()
+        with self._condition:
+            lane = self._lanes.get(course_id)
+            if lane is None:
+                lane = self._lanes[course_id] = _CourseLane()
+            if len(lane.pending) >= self.max_pending:
+                self._rejected += 1
+                raise AdmissionQueueFull(course_id, self._retry_after(len(lane.pending)))
+            lane.pending.append((student_id, future))
+            if lane.worker is None:
+                lane.worker = threading.Thread(
+                    target=self._run_lane, args=(course_id, lane),
+                    name=f"admission-{course_id}", daemon=True
+                )
+                lane.worker.start()
+            self._condition.notify_all()
+        return future
+
+    def _withdraw(self, course_id, student_id, future):
+        """Cancel a request that no batch has picked up yet; False once it is being applied"""
+        with self._condition:
+            if not future.cancel():
+                return False
+            lane = self._lanes.get(course_id)
+            if lane is not None:
+                try:
+                    lane.pending.remove((student_id, future))
+                except ValueError:
+                    pass
+            return True
+
+    def get_metrics(self):
+        with self._lock:
+            return {
+                "courses": len(self._lanes),
+                "pending": sum(len(lane.pending) for lane in self._lanes.values()),
+                "batches": self._batches,
+                "rejected": self._rejected,
+                "max_pending": self.max_pending,
+                "batch_window": self.batch_window,
+                "max_batch_size": self.max_batch_size
+            }
+
+    def _retry_after(self, pending):
+        """Whole seconds until the current backlog should have drained"""
+        batches = math.ceil(pending / self.max_batch_size)
+        return max(1, math.ceil(batches * max(self.batch_window, 0.1)))
+
+    def _run_lane(self, course_id, lane):
+        while True:
+            with self._condition:
+                if not lane.pending:
+                    self._condition.wait_for(lambda: lane.pending, timeout=self.idle_timeout)
+                if not lane.pending:
+                    # Idle: retire the worker so quiet courses hold no threads
+                    lane.worker = None
+                    del self._lanes[course_id]
+                    return
+
+            if self.batch_window:
+                time.sleep(self.batch_window)
+
+            with self._condition:
+                batch = [lane.pending.popleft() for _ in range(min(self.max_batch_size, len(lane.pending)))]
+                # Withdrawn requests are cancelled; the rest can no longer be
+                batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+                if batch:
+                    self._batches += 1
+
+            if batch:
+                self._apply(course_id, batch)
+
+    def _apply(self, course_id, batch):
+        student_ids = [student_id for student_id, _ in batch]
+        try:
+            results = self.apply_batch(course_id, student_ids)
+        except Exception as e:
+            results = [{"status": "Error", "message": str(e)} for _ in batch]
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_admission_queue = None
+_admission_queue_lock = threading.Lock()
+
+
+def _enroll_batch(course_id, student_ids):
+    return EnrollmentService(dbconfig()).enroll_students_batch(course_id, student_ids)
+
+
+def get_admission_queue():
+    """Process-wide admission queue, configured from NEXUS_ENROLL_* environment variables"""
+    global _admission_queue
+    with _admission_queue_lock:
+        if _admission_queue is None:
+            _admission_queue = AdmissionQueue(
+                _enroll_batch,
+                max_pending=int(os.getenv("NEXUS_ENROLL_QUEUE_SIZE", "200")),
+                batch_window=float(os.getenv("NEXUS_ENROLL_BATCH_WINDOW_MS", "50")) / 1000,
+                max_batch_size=int(os.getenv("NEXUS_ENROLL_BATCH_SIZE", "50"))
+            )
+        return _admission_queue
@@ -45,6 +45,21 @@ class CourseRequestService:
                 conn.close()
             return {"status": "Error", "message": str(e)}
     
+    def get_pending_requests_page(self, fields=None, after=None, limit=50):
+        """One keyset page of pending requests, oldest first"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            return {"status": "Success", **self.course_request_dal.get_pending_page(cursor, fields, after, limit)}, 200
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_all_requests(self):
         """Get all course requests with optional status filter"""
         try:
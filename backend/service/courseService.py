@@ -1,4 +1,5 @@
 from backend.dal.course import Course
+from backend.dal.courseCatalogCache import course_catalog
 
 
 class CourseService:
@@ -33,6 +34,35 @@ class CourseService:
             cursor.close()
             conn.close()
 
+    def getCourseCatalog(self):
+        """Catalog listing with the cache version's ETag, for conditional GETs"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            courses, version = course_catalog.get_all_courses_versioned(cursor)
+            return {"status": "Success", "etag": course_catalog.etag(version), "courses": courses}
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def getCoursesPage(self, fields=None, after=None, limit=50):
+        """One keyset page of the catalog listing, projected to `fields`"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            return {"status": "Success", **self.Course.getCoursesPage(cursor, fields, after, limit)}, 200
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
+
     def getCourseById(self, course_id):
         conn = self.db.get_db_connection()
         cursor = conn.cursor()
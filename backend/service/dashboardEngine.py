@@ -0,0 +1,152 @@
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from backend.presentation.reports import (
+    EnrollmentStatisticsReport,
+    FacultyWorkloadReport,
+    CoursePopularityReport,
+    HighCapacityCoursesReport,
+    DepartmentAnalyticsReport
+)
+
+# MySQL evaluates integer / integer as DECIMAL with 4 extra decimals, AVG of
+# integers with 4 and AVG of those ratios with 8; the engine reproduces that
+# so its rows match what the report queries return
+_SCALE_4 = Decimal("0.0001")
+_SCALE_8 = Decimal("0.00000001")
+_SCALE_2 = Decimal("0.01")
+
+
+def _mysql_div(numerator, denominator, scale=_SCALE_4):
+    return (Decimal(numerator) / Decimal(denominator)).quantize(scale, rounding=ROUND_HALF_UP)
+
+
+def _utilization(filled, capacity):
+    """((capacity - availableSeats) / capacity) * 100 as MySQL computes it (scale 4)"""
+    return _mysql_div(filled, capacity) * 100
+
+
+def _concat_name(first, last):
+    # CONCAT() is NULL when any argument is NULL
+    return None if first is None or last is None else f"{first} {last}"
+
+
+def _text_key(value):
+    # ORDER BY on a case-insensitive column, NULLs first
+    return (value is not None, (value or "").casefold())
+
+
+class DashboardEngine:
+    """Builds the analytics dashboard from one read of the course catalog.
+
+    Instead of five report queries that each join Course with Department and
+    Users, the engine loads the course rows (with their department and
+    instructor) and the faculty roster once, derives every report's raw rows
+    in a single pass, and formats them with the report classes' own
+    processRow(), so each section matches the standalone report.
+    """
+
+    COURSE_QUERY = """
+    SELECT C.course_id, C.courseName, C.capacity, C.availableSeats, C.facultyMem_Id,
+           dept.dept_Id, dept.deptName, U.user_id, U.firstName, U.lastName
+    FROM Course AS C
+    LEFT JOIN Department AS dept ON C.dept_Id = dept.dept_Id
+    LEFT JOIN Users AS U ON C.facultyMem_Id = U.user_id
+    ORDER BY C.course_id
+    """
+
+    FACULTY_QUERY = """
+    SELECT f.facultyMem_Id, u.firstName, u.lastName
+    FROM FacultyStaff AS f
+    JOIN Users AS u ON f.facultyMem_Id = u.user_id
+    """
+
+    def __init__(self, popular_limit=5, high_capacity_threshold=85):
+        self.popular_limit = popular_limit
+        self.high_capacity_threshold = high_capacity_threshold
+
+    def build(self, cursor):
+        cursor.execute(self.COURSE_QUERY)
+        courses = cursor.fetchall()
+        cursor.execute(self.FACULTY_QUERY)
+        faculty = cursor.fetchall()
+        return self.compute(courses, faculty)
+
+    def compute(self, courses, faculty):
+        """Dashboard sections from COURSE_QUERY and FACULTY_QUERY rows"""
+        enrollment_rows = []
+        capacity_rows = []  # shared by popularity and high capacity
+        courses_by_faculty = defaultdict(list)
+        departments = {}
+
+        for course_id, name, capacity, available, faculty_id, dept_id, dept_name, user_id, first, last in courses:
+            filled = capacity - available
+            instructor = _concat_name(first, last)
+            courses_by_faculty[faculty_id].append((dept_name, filled))
+
+            if dept_id is not None and user_id is not None:
+                enrollment_rows.append((course_id, name, dept_name, available, capacity, filled, instructor))
+                if capacity > 0:
+                    utilization = _utilization(filled, capacity)
+                    capacity_rows.append((course_id, name, dept_name, instructor, capacity, available, filled,
+                                          utilization.quantize(_SCALE_2, rounding=ROUND_HALF_UP), utilization))
+
+            if dept_id is not None and capacity > 0:
+                department = departments.setdefault(dept_id, {
+                    "name": dept_name, "courses": 0, "capacity": 0, "filled": 0,
+                    "available": 0, "utilization": Decimal(0), "faculty": set()
+                })
+                department["courses"] += 1
+                department["capacity"] += capacity
+                department["filled"] += filled
+                department["available"] += available
+                department["utilization"] += _utilization(filled, capacity)
+                if faculty_id is not None:
+                    department["faculty"].add(faculty_id)
+
+        enrollment_rows.sort(key=lambda row: (_text_key(row[2]), _text_key(row[1])))
+
+        popular_rows = sorted(capacity_rows, key=lambda row: (-row[6], -row[7]))[:self.popular_limit]
+        threshold = Decimal(str(self.high_capacity_threshold))
+        high_rows = sorted((row for row in capacity_rows if row[8] >= threshold), key=lambda row: -row[7])
+
+        workload_rows = []
+        for faculty_id, first, last in faculty:
+            name = _concat_name(first, last)
+            taught = courses_by_faculty.get(faculty_id)
+            if not taught:
+                workload_rows.append((faculty_id, name, None, 0, None, None, last))
+                continue
+            by_department = defaultdict(list)
+            for dept_name, filled in taught:
+                by_department[dept_name].append(filled)
+            for dept_name, filled_counts in by_department.items():
+                total = sum(filled_counts)
+                workload_rows.append((faculty_id, name, dept_name, len(filled_counts), Decimal(total),
+                                      _mysql_div(total, len(filled_counts)), last))
+        workload_rows.sort(key=lambda row: (_text_key(row[2]), _text_key(row[6])))
+
+        department_rows = []
+        for dept_id, department in departments.items():
+            average = _mysql_div(department["utilization"], department["courses"], _SCALE_8)
+            department_rows.append((
+                dept_id, department["name"], department["courses"], Decimal(department["capacity"]),
+                Decimal(department["filled"]), Decimal(department["available"]),
+                average.quantize(_SCALE_2, rounding=ROUND_HALF_UP), len(department["faculty"])
+            ))
+        department_rows.sort(key=lambda row: -row[6])
+
+        return {
+            "enrollmentStatistics": self._format(EnrollmentStatisticsReport(), enrollment_rows),
+            "facultyWorkload": self._format(FacultyWorkloadReport(), [row[:6] for row in workload_rows]),
+            "popularCourses": self._format(CoursePopularityReport(limit=self.popular_limit),
+                                           [row[:8] for row in popular_rows]),
+            "highCapacityCourses": self._format(
+                HighCapacityCoursesReport(threshold_percentage=self.high_capacity_threshold),
+                [row[:8] for row in high_rows]
+            ),
+            "departmentAnalytics": self._format(DepartmentAnalyticsReport(), department_rows)
+        }
+
+    @staticmethod
+    def _format(report, rows):
+        return [report.processRow(row, position) for position, row in enumerate(rows, 1)]
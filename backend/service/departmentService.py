@@ -49,3 +49,18 @@ class DepartmentService:
         finally:
             cursor.close()
             conn.close()
+
+    def getDepartmentsPage(self, fields=None, after=None, limit=50):
+        """One keyset page of departments, projected to `fields`"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            return {"status": "Success", **Department().get_page(cursor, fields, after, limit)}, 200
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
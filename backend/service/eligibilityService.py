@@ -0,0 +1,129 @@
+import mysql.connector
+from mysql.connector import errorcode
+from backend.dal.enrollment import Enrollment
+from backend.dal.course import Course
+from backend.service.timeConflictIndex import WeeklyIntervalIndex, conflict_label
+
+
+class StudentEligibilityContext:
+    """Everything about a student that enrollment checks need, loaded once"""
+
+    def __init__(self, student_id, year, completed_course_ids, enrolled_course_ids, current_schedule):
+        self.student_id = student_id
+        self.year = year
+        self.completed_course_ids = completed_course_ids
+        self.enrolled_course_ids = enrolled_course_ids
+        self.current_schedule = current_schedule
+        self.schedule_index = WeeklyIntervalIndex.from_schedule(current_schedule)
+
+
+class EligibilityService:
+    """Set-based enrollment eligibility: one student context, many courses"""
+
+    def __init__(self, db):
+        self.db = db
+        self.enrollment = Enrollment(self.db)
+        self.course = Course(self.db)
+
+    def get_available_courses(self, student_id):
+        """Evaluate every course the student is not enrolled in"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            context = self.load_student_context(cursor, student_id)
+            courses = [course for course in self.course.getCoursesForEligibility(cursor)
+                       if course[0] not in context.enrolled_course_ids]
+            results = self.evaluate_courses(cursor, context, courses)
+
+            available_courses = []
+            for course in courses:
+                course_id, course_name, first_name, last_name, dept_name, available_seats, capacity, _ = course
+                validation = results[course_id]
+                available_courses.append({
+                    "course_id": course_id,
+                    "courseName": course_name,
+                    "instructor": f"{first_name} {last_name}",
+                    "department": dept_name,
+                    "availableSeats": available_seats,
+                    "capacity": capacity,
+                    "can_enroll": validation["can_enroll"],
+                    "issues": validation["issues"]
+                })
+
+            return {"status": "Success", "courses": available_courses}
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def validate_course(self, cursor, student_id, course_id, check_capacity=True):
+        """Evaluate a single course with the same rules as the bulk path"""
+        courses = self.course.getCoursesForEligibility(cursor, [course_id])
+        if not courses:
+            return {"can_enroll": False, "issues": ["Course not found"]}
+
+        context = self.load_student_context(cursor, student_id)
+        return self.evaluate_courses(cursor, context, courses, check_capacity)[course_id]
+
+    def load_student_context(self, cursor, student_id):
+        """Load year, completed courses, active enrollments and schedule in four queries"""
+        cursor.execute("SELECT YearOfStudy FROM Student WHERE student_Id = %s", (student_id,))
+        result = cursor.fetchone()
+        year = result[0] if result else 1
+
+        completed = {row[0] for row in self.enrollment.get_student_completed_courses(cursor, student_id)}
+        enrolled = self.enrollment.get_student_enrolled_course_ids(cursor, student_id)
+        schedule = self.enrollment.get_student_current_schedule(cursor, student_id)
+
+        return StudentEligibilityContext(student_id, year, completed, enrolled, schedule)
+
+    def evaluate_courses(self, cursor, context, courses, check_capacity=True):
+        """Evaluate capacity, year, prerequisites and time conflicts for many courses.
+
+        courses are rows from Course.getCoursesForEligibility. Returns a dict of
+        course_id -> {"can_enroll": bool, "issues": [...]}. Waitlists pass
+        check_capacity=False: their courses are full by definition.
+        """
+        course_ids = [course[0] for course in courses]
+        schedules = self.enrollment.get_course_schedules(cursor, course_ids)
+        prerequisites = self._get_prerequisites(cursor, course_ids)
+
+        results = {}
+        for course in courses:
+            course_id = course[0]
+            available_seats = course[5]
+            prerequisite_year = course[7]
+            issues = []
+
+            if course_id in context.enrolled_course_ids:
+                issues.append("Already enrolled in this course")
+
+            if check_capacity and available_seats <= 0:
+                issues.append("Course is full")
+
+            if prerequisite_year and context.year < prerequisite_year:
+                issues.append(f"Must be in year {prerequisite_year} or higher")
+
+            for prereq_id, prereq_name in prerequisites.get(course_id, []):
+                if prereq_id not in context.completed_course_ids:
+                    issues.append(f"Missing prerequisite: {prereq_name}")
+
+            time_conflict = context.schedule_index.find_course_conflict(schedules.get(course_id, []))
+            if time_conflict is not None:
+                issues.append(f"Time conflict with {conflict_label(time_conflict)}")
+
+            results[course_id] = {"can_enroll": not issues, "issues": issues}
+        return results
+
+    def _get_prerequisites(self, cursor, course_ids):
+        """Prerequisite rows for all candidates (empty if the table does not exist)"""
+        try:
+            return self.enrollment.get_course_prerequisites(cursor, course_ids)
+        except mysql.connector.Error as e:
+            # Only a missing prerequisites table means "no prerequisites"; any
+            # other failure must not report ineligible courses as enrollable
+            if e.errno == errorcode.ER_NO_SUCH_TABLE:
+                return {}
+            raise
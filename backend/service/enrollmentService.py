@@ -1,8 +1,18 @@
+import mysql.connector
+from mysql.connector import errorcode
 from backend.dal.enrollment import Enrollment
 from backend.dal.course import Course
+from backend.dal.waitlist import Waitlist
 from backend.dal.user import Student
-from backend.service.notificationService import NotificationManager
-from datetime import datetime, time
+from backend.service.notificationService import get_notification_manager
+from backend.service.eligibilityService import EligibilityService
+from backend.dal.transactionRetry import run_with_retry
+from backend.dal.unitOfWork import after_commit, commit_now
+from backend.dal.metadataCache import invalidate_course
+from backend.dal.courseCatalogCache import invalidate_catalog_seats
+from backend.dal.studentProgress import refresh_student_progress
+from backend.dal.scheduleCache import invalidate_student_schedules
+from backend.service.timeConflictIndex import WeeklyIntervalIndex, conflict_label
 
 class EnrollmentService:
     def __init__(self, db):
@@ -10,8 +20,10 @@ class EnrollmentService:
         self.enrollment = Enrollment(self.db)
         self.course = Course(self.db)
         self.student = Student(self.db)
-        # Initialize notification system using Observer pattern
-        self.notification_manager = NotificationManager(self.db)
+        self.waitlist = Waitlist(self.db)
+        self.eligibility = EligibilityService(self.db)
+        # Shared notification hub (Observer pattern), built once per process
+        self.notification_manager = get_notification_manager(self.db)
 
     def enroll_student_in_course(self, student_id, course_id):
         """Main enrollment method with all validation checks"""
@@ -54,30 +66,33 @@ class EnrollmentService:
 
             # Step 4: Check for time conflicts
             time_conflict = self._check_time_conflicts(cursor, student_id, course_id)
-            if time_conflict:
-                error_msg = f"Time conflict detected with course: {time_conflict}"
+            if time_conflict is not None:
+                error_msg = f"Time conflict detected with course: {conflict_label(time_conflict)}"
                 self.notification_manager.notify_enrollment_failed(student_id, course_id, course_name, error_msg)
                 return {"status": "Error", "message": error_msg}
 
-            # Step 5: All validations passed, proceed with enrollment
-            enrollment_result = self.enrollment.enroll_student(cursor, conn, student_id, course_id)
+            # Step 5: All validations passed, reserve a seat and enroll atomically.
+            # The conditional UPDATE is the real capacity check, so concurrent
+            # requests can never oversell even if they all passed Step 2.
+            enrollment_result = run_with_retry(
+                lambda: self.enrollment.reserve_seat_and_enroll(cursor, conn, student_id, course_id),
+                conn
+            )
             
             if enrollment_result["status"] == "Success":
-                # Update course capacity
-                self.enrollment.update_course_capacity(cursor, conn, course_id, increment=False)
-                
-                # Trigger notification using Observer pattern
-                course_name = course_data[1]  # courseName from course_data
-                self.notification_manager.notify_enrollment_successful(student_id, course_id, course_name)
-                
-                # Check for capacity warnings
-                if course_data[4] <= 3:  # If available seats <= 3
-                    self.notification_manager.notify_capacity_warning(
-                        course_id, course_name, course_data[4] - 1, course_data[3]
-                    )
+                # Trigger notification using Observer pattern, once the enrollment is committed
+                remaining_seats = enrollment_result["available_seats"]
+
+                def notify_enrolled():
+                    self.notification_manager.notify_enrollment_successful(student_id, course_id, course_name)
+                    # Check for capacity warnings
+                    if remaining_seats <= 2:
+                        self.notification_manager.notify_capacity_warning(
+                            course_id, course_name, remaining_seats, course_data[3]
+                        )
+                after_commit(notify_enrolled)
             else:
                 # Notify about enrollment failure
-                course_name = course_data[1]
                 self.notification_manager.notify_enrollment_failed(
                     student_id, course_id, course_name, enrollment_result.get("message", "Unknown error")
                 )
@@ -97,8 +112,99 @@ class EnrollmentService:
             cursor.close()
             conn.close()
 
+    def enroll_students_batch(self, course_id, student_ids):
+        """Enroll many students into one course with a single seat lock and commit.
+
+        Used by the admission queue during registration rushes. Each student is
+        validated like enroll_student_in_course; seats go to valid students in
+        request order. Returns one result dict per entry in student_ids.
+        """
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            course_data = self.course.getCourseById(cursor, course_id)
+            if not course_data:
+                error_msg = "Course not found"
+                self.notification_manager.notify_system_error("Course Lookup", error_msg, "Enrollment Service")
+                return [{"status": "Error", "message": error_msg} for _ in student_ids]
+
+            course_name = course_data[1]
+            results = {}
+            candidates = []
+            seen = set()
+            for student_id in student_ids:
+                if student_id in seen:
+                    continue
+                seen.add(student_id)
+                error_msg = self._check_student_requirements(cursor, student_id, course_id, course_data)
+                if error_msg:
+                    results[student_id] = {"status": "Error", "message": error_msg}
+                else:
+                    candidates.append(student_id)
+
+            def admit():
+                available_seats = self.enrollment.lock_course_seats(cursor, course_id) or 0
+                admitted = candidates[:max(available_seats, 0)]
+                outcome = self.enrollment.reserve_seats_and_enroll_many(cursor, conn, course_id, admitted)
+                if outcome["status"] != "Success":
+                    return [], available_seats
+                return admitted, available_seats - len(admitted)
+
+            admitted, remaining_seats = run_with_retry(admit, conn)
+            admitted_set = set(admitted)
+            for student_id in candidates:
+                if student_id in admitted_set:
+                    results[student_id] = {"status": "Success", "message": "Student enrolled successfully",
+                                           "available_seats": remaining_seats}
+                else:
+                    results[student_id] = {"status": "Error", "message": "Course is full. No available seats."}
+
+            def notify_results():
+                for student_id, result in results.items():
+                    if result["status"] == "Success":
+                        self.notification_manager.notify_enrollment_successful(student_id, course_id, course_name)
+                    else:
+                        self.notification_manager.notify_enrollment_failed(
+                            student_id, course_id, course_name, result["message"]
+                        )
+                if admitted and remaining_seats <= 2:
+                    self.notification_manager.notify_capacity_warning(
+                        course_id, course_name, remaining_seats, course_data[3]
+                    )
+            # Sent once the admitted enrollments are committed
+            after_commit(notify_results)
+
+            return [dict(results[student_id]) for student_id in student_ids]
+
+        except Exception as e:
+            conn.rollback()
+            self.notification_manager.notify_system_error(
+                "Enrollment Exception",
+                str(e),
+                "Enrollment Service - enroll_students_batch"
+            )
+            return [{"status": "Error", "message": str(e)} for _ in student_ids]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _check_student_requirements(self, cursor, student_id, course_id, course_data):
+        """Return the first failed per-student requirement as a message, or None"""
+        if self.enrollment.check_existing_enrollment(cursor, student_id, course_id):
+            return "Student is already enrolled in this course"
+
+        prerequisite_year = course_data[8]
+        if self._get_student_year(cursor, student_id) < prerequisite_year:
+            return f"Student must be in year {prerequisite_year} or higher to enroll in this course"
+
+        time_conflict = self._check_time_conflicts(cursor, student_id, course_id)
+        if time_conflict is not None:
+            return f"Time conflict detected with course: {conflict_label(time_conflict)}"
+        return None
+
     def drop_student_from_course(self, enrollment_id):
-        """Drop a student from a course"""
+        """Drop a student from a course, handing the seat to the head of the waitlist"""
         conn = self.db.get_db_connection()
         cursor = conn.cursor()
 
@@ -111,17 +217,41 @@ class EnrollmentService:
             course_id = enrollment_data[2]
             student_id = enrollment_data[1]
             course_name = enrollment_data[3]  # courseName from enrollment_data
-            
-            # Drop the enrollment
-            drop_result = self.enrollment.drop_enrollment(cursor, conn, enrollment_id)
-            
+
+            def drop_and_promote():
+                # Lock the seats row first, in the same order enrollments take it
+                self.enrollment.lock_course_seats(cursor, course_id)
+                if not self.enrollment.release_enrollment(cursor, enrollment_id):
+                    conn.rollback()
+                    return {"status": "Error", "message": "Active enrollment not found"}, None
+
+                # The freed seat goes straight to the next waiting student; it is
+                # only returned to the pool when nobody is waiting
+                promoted_student_id = self._promote_from_waitlist(cursor, course_id)
+                if promoted_student_id is None:
+                    self.enrollment.release_seat(cursor, course_id)
+                # Committed at once so the Course row lock is not held for the rest of the request
+                commit_now(conn)
+                invalidate_course(course_id)
+                if promoted_student_id is None:
+                    invalidate_catalog_seats(course_id)
+                refresh_student_progress([student_id, promoted_student_id])
+                invalidate_student_schedules([student_id, promoted_student_id])
+                return {"status": "Success", "message": "Course dropped successfully"}, promoted_student_id
+
+            drop_result, promoted_student_id = run_with_retry(drop_and_promote, conn)
+
             if drop_result["status"] == "Success":
-                # Update course capacity (increase available seats)
-                self.enrollment.update_course_capacity(cursor, conn, course_id, increment=True)
-                
-                # Trigger notification using Observer pattern
-                self.notification_manager.notify_course_dropped(student_id, course_id, course_name)
-                
+                if promoted_student_id is not None:
+                    drop_result["promoted_student_id"] = promoted_student_id
+
+                # Trigger notification using Observer pattern, once the drop is committed
+                def notify_dropped():
+                    self.notification_manager.notify_course_dropped(student_id, course_id, course_name)
+                    if promoted_student_id is not None:
+                        self.notification_manager.notify_waitlist_promoted(promoted_student_id, course_id, course_name)
+                after_commit(notify_dropped)
+
             return drop_result
 
         except Exception as e:
@@ -131,6 +261,37 @@ class EnrollmentService:
             cursor.close()
             conn.close()
 
+    def _promote_from_waitlist(self, cursor, course_id):
+        """Enroll the first waiting student who is still eligible; returns their id or None.
+
+        Entries of students who enrolled meanwhile are resolved as Left, and
+        those who no longer meet prerequisites, year or schedule as Skipped.
+        """
+        courses = self.course.getCoursesForEligibility(cursor, [course_id])
+        if not courses:
+            return None
+        while True:
+            try:
+                entry = self.waitlist.lock_next(cursor, course_id)
+            except mysql.connector.Error as e:
+                # Schema not applied yet: nobody can be waiting
+                if e.errno == errorcode.ER_NO_SUCH_TABLE:
+                    return None
+                raise
+            if entry is None:
+                return None
+            waitlist_id, student_id = entry
+            if self.enrollment.check_existing_enrollment(cursor, student_id, course_id):
+                self.waitlist.resolve_entry(cursor, waitlist_id, "Left")
+                continue
+            context = self.eligibility.load_student_context(cursor, student_id)
+            if not self.eligibility.evaluate_courses(cursor, context, courses, check_capacity=False)[course_id]["can_enroll"]:
+                self.waitlist.resolve_entry(cursor, waitlist_id, "Skipped")
+                continue
+            self.enrollment.insert_enrollment(cursor, student_id, course_id)
+            self.waitlist.resolve_entry(cursor, waitlist_id, "Promoted")
+            return student_id
+
     def get_student_enrollments(self, student_id):
         """Get all active enrollments for a student"""
         conn = self.db.get_db_connection()
@@ -167,44 +328,13 @@ class EnrollmentService:
         return result[0] if result else 1
 
     def _check_time_conflicts(self, cursor, student_id, new_course_id):
-        """Check for time conflicts with student's current schedule"""
-        # Get student's current schedule
+        """(course_id, course_name) of a current course clashing with the new one, or None"""
+        # Index the student's current schedule once, then look up each new meeting
         current_schedule = self.enrollment.get_student_current_schedule(cursor, student_id)
-        
-        # Get schedule for the new course
-        new_course_schedule = self.enrollment.get_course_schedule(cursor, new_course_id)
-        
-        # If no schedule data available (CourseSchedule table might not exist), skip time conflict check
-        if not new_course_schedule or not current_schedule:
-            return None
-        
-        # Check for conflicts
-        for new_class in new_course_schedule:
-            new_day, new_start, new_end = new_class
-            
-            for current_class in current_schedule:
-                current_course_id, current_course_name, current_day, current_start, current_end = current_class
-                
-                # Check if same day
-                if new_day == current_day:
-                    # Check if times overlap
-                    if self._times_overlap(new_start, new_end, current_start, current_end):
-                        return current_course_name
-        
-        return None
+        schedule_index = WeeklyIntervalIndex.from_schedule(current_schedule)
 
-    def _times_overlap(self, start1, end1, start2, end2):
-        """Check if two time periods overlap"""
-        # Convert to datetime objects for comparison if they're time objects
-        if isinstance(start1, time):
-            start1 = datetime.combine(datetime.today(), start1)
-            end1 = datetime.combine(datetime.today(), end1)
-        if isinstance(start2, time):
-            start2 = datetime.combine(datetime.today(), start2)
-            end2 = datetime.combine(datetime.today(), end2)
-        
-        # Check for overlap: (start1 < end2) and (end1 > start2)
-        return start1 < end2 and end1 > start2
+        new_course_schedule = self.enrollment.get_course_schedule(cursor, new_course_id)
+        return schedule_index.find_course_conflict(new_course_schedule)
 
     def validate_enrollment_requirements(self, student_id, course_id):
         """Validate all enrollment requirements without actually enrolling"""
@@ -212,50 +342,17 @@ class EnrollmentService:
         cursor = conn.cursor()
 
         try:
-            validation_results = {
-                "can_enroll": True,
-                "issues": []
-            }
-
-            # Check if already enrolled
-            if self.enrollment.check_existing_enrollment(cursor, student_id, course_id):
-                validation_results["can_enroll"] = False
-                validation_results["issues"].append("Already enrolled in this course")
-
-            # Check course capacity
-            course_data = self.course.getCourseById(cursor, course_id)
-            if not course_data:
-                validation_results["can_enroll"] = False
-                validation_results["issues"].append("Course not found")
-                return validation_results
-            
-            available_seats = course_data[4]
-            if available_seats <= 0:
-                validation_results["can_enroll"] = False
-                validation_results["issues"].append("Course is full")
-
-            # Check prerequisites
-            prerequisite_year = course_data[8]
-            student_year = self._get_student_year(cursor, student_id)
-            
-            if student_year < prerequisite_year:
-                validation_results["can_enroll"] = False
-                validation_results["issues"].append(f"Must be in year {prerequisite_year} or higher")
-
-            # Check time conflicts
-            time_conflict = self._check_time_conflicts(cursor, student_id, course_id)
-            if time_conflict:
-                validation_results["can_enroll"] = False
-                validation_results["issues"].append(f"Time conflict with {time_conflict}")
-
-            return validation_results
-
+            return self.eligibility.validate_course(cursor, student_id, course_id)
         except Exception as e:
             return {"can_enroll": False, "issues": [str(e)]}
         finally:
             cursor.close()
             conn.close()
 
+    def get_available_courses_for_student(self, student_id):
+        """Get every course the student is not enrolled in, with eligibility"""
+        return self.eligibility.get_available_courses(student_id)
+
     def get_student_schedule_summary(self, student_id):
         """Get a summary of student's current schedule"""
         conn = self.db.get_db_connection()
@@ -295,10 +392,10 @@ class EnrollmentService:
             cursor.close()
             conn.close()
 
-    def get_notification_statistics(self):
+    def get_notification_statistics(self, after=None, limit=10):
         """Get notification system statistics"""
         try:
-            return self.notification_manager.get_notification_statistics()
+            return self.notification_manager.get_notification_statistics(after, limit)
         except Exception as e:
             return {
                 "status": "Error", 
@@ -316,9 +413,15 @@ class EnrollmentService:
                 "message": f"Failed to run notification demo: {str(e)}"
             }
     
-    def manage_notification_observers(self, action, observer_type=None):
-        """Manage notification observers (attach/detach)"""
+    def manage_notification_observers(self, action, observer_type=None, window=None):
+        """Manage notification observers (attach/detach) and digest mode"""
         try:
+            if action == "enable_digest":
+                self.notification_manager.enable_digest_mode(window)
+                return {"status": "Success", "message": "Digest mode enabled"}
+            if action == "disable_digest":
+                self.notification_manager.disable_digest_mode()
+                return {"status": "Success", "message": "Digest mode disabled"}
             if action == "detach" and observer_type:
                 self.notification_manager.detach_observer(observer_type)
                 return {"status": "Success", "message": f"{observer_type} observer detached"}
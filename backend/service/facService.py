@@ -35,6 +35,21 @@ class FacultyService:
             cursor.close()
             conn.close()
     
+    def get_faculty_page(self, fields=None, after=None, limit=50):
+        """One keyset page of faculty members, projected to `fields`"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            return {"status": "Success", **FacultyMember(self.db).get_faculty_page(cursor, fields, after, limit)}, 200
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
+
     def updateFacultyMember(self, user_id, firstName=None, lastName=None, email=None, mobileNo=None, role=None):
         try:
             faculty_member = FacultyMember(self.db)
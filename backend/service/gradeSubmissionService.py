@@ -1,12 +1,29 @@
 from backend.dal.gradeSubmission import GradeSubmission
+from backend.dal.gradeAuditLog import GradeAuditLog, get_grade_audit_writer
 from backend.dal.course import Course
 from datetime import datetime
+import csv
+import os
+import re
+import secrets
+import tempfile
+import time
+
+# Error reports of CSV grade imports are kept here, downloadable by token
+IMPORT_REPORT_DIR = os.path.join(tempfile.gettempdir(), "nexus-grade-imports")
+IMPORT_REPORT_TTL = float(os.getenv("NEXUS_GRADE_IMPORT_REPORT_TTL", "3600"))
+IMPORT_CHUNK_SIZE = int(os.getenv("NEXUS_GRADE_IMPORT_CHUNK_SIZE", "500"))
+
+# Header names accepted for the student and grade columns
+STUDENT_COLUMNS = ("student_id", "student id", "studentid", "student", "id", "email", "student_email", "student email")
+GRADE_COLUMNS = ("grade", "marks", "mark")
 
 
 class GradeSubmissionService:
     def __init__(self, db):
         self.db = db
         self.grade_submission = GradeSubmission(self.db)
+        self.audit_log = GradeAuditLog(self.db)
         self.course = Course(self.db)
 
     def get_course_for_grading(self, faculty_id, course_id):
@@ -35,7 +52,7 @@ class GradeSubmissionService:
                 return verification_result
 
             # Process batch submission
-            result = self.grade_submission.batch_submit_grades(cursor, conn, grade_submissions)
+            result = self.grade_submission.batch_submit_grades(cursor, conn, grade_submissions, course_id, faculty_id=faculty_id)
             
             # Add course information to result
             result["course_id"] = course_id
@@ -52,6 +69,134 @@ class GradeSubmissionService:
             cursor.close()
             conn.close()
 
+    def import_grades_csv(self, faculty_id, course_id, lines, chunk_size=IMPORT_CHUNK_SIZE):
+        """Import grades from CSV lines (student ID or email, grade).
+
+        Rows are read and validated one at a time and applied in chunks of
+        chunk_size, each chunk in its own transaction on a dedicated
+        connection, so memory use does not grow with the file. Rejected rows
+        are written to an error report that can be downloaded with the
+        returned `error_report` token.
+        """
+        conn = self.db.get_dedicated_connection()
+        cursor = conn.cursor()
+        errors = _ImportErrorReport()
+        summary = {"total_rows": 0, "successful": 0, "chunks": 0}
+
+        try:
+            course_info = self.grade_submission.get_grading_course(cursor, faculty_id, course_id)
+            if not course_info:
+                return {"status": "Error", "message": "Course not found or access denied"}
+
+            chunk = []
+            for row_number, student, grade in self._read_grade_rows(lines, errors):
+                summary["total_rows"] += 1
+                if student is None:
+                    continue
+                validation = self.grade_submission.validate_grade(grade)
+                if not validation["valid"]:
+                    errors.add(row_number, student, grade, validation["message"])
+                    continue
+                chunk.append((row_number, student, grade))
+                if len(chunk) >= chunk_size:
+                    summary["successful"] += self._import_chunk(cursor, conn, faculty_id, course_id, chunk, errors)
+                    summary["chunks"] += 1
+                    chunk = []
+            if chunk:
+                summary["successful"] += self._import_chunk(cursor, conn, faculty_id, course_id, chunk, errors)
+                summary["chunks"] += 1
+
+            return {
+                "status": "Completed" if summary["successful"] else "Error",
+                **summary,
+                "failed": summary["total_rows"] - summary["successful"],
+                "error_report": errors.token,
+                "course_id": course_id,
+                "course_name": course_info[1],
+                "timestamp": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            conn.rollback()
+            return {"status": "Error", "message": str(e), **summary, "error_report": errors.token}
+        finally:
+            errors.close()
+            cursor.close()
+            conn.close()
+
+    def get_import_error_report(self, token):
+        """The error report of a CSV grade import as a CSV download"""
+        path = _ImportErrorReport.path_for(token)
+        if path is None or not os.path.exists(path):
+            return {"status": "Error", "message": "Error report not found or expired"}
+
+        def content():
+            with open(path, newline="", encoding="utf-8") as report:
+                while True:
+                    chunk = report.read(64 * 1024)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        return {"status": "Success", "filename": f"grade_import_errors_{token[:8]}.csv", "content": content()}
+
+    def _read_grade_rows(self, lines, errors):
+        """Yield (row number, student id or lowercased email, grade) for each CSV row.
+
+        A header row naming the columns is optional; without one the first
+        column is the student and the second the grade. Unreadable students
+        are reported to `errors` and yielded as None so they still count.
+        """
+        student_column, grade_column = 0, 1
+        first_row = True
+        for row_number, row in enumerate(csv.reader(lines), 1):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if first_row:
+                first_row = False
+                header = [cell.strip().lower() for cell in row]
+                if any(name in header for name in GRADE_COLUMNS):
+                    student_column = next((header.index(name) for name in STUDENT_COLUMNS if name in header), 0)
+                    grade_column = next(header.index(name) for name in GRADE_COLUMNS if name in header)
+                    continue
+
+            student = row[student_column].strip() if student_column < len(row) else ""
+            grade = row[grade_column].strip() if grade_column < len(row) else ""
+            if "@" in student:
+                yield row_number, student.lower(), grade
+            elif student.isdigit():
+                yield row_number, int(student), grade
+            else:
+                errors.add(row_number, student, grade, "Invalid student ID or email")
+                yield row_number, None, grade
+
+    def _import_chunk(self, cursor, conn, faculty_id, course_id, chunk, errors):
+        """Apply one chunk of (row number, student, grade) in a transaction; returns the rows applied"""
+        student_ids = list({student for _, student, _ in chunk if isinstance(student, int)})
+        emails = list({student for _, student, _ in chunk if isinstance(student, str)})
+        by_id, by_email = self.grade_submission.get_enrollments_by_student(cursor, course_id, student_ids, emails)
+
+        submissions = []
+        for row_number, student, grade in chunk:
+            enrollment_id = (by_id if isinstance(student, int) else by_email).get(student)
+            if enrollment_id is None:
+                errors.add(row_number, student, grade, "Student not enrolled in this course")
+                continue
+            submissions.append((row_number, student, grade, enrollment_id))
+        if not submissions:
+            return 0
+
+        # batch_submit_grades commits the chunk when any of it applied
+        result = self.grade_submission.batch_submit_grades(
+            cursor, conn,
+            [{"enrollment_id": enrollment_id, "grade": grade} for _, _, grade, enrollment_id in submissions],
+            course_id, faculty_id=faculty_id
+        )
+        for (row_number, student, grade, _), outcome in zip(submissions, result["results"]):
+            if outcome["status"] != "Success":
+                errors.add(row_number, student, grade, outcome["message"])
+        return result["successful"]
+
     def update_single_grade(self, faculty_id, enrollment_id, new_grade):
         """Update a single pending grade"""
         conn = self.db.get_db_connection()
@@ -72,7 +217,7 @@ class GradeSubmissionService:
                 return {"status": "Error", "message": "Enrollment not found or access denied"}
 
             # Update the grade
-            result = self.grade_submission.update_pending_grade(cursor, conn, enrollment_id, new_grade)
+            result = self.grade_submission.update_pending_grade(cursor, conn, enrollment_id, new_grade, faculty_id)
             
             if result["status"] == "Success":
                 result["course_id"] = access_check[1]
@@ -101,9 +246,6 @@ class GradeSubmissionService:
             if result["status"] == "Success":
                 result["course_id"] = course_id
                 result["timestamp"] = datetime.now().isoformat()
-                
-                # Log the finalization for audit purposes
-                self._log_grade_finalization(cursor, conn, faculty_id, course_id, result["finalized_count"])
 
             return result
 
@@ -173,6 +315,42 @@ class GradeSubmissionService:
             cursor.close()
             conn.close()
 
+    def get_grade_audit_log(self, faculty_id, course_id, limit=200):
+        """Audit trail of a course's grade changes, newest first.
+
+        Entries still buffered by the audit writer are not in the table yet;
+        `pending` counts them, so an incomplete trail is visible.
+        """
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            if not self.grade_submission.get_grading_course(cursor, faculty_id, course_id):
+                return {"status": "Error", "message": "Course not found or access denied"}
+
+            entries = [
+                {
+                    "audit_id": row[0],
+                    "enrollment_id": row[1],
+                    "faculty_id": row[2],
+                    "action": row[3],
+                    "old_marks": row[4],
+                    "new_marks": row[5],
+                    "old_status": row[6],
+                    "new_status": row[7],
+                    "logged_at": row[8].isoformat() if row[8] else None
+                }
+                for row in self.audit_log.get_course_log(cursor, course_id, limit)
+            ]
+            return {"status": "Success", "course_id": course_id, "entries": entries,
+                    "pending": get_grade_audit_writer().pending_count(course_id)}
+
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
     def validate_grade_format(self, grade):
         """Validate grade format without database interaction"""
         return self.grade_submission.validate_grade(grade)
@@ -225,17 +403,47 @@ class GradeSubmissionService:
             cursor.close()
             conn.close()
 
-    def _log_grade_finalization(self, cursor, conn, faculty_id, course_id, count):
-        """Log grade finalization for audit purposes (optional)"""
-        try:
-            # This could be expanded to create an audit log table
-            log_query = """
-            INSERT INTO GradeAuditLog (faculty_id, course_id, action, grade_count, timestamp)
-            VALUES (%s, %s, 'FINALIZE_GRADES', %s, CURRENT_TIMESTAMP)
-            """
-            # Only execute if audit table exists
-            # cursor.execute(log_query, (faculty_id, course_id, count))
-            pass
-        except:
-            # Ignore audit logging errors
-            pass
+class _ImportErrorReport:
+    """Rejected rows of one CSV grade import, written to a temporary file as they occur"""
+
+    HEADER = ["row", "student", "grade", "error"]
+    TOKEN_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(self):
+        self.token = None
+        self._file = None
+        self._writer = None
+
+    def add(self, row_number, student, grade, message):
+        if self._writer is None:
+            self._open()
+        self._writer.writerow([row_number, student, grade, message])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def _open(self):
+        os.makedirs(IMPORT_REPORT_DIR, exist_ok=True)
+        self._remove_expired()
+        self.token = secrets.token_hex(16)
+        self._file = open(self.path_for(self.token), "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.HEADER)
+
+    @classmethod
+    def path_for(cls, token):
+        if not token or not cls.TOKEN_PATTERN.match(token):
+            return None
+        return os.path.join(IMPORT_REPORT_DIR, f"{token}.csv")
+
+    @staticmethod
+    def _remove_expired():
+        cutoff = time.time() - IMPORT_REPORT_TTL
+        for name in os.listdir(IMPORT_REPORT_DIR):
+            path = os.path.join(IMPORT_REPORT_DIR, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
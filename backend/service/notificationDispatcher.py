@@ -0,0 +1,330 @@
+import atexit
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from backend.shared.structuredLog import get_logger
+
+logger = get_logger("notifications.dispatcher")
+
+
+class NotificationDispatcher:
+    """Delivers observer notifications on background worker threads.
+
+    submit() only queues a delivery and returns, so enroll/drop requests no
+    longer wait for observers to look up students or advisors. Observer calls
+    run on a fixed pool of max_calls call threads; a worker waits up to the
+    observer's timeout and then moves on, leaving the call in flight until it
+    returns. Failed deliveries are retried with exponential backoff, and ones
+    that still fail end up in a bounded dead-letter list. With workers=0
+    deliveries run inline on the caller.
+    """
+
+    def __init__(self, workers=4, max_queue=1000, observer_timeout=5.0, max_attempts=3,
+                 base_delay=0.2, max_delay=5.0, dead_letter_size=200, max_calls=None):
+        self.workers = workers
+        self.max_calls = max_calls or workers * 2
+        self.max_queue = max_queue
+        self.observer_timeout = observer_timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._ready = deque()
+        self._delayed = []  # heap of (due, seq, job) waiting for their retry backoff
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._calls = deque()  # observer calls waiting for a call thread
+        self._call_slots = threading.Semaphore(self.max_calls)
+        self._calls_running = 0
+        self._accepting = True
+        self._stopped = False
+        self._dead_letters = deque(maxlen=dead_letter_size)
+        self._stats = {"queued": 0, "delivered": 0, "retried": 0, "dead_lettered": 0, "rejected": 0, "timeouts": 0}
+        self._threads = []
+        if workers > 0:
+            for i in range(workers):
+                thread = threading.Thread(target=self._run_worker, name=f"notify-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            # Plain daemon threads rather than an executor, which refuses work
+            # once interpreter shutdown starts, exactly when the exit drain runs
+            for i in range(self.max_calls):
+                thread = threading.Thread(target=self._run_caller, name=f"notify-call-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, observer, event_type, event_data):
+        """Queue one observer delivery; False if it was refused (queue full or shut down)"""
+        job = {"observer": observer, "event_type": event_type, "event_data": dict(event_data), "attempts": 0}
+        if self.workers == 0:
+            self._deliver_inline(job)
+            return True
+
+        with self._condition:
+            if not self._accepting or len(self._ready) + len(self._delayed) >= self.max_queue:
+                self._stats["rejected"] += 1
+                self._dead_letter(job, "Notification queue full" if self._accepting else "Dispatcher shut down")
+                return False
+            self._ready.append(job)
+            self._stats["queued"] += 1
+            self._condition.notify()
+        return True
+
+    def drain(self, timeout=None):
+        """Wait until every queued delivery (including pending retries) has finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._ready or self._delayed or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining if remaining is not None else 0.5)
+        return True
+
+    def shutdown(self, timeout=10.0):
+        """Stop accepting deliveries, drain what is queued and stop the workers"""
+        with self._condition:
+            self._accepting = False
+        drained = self.drain(timeout)
+        with self._condition:
+            self._stopped = True
+            for job in list(self._ready) + [job for _, _, job in self._delayed]:
+                self._dead_letter(job, "Dispatcher shut down before delivery")
+            self._ready.clear()
+            self._delayed.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        return drained
+
+    def get_metrics(self):
+        with self._condition:
+            return {
+                **self._stats,
+                "pending": len(self._ready),
+                "scheduled_retries": len(self._delayed),
+                "in_flight": self._in_flight,
+                "calls_running": self._calls_running,
+                "dead_letters": len(self._dead_letters),
+                "workers": self.workers,
+                "max_queue": self.max_queue
+            }
+
+    def get_dead_letters(self):
+        with self._condition:
+            return list(self._dead_letters)
+
+    def _run_worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            finished, error = True, "Delivery failed"
+            try:
+                finished, error = self._call_observer(job)
+            finally:
+                if finished:
+                    with self._condition:
+                        self._in_flight -= 1
+                        self._finish(job, error)
+                        self._condition.notify_all()
+
+    def _next_job(self):
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._delayed)[2])
+                if self._ready:
+                    self._in_flight += 1
+                    return self._ready.popleft()
+                wait = self._delayed[0][0] - now if self._delayed else None
+                self._condition.wait(wait)
+
+    def _call_observer(self, job):
+        """Run one delivery on a call thread with the observer's timeout.
+
+        Returns (finished, error). A call still running after the timeout is
+        detached: it stays in flight and the call thread records its outcome
+        (and schedules any retry) once it returns, so a slow observer is never
+        called again for the same event while the first call may still succeed.
+        When every call thread is busy the worker waits for one to free up.
+        """
+        timeout = getattr(job["observer"], "delivery_timeout", self.observer_timeout)
+        call = {"job": job, "done": False, "error": None, "detached": False}
+        self._call_slots.acquire()
+        with self._condition:
+            self._calls.append(call)
+            self._condition.notify_all()
+            if self._condition.wait_for(lambda: call["done"], timeout):
+                return True, call["error"]
+            call["detached"] = True
+            self._stats["timeouts"] += 1
+        logger.warning("%s still running after %ss, waiting for it before any retry",
+                       job["observer"].get_observer_type(), timeout)
+        return False, None
+
+    def _run_caller(self):
+        while True:
+            with self._condition:
+                while not self._calls and not self._stopped:
+                    self._condition.wait()
+                if not self._calls:
+                    return
+                call = self._calls.popleft()
+                self._calls_running += 1
+            job = call["job"]
+            error = None
+            try:
+                job["observer"].update(job["event_type"], job["event_data"])
+            except Exception as e:
+                error = str(e)
+            finally:
+                self._call_slots.release()
+            with self._condition:
+                call["done"], call["error"] = True, error
+                self._calls_running -= 1
+                if call["detached"]:
+                    # The worker gave up waiting; finish the delivery here
+                    self._in_flight -= 1
+                    self._finish(job, error)
+                self._condition.notify_all()
+
+    def _finish(self, job, error):
+        """Record a delivery outcome; called with the condition held"""
+        job["attempts"] += 1
+        if error is None:
+            self._stats["delivered"] += 1
+        elif job["attempts"] < self.max_attempts and not self._stopped:
+            self._stats["retried"] += 1
+            delay = min(self.max_delay, self.base_delay * (2 ** (job["attempts"] - 1)))
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), job))
+        else:
+            self._dead_letter(job, error)
+            logger.error("Error notifying %s: %s", job["observer"].get_observer_type(), error)
+
+    def _deliver_inline(self, job):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                job["observer"].update(job["event_type"], job["event_data"])
+                with self._condition:
+                    self._stats["delivered"] += 1
+                return
+            except Exception as e:
+                job["attempts"] = attempt
+                if attempt == self.max_attempts:
+                    with self._condition:
+                        self._dead_letter(job, str(e))
+                    logger.error("Error notifying %s: %s", job["observer"].get_observer_type(), e)
+                    return
+                time.sleep(min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def _dead_letter(self, job, error):
+        self._stats["dead_lettered"] += 1
+        self._dead_letters.append({
+            "observer": job["observer"].get_observer_type(),
+            "event_type": job["event_type"],
+            "event_data": job["event_data"],
+            "attempts": job["attempts"],
+            "error": error,
+            "failed_at": datetime.now()
+        })
+
+
+class DigestBuffer:
+    """Coalesces events per observer type over a window into one digest delivery.
+
+    Observers that support digests declare `digest_events` and implement
+    deliver_digest(events). Events they would handle are held here, and when
+    the window closes each observer type gets one delivery with all of them,
+    queued on the dispatcher like any other delivery.
+    """
+
+    def __init__(self, dispatcher, window=30.0):
+        self.dispatcher = dispatcher
+        self.window = window
+        self._pending = {}  # observer type -> (observer, [(event_type, event_data)])
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def accepts(self, observer, event_type):
+        return event_type in getattr(observer, "digest_events", ())
+
+    def add(self, observer, event_type, event_data):
+        with self._lock:
+            observer_type = observer.get_observer_type()
+            _, events = self._pending.get(observer_type, (None, []))
+            events.append((event_type, dict(event_data)))
+            self._pending[observer_type] = (observer, events)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Send every pending digest now"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for observer, events in pending.values():
+            self.dispatcher.submit(_DigestDelivery(observer), "DIGEST", {"events": events})
+
+    def pending_count(self):
+        with self._lock:
+            return sum(len(events) for _, events in self._pending.values())
+
+
+class _DigestDelivery:
+    """Presents an observer's digest as a normal dispatcher delivery"""
+
+    def __init__(self, observer):
+        self.observer = observer
+        self.delivery_timeout = getattr(observer, "delivery_timeout", None) or 30.0
+
+    def update(self, event_type, event_data):
+        self.observer.deliver_digest(event_data["events"])
+
+    def get_observer_type(self):
+        return f"{self.observer.get_observer_type()} (digest)"
+
+
+_dispatcher = None
+_digest_buffer = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_notification_dispatcher():
+    """Process-wide dispatcher, configured from NEXUS_NOTIFY_* environment variables"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher(
+                workers=int(os.getenv("NEXUS_NOTIFY_WORKERS", "4")),
+                max_queue=int(os.getenv("NEXUS_NOTIFY_QUEUE_SIZE", "1000")),
+                observer_timeout=float(os.getenv("NEXUS_NOTIFY_TIMEOUT", "5")),
+                max_attempts=int(os.getenv("NEXUS_NOTIFY_MAX_ATTEMPTS", "3"))
+            )
+            atexit.register(_dispatcher.shutdown)
+        return _dispatcher
+
+
+def get_digest_buffer(window=None):
+    """Process-wide digest buffer; `window` (seconds) updates its window when given"""
+    global _digest_buffer
+    dispatcher = get_notification_dispatcher()
+    with _dispatcher_lock:
+        if _digest_buffer is None:
+            _digest_buffer = DigestBuffer(dispatcher, window or float(os.getenv("NEXUS_NOTIFY_DIGEST_WINDOW", "30")))
+            # Registered after the dispatcher, so it runs first and its digests get drained
+            atexit.register(_digest_buffer.flush)
+        elif window:
+            _digest_buffer.window = window
+        return _digest_buffer
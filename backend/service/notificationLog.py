@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+
+class NotificationLog:
+    """Fixed-capacity notification history.
+
+    Entries get consecutive sequence numbers and live in a ring of `capacity`
+    slots, so appends are O(1), memory is bounded, and a page after any cursor
+    is found by arithmetic instead of a scan. Per-type totals and per-bucket
+    counts survive eviction. With spill_path set every entry is also appended
+    to a rotating JSONL file for history beyond the ring.
+    """
+
+    def __init__(self, capacity=1000, bucket_seconds=60, bucket_count=60,
+                 spill_path=None, spill_max_bytes=10 * 1024 * 1024, spill_backups=5):
+        self.capacity = capacity
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self._slots = [None] * capacity
+        self._next_sequence = 1
+        self._type_counts = Counter()
+        self._buckets = OrderedDict()  # bucket start -> Counter of event types
+        self._lock = threading.Lock()
+        self._spill = self._open_spill(spill_path, spill_max_bytes, spill_backups) if spill_path else None
+
+    def append(self, event_type, event_data, observers_notified, timestamp=None):
+        """Record one event and return its entry"""
+        timestamp = timestamp or datetime.now()
+        with self._lock:
+            entry = {
+                'sequence': self._next_sequence,
+                'timestamp': timestamp,
+                'event_type': event_type,
+                'event_data': event_data,
+                'observers_notified': observers_notified
+            }
+            self._slots[self._next_sequence % self.capacity] = entry
+            self._next_sequence += 1
+            self._type_counts[event_type] += 1
+            self._bucket_for(timestamp)[event_type] += 1
+
+        if self._spill is not None:
+            # Formatting happens in the handler only if the record is emitted
+            self._spill.info("%s", _SpillRecord(entry))
+        return entry
+
+    def page(self, after=None, limit=50):
+        """Entries with sequence > after in order, or the newest `limit` without a cursor.
+
+        Returns the entries, the cursor for the next call, and whether older
+        entries asked for had already been evicted from the ring.
+        """
+        limit = max(0, min(limit, self.capacity))
+        with self._lock:
+            oldest = max(1, self._next_sequence - self.capacity)
+            if after is None:
+                start = max(oldest, self._next_sequence - limit)
+            else:
+                start = max(oldest, after + 1)
+            stop = min(self._next_sequence, start + limit)
+            entries = [dict(self._slots[sequence % self.capacity]) for sequence in range(start, stop)]
+            return {
+                'entries': entries,
+                'next_cursor': stop - 1 if entries else after,
+                'has_more': stop < self._next_sequence,
+                'truncated': after is not None and after + 1 < oldest
+            }
+
+    def recent(self, limit=10):
+        return self.page(limit=limit)['entries']
+
+    def total(self):
+        with self._lock:
+            return self._next_sequence - 1
+
+    def type_counts(self):
+        with self._lock:
+            return dict(self._type_counts)
+
+    def time_buckets(self):
+        """Per-bucket event counts, oldest first"""
+        with self._lock:
+            return [
+                {'start': start, 'total': sum(counts.values()), 'counts': dict(counts)}
+                for start, counts in self._buckets.items()
+            ]
+
+    def __len__(self):
+        with self._lock:
+            return min(self._next_sequence - 1, self.capacity)
+
+    def _bucket_for(self, timestamp):
+        seconds = int(timestamp.timestamp()) // self.bucket_seconds * self.bucket_seconds
+        start = datetime.fromtimestamp(seconds)
+        counts = self._buckets.get(start)
+        if counts is None:
+            counts = self._buckets[start] = Counter()
+            while len(self._buckets) > self.bucket_count:
+                self._buckets.popitem(last=False)
+        return counts
+
+    def _open_spill(self, path, max_bytes, backups):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        spill = logging.getLogger(f"nexusenroll.notifications.{id(self)}")
+        spill.setLevel(logging.INFO)
+        spill.propagate = False
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        spill.addHandler(handler)
+        return spill
+
+
+class _SpillRecord:
+    """Serializes an entry to JSON only when the spill handler writes it"""
+
+    def __init__(self, entry):
+        self.entry = entry
+
+    def __str__(self):
+        return json.dumps(self.entry, default=str)
+
+
+_shared_log = None
+_shared_log_lock = threading.Lock()
+
+
+def shared_notification_log():
+    """Process-wide notification log, configured from NEXUS_NOTIFY_LOG_* environment variables"""
+    global _shared_log
+    with _shared_log_lock:
+        if _shared_log is None:
+            _shared_log = NotificationLog(
+                capacity=int(os.getenv("NEXUS_NOTIFY_LOG_SIZE", "1000")),
+                spill_path=os.getenv("NEXUS_NOTIFY_LOG_FILE") or None
+            )
+        return _shared_log
@@ -1,8 +1,87 @@
+import logging
+import os
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List, Dict, Any
+from backend.dal.dbconfig import dbconfig
 from backend.dal.user import Student
 from backend.dal.enrollment import Enrollment
+from backend.dal.waitlist import Waitlist
+from backend.dal.metadataCache import metadata_cache
+from backend.shared.structuredLog import get_logger, log_event
+from backend.service.notificationDispatcher import get_notification_dispatcher, get_digest_buffer
+from backend.service.notificationLog import shared_notification_log
+
+logger = get_logger("notifications")
+
+
+# Cached metadata lookups shared by the observers. Entries are invalidated by
+# the DAL writes that change them (see backend/dal/metadataCache.py).
+
+def get_students_info(db_connection, student_ids) -> Dict[int, tuple]:
+    """(name, email) per student id, with one query for all cache misses"""
+    student_ids = [student_id for student_id in set(student_ids) if student_id is not None]
+    try:
+        return metadata_cache.get_many_or_load(
+            "student", student_ids, lambda missing: _load_students_info(db_connection, missing)
+        )
+    except Exception as e:
+        logger.error("Error getting student info: %s", e)
+        return {}
+
+
+def get_course_statistics(db_connection, course_ids) -> Dict[int, tuple]:
+    """(enrolled_count, capacity, availableSeats) per course id, with one query for all cache misses"""
+    course_ids = [course_id for course_id in set(course_ids) if course_id is not None]
+    try:
+        return metadata_cache.get_many_or_load(
+            "course_stats", course_ids, lambda missing: _load_course_statistics(db_connection, missing)
+        )
+    except Exception as e:
+        logger.error("Error getting course statistics: %s", e)
+        return {}
+
+
+def _load_students_info(db_connection, student_ids) -> Dict[int, tuple]:
+    conn = db_connection.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(student_ids))
+        query = f"""
+        SELECT user_id, firstName, lastName, email 
+        FROM Users 
+        WHERE user_id IN ({placeholders}) AND userType = 'Student'
+        """
+        cursor.execute(query, tuple(student_ids))
+        return {user_id: (f"{first_name} {last_name}", email)
+                for user_id, first_name, last_name, email in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _load_course_statistics(db_connection, course_ids) -> Dict[int, tuple]:
+    conn = db_connection.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(course_ids))
+        query = f"""
+        SELECT 
+            c.course_id,
+            COUNT(e.enrollment_id) as enrolled_count,
+            c.capacity,
+            c.availableSeats
+        FROM Course c
+        LEFT JOIN Enrollment e ON c.course_id = e.course_id AND e.enrollmentStatus = 'Active'
+        WHERE c.course_id IN ({placeholders})
+        GROUP BY c.course_id, c.capacity, c.availableSeats
+        """
+        cursor.execute(query, tuple(course_ids))
+        return {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.close()
 
 
 # Observer Interface
@@ -44,53 +123,71 @@ class NotificationSubject(ABC):
 class EnrollmentNotificationSubject(NotificationSubject):
     """Concrete Subject that manages enrollment-related notifications"""
     
-    def __init__(self):
+    def __init__(self, dispatcher=None, notification_log=None):
         self._observers: List[NotificationObserver] = []
-        self._notification_log: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._notification_log = notification_log or shared_notification_log()
+        self._dispatcher = dispatcher or get_notification_dispatcher()
+        self._digest = None
     
     def attach(self, observer: NotificationObserver) -> None:
         """Attach an observer to receive notifications"""
-        if observer not in self._observers:
-            self._observers.append(observer)
-            print(f"🔔 {observer.get_observer_type()} observer attached to notification system")
+        with self._lock:
+            if observer in self._observers:
+                return
+            # Copy-on-write so notify() can iterate without holding the lock
+            self._observers = self._observers + [observer]
+        log_event(logger, logging.INFO, "Observer attached", observer=observer.get_observer_type())
     
     def detach(self, observer: NotificationObserver) -> None:
         """Detach an observer from receiving notifications"""
-        if observer in self._observers:
-            self._observers.remove(observer)
-            print(f"🔕 {observer.get_observer_type()} observer detached from notification system")
+        with self._lock:
+            if observer not in self._observers:
+                return
+            self._observers = [attached for attached in self._observers if attached is not observer]
+        log_event(logger, logging.INFO, "Observer detached", observer=observer.get_observer_type())
     
     def notify(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """Notify all attached observers about an enrollment event"""
         timestamp = datetime.now()
+        observers = self._observers
         
         # Log the notification
-        log_entry = {
-            'timestamp': timestamp,
-            'event_type': event_type,
-            'event_data': event_data,
-            'observers_notified': len(self._observers)
-        }
-        self._notification_log.append(log_entry)
+        self._notification_log.append(event_type, event_data, len(observers), timestamp)
         
-        print(f"\n📢 NOTIFICATION EVENT: {event_type} at {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Event Data: {event_data}")
-        print(f"Notifying {len(self._observers)} observers...")
+        log_event(logger, logging.INFO, "Notification event", event=event_type,
+                  data=event_data, observers=len(observers))
         
-        # Notify all observers
-        for observer in self._observers:
-            try:
-                observer.update(event_type, event_data)
-            except Exception as e:
-                print(f"❌ Error notifying {observer.get_observer_type()}: {str(e)}")
-    
-    def get_notification_log(self) -> List[Dict[str, Any]]:
-        """Get the complete notification log"""
-        return self._notification_log.copy()
+        # Hand each delivery to the background dispatcher and return immediately;
+        # in digest mode, events an observer can digest wait for the window instead
+        for observer in observers:
+            if self._digest is not None and self._digest.accepts(observer, event_type):
+                self._digest.add(observer, event_type, event_data)
+            else:
+                self._dispatcher.submit(observer, event_type, event_data)
+    
+    def get_notification_log(self, after: int = None, limit: int = 50) -> Dict[str, Any]:
+        """Get a page of the notification log (entries after the `after` sequence cursor)"""
+        return self._notification_log.page(after, limit)
+    
+    def get_log(self):
+        """Get the bounded log backing this subject"""
+        return self._notification_log
     
     def get_observers_count(self) -> int:
         """Get the number of attached observers"""
         return len(self._observers)
+    
+    def get_dispatcher(self):
+        """Get the dispatcher delivering this subject's notifications"""
+        return self._dispatcher
+    
+    def set_digest(self, digest) -> None:
+        """Route digestible events through a DigestBuffer (None delivers every event at once)"""
+        self._digest = digest
+    
+    def get_digest(self):
+        return self._digest
 
 
 # Concrete Observer Implementations
@@ -102,11 +199,12 @@ class StudentObserver(NotificationObserver):
         self.db = db_connection
         self.student_dal = Student(db_connection)
         self.enrollment_dal = Enrollment(db_connection)
+        self.waitlist_dal = Waitlist(db_connection)
     
     def update(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """Handle student notifications"""
-        if event_type == "COURSE_DROPPED":
-            self._notify_waitlisted_students(event_data)
+        if event_type == "WAITLIST_PROMOTED":
+            self._notify_waitlist_promotion(event_data)
         elif event_type == "ENROLLMENT_SUCCESSFUL":
             self._notify_student_enrollment_success(event_data)
         elif event_type == "ENROLLMENT_FAILED":
@@ -114,27 +212,25 @@ class StudentObserver(NotificationObserver):
         elif event_type == "COURSE_CAPACITY_UPDATED":
             self._notify_course_availability_change(event_data)
     
-    def _notify_waitlisted_students(self, event_data: Dict[str, Any]) -> None:
-        """Notify students on waitlist when a spot opens up"""
-        course_id = event_data.get('course_id')
+    def _notify_waitlist_promotion(self, event_data: Dict[str, Any]) -> None:
+        """Tell the student who was moved off the waitlist into a freed seat.
+
+        Drops hand the seat to the head of the waitlist in the same transaction,
+        so only that one student hears about it instead of everyone waiting.
+        """
+        student_id = event_data.get('student_id')
         course_name = event_data.get('course_name', 'Unknown Course')
-        dropped_student_id = event_data.get('student_id')
-        
-        print(f"📚 StudentObserver: Checking waitlist for course {course_name} (ID: {course_id})")
-        
-        # Simulate getting waitlisted students (in a real system, this would be from a waitlist table)
-        waitlisted_students = self._get_waitlisted_students(course_id)
         
-        for student in waitlisted_students:
-            student_id, student_name, student_email = student
-            if student_id != dropped_student_id:  # Don't notify the student who dropped
-                self._send_notification_to_student(
-                    student_id, 
-                    student_name, 
-                    student_email,
-                    f"🎉 Great news! A spot has opened up in {course_name}. You can now enroll!",
-                    "WAITLIST_SPOT_AVAILABLE"
-                )
+        student_info = self._get_student_info(student_id)
+        if student_info:
+            student_name, student_email = student_info
+            self._send_notification_to_student(
+                student_id,
+                student_name,
+                student_email,
+                f"🎉 Great news! A spot opened up in {course_name} and you have been enrolled from the waitlist.",
+                "WAITLIST_PROMOTED"
+            )
     
     def _notify_student_enrollment_success(self, event_data: Dict[str, Any]) -> None:
         """Notify student of successful enrollment"""
@@ -176,7 +272,7 @@ class StudentObserver(NotificationObserver):
         available_seats = event_data.get('available_seats', 0)
         
         if available_seats > 0:
-            waitlisted_students = self._get_waitlisted_students(course_id)[:available_seats]
+            waitlisted_students = self._get_waitlisted_students(course_id, available_seats)
             for student in waitlisted_students:
                 student_id, student_name, student_email = student
                 self._send_notification_to_student(
@@ -187,54 +283,31 @@ class StudentObserver(NotificationObserver):
                     "COURSE_AVAILABLE"
                 )
     
-    def _get_waitlisted_students(self, course_id: int) -> List[tuple]:
-        """Get students on waitlist for a course (simulated)"""
-        # In a real system, this would query a waitlist table
-        # For simulation, we'll return some mock waitlisted students
-        return [
-            (101, "Alice Johnson", "alice.johnson@university.edu"),
-            (102, "Bob Smith", "bob.smith@university.edu"),
-            (103, "Carol Davis", "carol.davis@university.edu")
-        ]
-    
-    def _get_student_info(self, student_id: int) -> tuple:
-        """Get student information"""
+    def _get_waitlisted_students(self, course_id: int, limit: int = None) -> List[tuple]:
+        """Get (student_id, name, email) of students waiting for a course, in queue order"""
         try:
             conn = self.db.get_db_connection()
             cursor = conn.cursor()
-            
-            query = """
-            SELECT firstName, lastName, email 
-            FROM Users 
-            WHERE user_id = %s AND userType = 'Student'
-            """
-            cursor.execute(query, (student_id,))
-            result = cursor.fetchone()
-            
-            if result:
-                first_name, last_name, email = result
-                return f"{first_name} {last_name}", email
-            return None
-            
+            return self.waitlist_dal.get_waitlisted_students(cursor, course_id, limit)
         except Exception as e:
-            print(f"Error getting student info: {e}")
-            return None
+            logger.error("Error getting waitlisted students: %s", e)
+            return []
         finally:
             if 'cursor' in locals():
                 cursor.close()
             if 'conn' in locals():
                 conn.close()
     
+    def _get_student_info(self, student_id: int) -> tuple:
+        """Get student information (cached)"""
+        return get_students_info(self.db, [student_id]).get(student_id)
+    
     def _send_notification_to_student(self, student_id: int, student_name: str, 
                                      student_email: str, message: str, notification_type: str) -> None:
         """Send notification to a student (simulated email)"""
-        print(f"📧 EMAIL TO STUDENT:")
-        print(f"   To: {student_name} ({student_email})")
-        print(f"   Subject: Course Enrollment Update")
-        print(f"   Message: {message}")
-        print(f"   Type: {notification_type}")
-        print(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("-" * 50)
+        log_event(logger, logging.INFO, "Email to student", event=notification_type,
+                  recipient=student_name, email=student_email, student_id=student_id,
+                  subject="Course Enrollment Update", message=message)
     
     def get_observer_type(self) -> str:
         return "Student Observer"
@@ -243,6 +316,8 @@ class StudentObserver(NotificationObserver):
 class AdvisorObserver(NotificationObserver):
     """Observer for advisor-related notifications"""
     
+    digest_events = ("COURSE_DROPPED", "ENROLLMENT_SUCCESSFUL", "WAITLIST_PROMOTED", "CRITICAL_COURSE_DROPPED")
+    
     def __init__(self, db_connection):
         self.db = db_connection
     
@@ -250,7 +325,7 @@ class AdvisorObserver(NotificationObserver):
         """Handle advisor notifications"""
         if event_type == "COURSE_DROPPED":
             self._notify_advisor_about_drop(event_data)
-        elif event_type == "ENROLLMENT_SUCCESSFUL":
+        elif event_type in ("ENROLLMENT_SUCCESSFUL", "WAITLIST_PROMOTED"):
             self._notify_advisor_about_enrollment(event_data)
         elif event_type == "CRITICAL_COURSE_DROPPED":
             self._notify_advisor_critical_course_drop(event_data)
@@ -321,60 +396,61 @@ class AdvisorObserver(NotificationObserver):
                     "CRITICAL_COURSE_DROP_ALERT", student_name
                 )
     
+    def deliver_digest(self, events: List[tuple]) -> None:
+        """Send each advisor one message covering all their advisees' events in the window"""
+        student_ids = {event_data.get('student_id') for _, event_data in events}
+        students = self._get_students_info(student_ids)
+        
+        digests = {}  # advisor_id -> (advisor_info, [lines])
+        for event_type, event_data in events:
+            student_id = event_data.get('student_id')
+            advisor_info = self._get_student_advisor(student_id)
+            student_info = students.get(student_id)
+            if not advisor_info or not student_info:
+                continue
+            student_name = student_info[0]
+            course_name = event_data.get('course_name', 'Unknown Course')
+            
+            if event_type == "COURSE_DROPPED":
+                line = f"📋 {student_name} dropped {course_name}."
+                if self._is_critical_course(event_data.get('course_id'), student_id):
+                    line += " ⚠️ Critical course for their degree program."
+            elif event_type == "CRITICAL_COURSE_DROPPED":
+                line = f"🚨 URGENT: {student_name} dropped {course_name}, a critical course. Please schedule a meeting."
+            else:
+                line = f"✅ {student_name} enrolled in {course_name}."
+            digests.setdefault(advisor_info[0], (advisor_info, []))[1].append(line)
+        
+        for (advisor_id, advisor_name, advisor_email), lines in digests.values():
+            message = f"{len(lines)} advisee update(s):\n   " + "\n   ".join(lines)
+            self._send_notification_to_advisor(
+                advisor_id, advisor_name, advisor_email, message,
+                "ADVISEE_DIGEST", f"{len(lines)} updates"
+            )
+    
     def _get_student_advisor(self, student_id: int) -> tuple:
         """Get advisor information for a student"""
-        try:
-            conn = self.db.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Simulated advisor assignment (in real system, would be in database)
-            # For demo, we'll assign advisor based on student ID modulo
-            advisor_assignments = {
-                1: (201, "Dr. Sarah Wilson", "sarah.wilson@university.edu"),
-                2: (202, "Dr. Michael Brown", "michael.brown@university.edu"),
-                3: (203, "Dr. Emily Chen", "emily.chen@university.edu")
-            }
-            
-            # Simple assignment logic for demo
-            advisor_key = (student_id % 3) + 1
-            return advisor_assignments.get(advisor_key)
-            
-        except Exception as e:
-            print(f"Error getting advisor info: {e}")
+        # Simulated advisor assignment (in real system, would be in database)
+        # For demo, we'll assign advisor based on student ID modulo
+        advisor_assignments = {
+            1: (201, "Dr. Sarah Wilson", "sarah.wilson@university.edu"),
+            2: (202, "Dr. Michael Brown", "michael.brown@university.edu"),
+            3: (203, "Dr. Emily Chen", "emily.chen@university.edu")
+        }
+        
+        # Simple assignment logic for demo
+        if student_id is None:
             return None
-        finally:
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conn' in locals():
-                conn.close()
+        advisor_key = (student_id % 3) + 1
+        return advisor_assignments.get(advisor_key)
+    
+    def _get_students_info(self, student_ids) -> Dict[int, tuple]:
+        """Get (name, email) for many students, querying only the uncached ones"""
+        return get_students_info(self.db, student_ids)
     
     def _get_student_info(self, student_id: int) -> tuple:
-        """Get student information"""
-        try:
-            conn = self.db.get_db_connection()
-            cursor = conn.cursor()
-            
-            query = """
-            SELECT firstName, lastName, email 
-            FROM Users 
-            WHERE user_id = %s AND userType = 'Student'
-            """
-            cursor.execute(query, (student_id,))
-            result = cursor.fetchone()
-            
-            if result:
-                first_name, last_name, email = result
-                return f"{first_name} {last_name}", email
-            return None
-            
-        except Exception as e:
-            print(f"Error getting student info: {e}")
-            return None
-        finally:
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conn' in locals():
-                conn.close()
+        """Get student information (cached)"""
+        return get_students_info(self.db, [student_id]).get(student_id)
     
     def _is_critical_course(self, course_id: int, student_id: int) -> bool:
         """Check if a course is critical for the student's degree"""
@@ -386,13 +462,9 @@ class AdvisorObserver(NotificationObserver):
                                      advisor_email: str, message: str, 
                                      notification_type: str, student_name: str) -> None:
         """Send notification to an advisor (simulated email)"""
-        print(f"📧 EMAIL TO ADVISOR:")
-        print(f"   To: {advisor_name} ({advisor_email})")
-        print(f"   Subject: Advisee Update - {student_name}")
-        print(f"   Message: {message}")
-        print(f"   Type: {notification_type}")
-        print(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("-" * 50)
+        log_event(logger, logging.INFO, "Email to advisor", event=notification_type,
+                  recipient=advisor_name, email=advisor_email, advisor_id=advisor_id,
+                  subject=f"Advisee Update - {student_name}", message=message)
     
     def get_observer_type(self) -> str:
         return "Advisor Observer"
@@ -401,6 +473,9 @@ class AdvisorObserver(NotificationObserver):
 class AdminObserver(NotificationObserver):
     """Observer for administrator-related notifications"""
     
+    # System errors stay immediate even in digest mode
+    digest_events = ("COURSE_DROPPED", "ENROLLMENT_SUCCESSFUL", "CAPACITY_WARNING", "HIGH_DROP_RATE")
+    
     def __init__(self, db_connection):
         self.db = db_connection
     
@@ -484,35 +559,52 @@ class AdminObserver(NotificationObserver):
                 
                 self._send_notification_to_admins(message, "HIGH_DROP_RATE")
     
+    def deliver_digest(self, events: List[tuple]) -> None:
+        """Send admins one summary of all course activity in the window"""
+        activity = {}  # course_id -> {"name", "enrolled", "dropped"}
+        alerts = []
+        for event_type, event_data in events:
+            course_id = event_data.get('course_id')
+            course_name = event_data.get('course_name', 'Unknown Course')
+            if event_type in ("COURSE_DROPPED", "ENROLLMENT_SUCCESSFUL"):
+                course = activity.setdefault(course_id, {"name": course_name, "enrolled": 0, "dropped": 0})
+                course["enrolled" if event_type == "ENROLLMENT_SUCCESSFUL" else "dropped"] += 1
+            elif event_type == "CAPACITY_WARNING":
+                available_seats = event_data.get('available_seats', 0)
+                capacity = event_data.get('capacity', 0)
+                if available_seats <= 2 and capacity > 0:
+                    alerts.append(f"⚠️ {course_name}: only {available_seats} of {capacity} seats left")
+            elif event_type == "HIGH_DROP_RATE":
+                drop_count = event_data.get('drop_count', 0)
+                total_enrolled = event_data.get('total_enrolled', 0)
+                if total_enrolled > 0 and drop_count / total_enrolled > 0.2:
+                    alerts.append(f"📉 {course_name}: drop rate {drop_count / total_enrolled * 100:.1f}% "
+                                  f"({drop_count}/{total_enrolled})")
+        
+        lines = []
+        statistics = self._get_courses_statistics(activity.keys())
+        for course_id, course in activity.items():
+            line = f"{course['name']}: +{course['enrolled']} enrolled, -{course['dropped']} dropped"
+            stats = statistics.get(course_id)
+            if stats:
+                enrolled_count, capacity, available_seats = stats
+                utilization = (enrolled_count / capacity) * 100 if capacity > 0 else 0
+                line += f", now {enrolled_count}/{capacity} ({utilization:.1f}%), {available_seats} seats free"
+            lines.append(line)
+        lines.extend(alerts)
+        
+        if lines:
+            message = (f"📊 Enrollment digest ({len(events)} events, {len(activity)} courses):\n   "
+                       + "\n   ".join(lines))
+            self._send_notification_to_admins(message, "ENROLLMENT_DIGEST")
+    
+    def _get_courses_statistics(self, course_ids) -> Dict[int, tuple]:
+        """Get (enrolled_count, capacity, availableSeats) for many courses, querying only the uncached ones"""
+        return get_course_statistics(self.db, course_ids)
+    
     def _get_course_statistics(self, course_id: int) -> tuple:
-        """Get current course enrollment statistics"""
-        try:
-            conn = self.db.get_db_connection()
-            cursor = conn.cursor()
-            
-            query = """
-            SELECT 
-                COUNT(e.enrollment_id) as enrolled_count,
-                c.capacity,
-                c.availableSeats
-            FROM Course c
-            LEFT JOIN Enrollment e ON c.course_id = e.course_id AND e.enrollmentStatus = 'Active'
-            WHERE c.course_id = %s
-            GROUP BY c.course_id, c.capacity, c.availableSeats
-            """
-            cursor.execute(query, (course_id,))
-            result = cursor.fetchone()
-            
-            return result if result else None
-            
-        except Exception as e:
-            print(f"Error getting course statistics: {e}")
-            return None
-        finally:
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conn' in locals():
-                conn.close()
+        """Get current course enrollment statistics (cached)"""
+        return get_course_statistics(self.db, [course_id]).get(course_id)
     
     def _send_notification_to_admins(self, message: str, notification_type: str, urgent: bool = False) -> None:
         """Send notification to administrators (simulated email/dashboard alert)"""
@@ -522,17 +614,10 @@ class AdminObserver(NotificationObserver):
             "dean@university.edu"
         ]
         
-        priority = "🚨 URGENT" if urgent else "📋 INFO"
-        
-        print(f"📧 ADMIN NOTIFICATION ({priority}):")
-        print(f"   To: {', '.join(admin_list)}")
-        print(f"   Subject: Enrollment System Alert - {notification_type}")
-        print(f"   Message: {message}")
-        print(f"   Type: {notification_type}")
-        print(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        if urgent:
-            print(f"   🔔 SMS alerts also sent to on-call administrators")
-        print("-" * 50)
+        # Urgent alerts also go out by SMS to on-call administrators
+        log_event(logger, logging.WARNING if urgent else logging.INFO, "Admin notification",
+                  event=notification_type, recipients=admin_list, urgent=urgent, sms=urgent,
+                  subject=f"Enrollment System Alert - {notification_type}", message=message)
     
     def get_observer_type(self) -> str:
         return "Admin Observer"
@@ -553,6 +638,19 @@ class NotificationManager:
         
         # Attach all observers by default
         self.attach_all_observers()
+        if float(os.getenv("NEXUS_NOTIFY_DIGEST_WINDOW", "0")) > 0:
+            self.enable_digest_mode()
+    
+    def enable_digest_mode(self, window_seconds: float = None) -> None:
+        """Coalesce advisor/admin notifications into one message per recipient per window"""
+        self.subject.set_digest(get_digest_buffer(window_seconds))
+    
+    def disable_digest_mode(self) -> None:
+        """Deliver every event immediately again, sending anything already buffered"""
+        digest = self.subject.get_digest()
+        self.subject.set_digest(None)
+        if digest is not None:
+            digest.flush()
     
     def attach_all_observers(self) -> None:
         """Attach all observers to the notification system"""
@@ -595,6 +693,17 @@ class NotificationManager:
         }
         self.subject.notify("COURSE_DROPPED", event_data)
     
+    def notify_waitlist_promoted(self, student_id: int, course_id: int, course_name: str) -> None:
+        """Notify that a waitlisted student was enrolled into a freed seat"""
+        event_data = {
+            'student_id': student_id,
+            'course_id': course_id,
+            'course_name': course_name,
+            'timestamp': datetime.now(),
+            'event_type': 'WAITLIST_PROMOTED'
+        }
+        self.subject.notify("WAITLIST_PROMOTED", event_data)
+    
     def notify_enrollment_successful(self, student_id: int, course_id: int, course_name: str) -> None:
         """Notify about successful enrollment"""
         event_data = {
@@ -639,12 +748,24 @@ class NotificationManager:
         }
         self.subject.notify("CAPACITY_WARNING", event_data)
     
-    def get_notification_statistics(self) -> Dict[str, Any]:
-        """Get notification system statistics"""
+    def get_notification_statistics(self, after: int = None, limit: int = 10) -> Dict[str, Any]:
+        """Get notification system statistics with one page of the log"""
+        dispatcher = self.subject.get_dispatcher()
+        log = self.subject.get_log()
+        page = self.subject.get_notification_log(after, limit)
         return {
             'observers_count': self.subject.get_observers_count(),
-            'total_notifications': len(self.subject.get_notification_log()),
-            'notification_log': self.subject.get_notification_log()[-10:],  # Last 10 notifications
+            'dispatcher': dispatcher.get_metrics(),
+            'dead_letters': dispatcher.get_dead_letters()[-10:],
+            'metadata_cache': metadata_cache.get_stats(),
+            'digest_mode': self.subject.get_digest() is not None,
+            'digest_pending': self.subject.get_digest().pending_count() if self.subject.get_digest() else 0,
+            'total_notifications': log.total(),
+            'event_counts': log.type_counts(),
+            'per_minute': log.time_buckets(),
+            'notification_log': page['entries'],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
             'observers': [
                 self.student_observer.get_observer_type(),
                 self.advisor_observer.get_observer_type(),
@@ -685,3 +806,22 @@ class NotificationManager:
         print(f"Active Observers: {stats['observers_count']}")
         print(f"Total Notifications Sent: {stats['total_notifications']}")
         print(f"Observer Types: {', '.join(stats['observers'])}")
+
+
+_notification_manager = None
+_notification_manager_lock = threading.Lock()
+
+
+def get_notification_manager(db_connection=None) -> NotificationManager:
+    """Process-wide notification hub; observers are built and attached once.
+
+    The first call (app startup) creates it with the given dbconfig; later
+    calls return the same instance, so attach/detach and digest settings made
+    through the API apply to every request.
+    """
+    global _notification_manager
+    if _notification_manager is None:
+        with _notification_manager_lock:
+            if _notification_manager is None:
+                _notification_manager = NotificationManager(db_connection or dbconfig())
+    return _notification_manager
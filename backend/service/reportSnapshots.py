@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from datetime import datetime
+from backend.service.reportingService import ReportingService
+from backend.shared.structuredLog import get_logger
+
+logger = get_logger("reports.snapshots")
+
+# Types a report parameter value may have (it becomes part of a dict key)
+SCALAR_TYPES = (str, int, float, bool)
+
+
+class ReportSnapshotStore:
+    """Materialized report results keyed by (report type, parameters).
+
+    Each report type is registered with a loader and a staleness budget
+    (max_age seconds). get() serves the stored snapshot while it is within
+    budget and recomputes it on demand otherwise; concurrent requests for the
+    same key wait for one computation. A background thread refreshes every
+    snapshot that has been requested within idle_factor times its budget
+    before it goes stale. Failed computations are returned to the caller but
+    never stored. Bookkeeping for keys without a snapshot (failed or evicted
+    ones) is pruned too, so arbitrary parameters cannot grow it without bound.
+    """
+
+    def __init__(self, refresh_interval=60.0, idle_factor=3.0, max_snapshots=200):
+        self.refresh_interval = refresh_interval
+        self.idle_factor = idle_factor
+        self.max_snapshots = max_snapshots
+        self._reports = {}    # report type -> (loader, max_age)
+        self._snapshots = {}  # key -> snapshot dict
+        self._last_requested = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"hits": 0, "computations": 0, "failures": 0, "scheduled_refreshes": 0}
+
+    def register(self, report_type, loader, max_age=300.0):
+        """loader(**params) returns a {"status": ...} result dict"""
+        with self._lock:
+            self._reports[report_type] = (loader, max_age)
+
+    def get(self, report_type, params=None, max_age=None):
+        """The snapshot for (report_type, params), computing it if missing or older than its budget"""
+        key = self._key(report_type, params)
+        budget = self._budget(report_type, max_age)
+        with self._lock:
+            self._last_requested[key] = time.monotonic()
+            if len(self._last_requested) > 2 * self.max_snapshots:
+                self._prune(time.monotonic())
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and time.monotonic() - snapshot["computed_at"] <= budget:
+                self._stats["hits"] += 1
+                return self._present(snapshot)
+        return self._compute(key, budget)
+
+    def refresh(self, report_type=None, params=None):
+        """Recompute one snapshot (report_type and params) or every stored snapshot of a type, or all"""
+        if report_type is not None and params is not None:
+            return [self._compute(self._key(report_type, params), 0)]
+        with self._lock:
+            keys = [key for key in self._snapshots if report_type is None or key[0] == report_type]
+        if report_type is not None and not keys:
+            keys = [self._key(report_type, None)]
+        return [self._compute(key, 0) for key in keys]
+
+    def list_snapshots(self):
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "type": key[0],
+                    "params": dict(key[1]),
+                    "generated_at": snapshot["generated_at"],
+                    "age_seconds": round(now - snapshot["computed_at"], 1),
+                    "max_age": self._reports[key[0]][1],
+                    "compute_seconds": snapshot["compute_seconds"]
+                }
+                for key, snapshot in self._snapshots.items()
+            ]
+
+    def get_stats(self):
+        with self._lock:
+            return {**self._stats, "snapshots": len(self._snapshots), "refresh_interval": self.refresh_interval}
+
+    def start(self):
+        """Start the background refresh thread (no-op when refresh_interval is 0)"""
+        if self.refresh_interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_scheduler, name="report-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _key(self, report_type, params):
+        """(report type, sorted params); KeyError for an unknown type, ValueError for malformed params"""
+        if not isinstance(report_type, str) or report_type not in self._reports:
+            raise KeyError(f"Unknown report type: {report_type}")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        for name, value in params.items():
+            if not isinstance(name, str) or not (value is None or isinstance(value, SCALAR_TYPES)):
+                raise ValueError(f"Invalid report parameter: {name}")
+        return report_type, tuple(sorted(params.items()))
+
+    def _budget(self, report_type, max_age):
+        return self._reports[report_type][1] if max_age is None else max_age
+
+    def _idle_expiry(self, key):
+        """Seconds without a request after which a key is no longer refreshed or tracked"""
+        return self.idle_factor * self._reports[key[0]][1]
+
+    def _forget(self, key):
+        """Drop a key's snapshot and bookkeeping; called with the lock held"""
+        self._snapshots.pop(key, None)
+        self._last_requested.pop(key, None)
+        key_lock = self._key_locks.get(key)
+        if key_lock is not None and not key_lock.locked():
+            del self._key_locks[key]
+
+    def _prune(self, now):
+        """Forget idle keys, then the oldest keys without a snapshot beyond max_snapshots; called with the lock held"""
+        for key in set(self._last_requested) | set(self._snapshots):
+            # Snapshots only ever refreshed (never requested) count as idle
+            if now - self._last_requested.get(key, 0) > self._idle_expiry(key):
+                self._forget(key)
+        orphans = sorted((key for key in self._last_requested if key not in self._snapshots),
+                         key=lambda key: self._last_requested[key])
+        for key in orphans[:max(0, len(orphans) - self.max_snapshots)]:
+            self._forget(key)
+        for key in [key for key, lock in self._key_locks.items()
+                    if key not in self._last_requested and not lock.locked()]:
+            del self._key_locks[key]
+
+    def _compute(self, key, budget):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another request may have refreshed it while we waited
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+                if snapshot is not None and time.monotonic() - snapshot["computed_at"] < budget:
+                    self._stats["hits"] += 1
+                    return self._present(snapshot)
+                loader = self._reports[key[0]][0]
+
+            started = time.monotonic()
+            try:
+                result = loader(**dict(key[1]))
+            except Exception as e:
+                result = {"status": "Error", "message": str(e)}
+            if result.get("status") != "Success":
+                with self._lock:
+                    self._stats["failures"] += 1
+                return result
+
+            snapshot = {
+                "result": result,
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "computed_at": time.monotonic(),
+                "compute_seconds": round(time.monotonic() - started, 3)
+            }
+            with self._lock:
+                self._snapshots[key] = snapshot
+                self._stats["computations"] += 1
+                self._evict()
+            return self._present(snapshot)
+
+    def _evict(self):
+        """Drop the least recently requested snapshots beyond max_snapshots; called with the lock held"""
+        if len(self._snapshots) <= self.max_snapshots:
+            return
+        oldest = sorted(self._snapshots, key=lambda key: self._last_requested.get(key, 0))
+        for key in oldest[:len(self._snapshots) - self.max_snapshots]:
+            self._forget(key)
+
+    def _present(self, snapshot):
+        age = time.monotonic() - snapshot["computed_at"]
+        return {
+            **snapshot["result"],
+            "snapshot": {"generated_at": snapshot["generated_at"], "age_seconds": round(age, 1)}
+        }
+
+    def _run_scheduler(self):
+        while not self._stop.wait(self.refresh_interval):
+            now = time.monotonic()
+            with self._lock:
+                # Nobody has asked for these in a while: stop refreshing and tracking them
+                self._prune(now)
+                due = []
+                for key, snapshot in list(self._snapshots.items()):
+                    # Refresh anything that would go stale before the next pass
+                    if now + self.refresh_interval - snapshot["computed_at"] > self._reports[key[0]][1]:
+                        due.append(key)
+            for key in due:
+                result = self._compute(key, 0)
+                with self._lock:
+                    self._stats["scheduled_refreshes"] += 1
+                if result.get("status") != "Success":
+                    logger.warning("Scheduled refresh of %s failed: %s", key[0], result.get("message"))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_report_snapshots():
+    """Process-wide snapshot store with the standard reports registered.
+
+    NEXUS_REPORT_REFRESH_INTERVAL sets how often (seconds) the background
+    thread looks for snapshots to refresh; 0 disables it. NEXUS_REPORT_MAX_AGE
+    overrides every report's staleness budget.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReportSnapshotStore(refresh_interval=float(os.getenv("NEXUS_REPORT_REFRESH_INTERVAL", "60")))
+            override = os.getenv("NEXUS_REPORT_MAX_AGE")
+            for report_type, (method, max_age) in REPORTS.items():
+                _store.register(report_type, _service_loader(method), float(override) if override else max_age)
+            _store.start()
+        return _store
+
+
+# Report type -> (ReportingService method, default staleness budget in seconds)
+REPORTS = {
+    "enrollment-statistics": ("get_enrollment_statistics_by_department", 300),
+    "faculty-workload": ("get_faculty_workload_report", 300),
+    "course-popularity": ("get_course_popularity_trends", 300),
+    "high-capacity-courses": ("get_high_capacity_courses", 120),
+    "business-school-capacity": ("get_business_school_high_capacity_report", 120),
+    "department-analytics": ("get_department_analytics", 600),
+    "dashboard": ("get_comprehensive_analytics_dashboard", 300)
+}
+
+
+def _service_loader(method):
+    def load(**params):
+        service = ReportingService()
+        try:
+            return getattr(service, method)(**params)
+        finally:
+            service.close_connection()
+    return load
@@ -7,6 +7,7 @@ from backend.presentation.reports import (
     DepartmentAnalyticsReport,
     ReportExporter
 )
+from backend.service.dashboardEngine import DashboardEngine
 
 class ReportingService:
     def __init__(self):
@@ -141,26 +142,53 @@ class ReportingService:
         except Exception as e:
             return {"status": "Error", "message": str(e)}
 
+    # Exportable reports: type -> (title, factory taking the department id)
+    EXPORTS = {
+        "enrollment": ("Enrollment Statistics Report", lambda department_id: EnrollmentStatisticsReport(dept_id=department_id)),
+        "faculty": ("Faculty Workload Report", lambda department_id: FacultyWorkloadReport()),
+        "popularity": ("Course Popularity Report", lambda department_id: CoursePopularityReport()),
+        "business-capacity": ("Business School High Capacity Report", None)
+    }
+
+    def stream_report(self, report_type, department_id=None):
+        """Report rows for a streaming export; `rows` is a lazy iterable of dicts"""
+        if report_type not in self.EXPORTS:
+            return {"status": "Error", "message": "Invalid report type"}
+        title, factory = self.EXPORTS[report_type]
+        if factory is None:
+            # Small, summarised report: computed up front
+            result = self.get_business_school_high_capacity_report()
+            if result["status"] != "Success":
+                return result
+            return {"status": "Success", "title": title, "rows": result["data"]}
+        try:
+            report = factory(department_id)
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        return {"status": "Success", "title": title, "rows": self._stream_rows(report)}
+
+    def _stream_rows(self, report):
+        """Read a report through an unbuffered cursor on a dedicated connection.
+
+        Iterated while the response is being sent, after the request's unit of
+        work has finished.
+        """
+        conn = self.db.get_dedicated_connection()
+        try:
+            cursor = conn.cursor(buffered=False)
+            try:
+                yield from report.iterData(cursor)
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+
     def get_comprehensive_analytics_dashboard(self):
         """Get all analytics data for a comprehensive dashboard"""
         try:
-            # Get all different types of reports
-            enrollment_stats = self.get_enrollment_statistics_by_department()
-            faculty_workload = self.get_faculty_workload_report()
-            course_popularity = self.get_course_popularity_trends(limit=5)
-            high_capacity = self.get_high_capacity_courses(threshold_percentage=85)
-            department_analytics = self.get_department_analytics()
-            
-            return {
-                "status": "Success",
-                "data": {
-                    "enrollmentStatistics": enrollment_stats.get("data", []),
-                    "facultyWorkload": faculty_workload.get("data", []),
-                    "popularCourses": course_popularity.get("data", []),
-                    "highCapacityCourses": high_capacity.get("data", []),
-                    "departmentAnalytics": department_analytics.get("data", [])
-                }
-            }
+            # One read of the catalog feeds every section (see DashboardEngine)
+            engine = DashboardEngine(popular_limit=5, high_capacity_threshold=85)
+            return {"status": "Success", "data": engine.build(self.cursor)}
         except Exception as e:
             return {"status": "Error", "message": str(e)}
 
@@ -1,3 +1,5 @@
+import csv
+import io
 from backend.dal.enrollment import Enrollment
 
 
@@ -47,6 +49,22 @@ class RosterService:
             cursor.close()
             conn.close()
 
+    def get_class_roster_page(self, faculty_id, course_id, fields=None, after=None, limit=50):
+        """One keyset page of a class roster, projected to `fields`"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            result = self.enrollment.get_class_roster_page(cursor, faculty_id, course_id, fields, after, limit)
+            return result, 200 if result["status"] == "Success" else 400
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_faculty_courses(self, faculty_id):
         """Get all courses taught by a faculty member"""
         conn = self.db.get_db_connection()
@@ -77,18 +95,91 @@ class RosterService:
             conn.close()
 
     def export_roster_csv(self, faculty_id, course_id):
-        """Export roster to CSV format"""
-        result = self.get_class_roster(faculty_id, course_id)
-        
-        if result["status"] == "Success" and result.get("students"):
-            csv_content = "Student ID,Name,Email,Phone,Enrollment Status,Mark Status\n"
-            for student in result["students"]:
-                csv_content += f'{student["id"]},"{student["name"]}",{student["email"]},{student["phone"]},{student["enrollment_status"]},{student["mark_status"]}\n'
-            
-            return {
-                "status": "Success",
-                "content": csv_content,
-                "filename": f'{result["course"].replace(" ", "_")}_roster.csv'
-            }
-        else:
-            return {"status": "Error", "message": "No data to export"}
+        """Export roster to CSV format; `content` is a generator of CSV chunks"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            course_info = self.enrollment.get_roster_course_info(cursor, faculty_id, course_id)
+            if not course_info or not self.enrollment.has_active_enrollments(cursor, course_id):
+                return {"status": "Error", "message": "No data to export"}
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+        return {
+            "status": "Success",
+            "content": self._stream_roster_csv(
+                ["Student ID", "Name", "Email", "Phone", "Enrollment Status", "Mark Status"],
+                lambda row: row[2:3] + self._student_columns(row),
+                course_ids=[course_id]
+            ),
+            "filename": f'{course_info[1].replace(" ", "_")}_roster.csv'
+        }
+
+    def export_rosters_csv(self, course_ids=None, dept_id=None, faculty_id=None):
+        """Export the rosters of several courses or a whole department as one CSV stream.
+
+        With faculty_id only courses that faculty member teaches are exported;
+        without it (admins) every matching course is.
+        """
+        if not course_ids and dept_id is None:
+            return {"status": "Error", "message": "course_id or dept_id is required"}
+
+        if faculty_id is not None and course_ids:
+            conn = self.db.get_db_connection()
+            cursor = conn.cursor()
+            try:
+                for course_id in course_ids:
+                    if not self.enrollment.get_roster_course_info(cursor, faculty_id, course_id):
+                        return {"status": "Error", "message": f"Course {course_id} not found or access denied"}
+            except Exception as e:
+                return {"status": "Error", "message": str(e)}
+            finally:
+                cursor.close()
+                conn.close()
+
+        return {
+            "status": "Success",
+            "content": self._stream_roster_csv(
+                ["Course ID", "Course", "Student ID", "Name", "Email", "Phone", "Enrollment Status", "Mark Status"],
+                lambda row: row[0:3] + self._student_columns(row),
+                course_ids=course_ids, dept_id=dept_id, faculty_id=faculty_id
+            ),
+            "filename": f"department_{dept_id}_rosters.csv" if dept_id is not None else "rosters.csv"
+        }
+
+    @staticmethod
+    def _student_columns(row):
+        # Name, Email, Phone, Enrollment Status, Mark Status from an iter_roster_rows row
+        return (f"{row[3]} {row[4]}", row[5], row[6] if row[6] else "N/A", row[7], row[8])
+
+    def _stream_roster_csv(self, header, to_columns, course_ids=None, dept_id=None, faculty_id=None, chunk_rows=200):
+        """Yield CSV text in chunks of rows read from an unbuffered cursor.
+
+        Runs while the response is being sent, after the request's unit of work
+        has finished, so it reads on a dedicated connection of its own.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+
+        conn = self.db.get_dedicated_connection()
+        try:
+            cursor = conn.cursor(buffered=False)
+            try:
+                rows = self.enrollment.iter_roster_rows(cursor, course_ids, dept_id, faculty_id)
+                for count, row in enumerate(rows, 1):
+                    writer.writerow(to_columns(row))
+                    if count % chunk_rows == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                yield buffer.getvalue()
+            finally:
+                cursor.close()
+        finally:
+            # A stream abandoned mid-way leaves unread rows; the pool discards that connection
+            conn.close()
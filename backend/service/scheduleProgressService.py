@@ -1,4 +1,5 @@
 from backend.dal.scheduleProgress import ScheduleProgress
+from backend.dal.scheduleCache import get_cached_schedule, cache_schedule, schedule_generation
 from backend.dal.dbconfig import dbconfig
 
 class ScheduleProgressService:
@@ -9,7 +10,13 @@ class ScheduleProgressService:
     # ============ SCHEDULE MANAGEMENT SERVICES ============
     
     def get_student_schedule(self, student_id, semester_id=None):
-        """Get student's schedule with error handling and data formatting"""
+        """Get student's schedule with error handling and data formatting (cached per student and semester)"""
+        cached = get_cached_schedule(student_id, semester_id)
+        if cached is not None:
+            return cached
+        # Taken before the read, so a concurrent enroll or drop keeps the result out of the cache
+        generation = schedule_generation()
+
         try:
             conn = self.db.get_db_connection()
             cursor = conn.cursor()
@@ -27,15 +34,17 @@ class ScheduleProgressService:
             schedule_data = self.schedule_progress_dal.get_student_schedule(cursor, student_id, semester_id)
             
             if not schedule_data:
-                return {
+                result = {
                     "status": "Success",
                     "message": "No schedule found for the specified semester",
                     "data": [],
                     "weekly_grid": self._empty_weekly_grid()
                 }
+                cache_schedule(student_id, semester_id, result, generation)
+                return result
             
-            # Get weekly grid format
-            weekly_grid = self.schedule_progress_dal.get_weekly_schedule_grid(cursor, student_id, semester_id)
+            # Weekly grid format, from the same rows
+            weekly_grid = self.schedule_progress_dal.build_weekly_schedule_grid(schedule_data)
             
             # Format schedule data for API response
             formatted_schedule = []
@@ -56,12 +65,14 @@ class ScheduleProgressService:
                 }
                 formatted_schedule.append(formatted_course)
             
-            return {
+            result = {
                 "status": "Success",
                 "message": "Schedule retrieved successfully",
                 "data": formatted_schedule,
                 "weekly_grid": weekly_grid
             }
+            cache_schedule(student_id, semester_id, result, generation)
+            return result
             
         except Exception as e:
             # Try fallback simplified schedule
@@ -223,12 +234,22 @@ class ScheduleProgressService:
 
     # ============ ACADEMIC PROGRESS SERVICES ============
     
-    def get_student_academic_progress(self, student_id):
-        """Get comprehensive academic progress information"""
+    def get_student_academic_progress(self, student_id, summary_only=False):
+        """Get comprehensive academic progress information (summary_only: just the StudentProgress row)"""
         try:
             conn = self.db.get_db_connection()
             cursor = conn.cursor()
             
+            if summary_only:
+                progress_data = self.schedule_progress_dal.get_student_progress(cursor, student_id)
+                if not progress_data:
+                    return self._get_simplified_progress(cursor, student_id)
+                return {
+                    "status": "Success",
+                    "message": "Academic progress retrieved successfully",
+                    "data": self._format_progress_summary(progress_data)
+                }
+            
             # Check if AcademicSemester table exists
             cursor.execute("SHOW TABLES LIKE 'AcademicSemester'")
             semester_table_exists = cursor.fetchone()
@@ -256,22 +277,7 @@ class ScheduleProgressService:
             
             # Format the response
             formatted_progress = {
-                'student_info': {
-                    'student_id': progress_data[0],
-                    'student_name': progress_data[1],
-                    'degree_name': progress_data[2],
-                    'degree_id': progress_data[3],
-                    'year_of_study': progress_data[4]
-                },
-                'academic_summary': {
-                    'completed_courses': progress_data[5],
-                    'completed_credits': float(progress_data[6]) if progress_data[6] else 0.0,
-                    'gpa': round(float(progress_data[7]), 2) if progress_data[7] else 0.0,
-                    'current_courses': progress_data[8],
-                    'current_credits': float(progress_data[9]) if progress_data[9] else 0.0,
-                    'total_degree_credits': float(progress_data[10]) if progress_data[10] else 0.0,
-                    'progress_percentage': round(float(progress_data[11]), 2) if progress_data[11] else 0.0
-                },
+                **self._format_progress_summary(progress_data),
                 'completed_courses': self._format_completed_courses(completed_courses),
                 'pending_requirements': self._format_pending_requirements(pending_requirements),
                 'semester_statistics': self._format_semester_statistics(semester_stats),
@@ -323,6 +329,27 @@ class ScheduleProgressService:
             if 'conn' in locals():
                 conn.close()
     
+    def _format_progress_summary(self, progress_data):
+        """student_info and academic_summary from a StudentProgress row"""
+        return {
+            'student_info': {
+                'student_id': progress_data[0],
+                'student_name': progress_data[1],
+                'degree_name': progress_data[2],
+                'degree_id': progress_data[3],
+                'year_of_study': progress_data[4]
+            },
+            'academic_summary': {
+                'completed_courses': progress_data[5],
+                'completed_credits': float(progress_data[6]) if progress_data[6] else 0.0,
+                'gpa': round(float(progress_data[7]), 2) if progress_data[7] else 0.0,
+                'current_courses': progress_data[8],
+                'current_credits': float(progress_data[9]) if progress_data[9] else 0.0,
+                'total_degree_credits': float(progress_data[10]) if progress_data[10] else 0.0,
+                'progress_percentage': round(float(progress_data[11]), 2) if progress_data[11] else 0.0
+            }
+        }
+    
     def _get_simplified_progress(self, cursor, student_id):
         """Get simplified progress without complex tables"""
         try:
@@ -583,6 +610,10 @@ class ScheduleProgressService:
 
     # ============ VALIDATION METHODS ============
     
+    def get_cached_schedule(self, student_id, semester_id=None):
+        """The cached schedule response, or None; only students that passed validation are cached"""
+        return get_cached_schedule(student_id, semester_id)
+
     def validate_student_access(self, student_id):
         """Validate if student exists and has access"""
         try:
@@ -50,6 +50,21 @@ class StudentService:
             cursor.close()
             conn.close()
     
+    def get_students_page(self, fields=None, after=None, limit=50):
+        """One keyset page of students, projected to `fields`"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            return {"status": "Success", **self.student.get_students_page(cursor, fields, after, limit)}, 200
+        except ValueError as e:
+            return {"status": "Error", "message": str(e)}, 400
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}, 500
+        finally:
+            cursor.close()
+            conn.close()
+
     def updateStudent(self, user_id, firstName=None, lastName=None, email=None, mobileNo=None, yearOfStudy=None, degreeID=None):
         try:
             result = self.student.update_user(user_id, firstName, lastName, email, mobileNo, yearOfStudy, degreeID)
@@ -0,0 +1,97 @@
+from bisect import bisect_left
+from datetime import datetime, time
+
+
+def to_minutes(value):
+    """Minutes since midnight for TIME columns (timedelta, time or 'HH:MM:SS')"""
+    if isinstance(value, (time, datetime)):
+        return value.hour * 60 + value.minute + value.second / 60
+    if hasattr(value, "total_seconds"):
+        return value.total_seconds() / 60
+    hours, minutes, *seconds = str(value).split(":")
+    return int(hours) * 60 + int(minutes) + (float(seconds[0]) / 60 if seconds else 0)
+
+
+def conflict_label(conflict):
+    """Display name of a (course_id, course_name) conflict; unnamed courses fall back to their id"""
+    course_id, course_name = conflict
+    return course_name or f"course {course_id}"
+
+
+class WeeklyIntervalIndex:
+    """Per-day sorted meeting intervals with O(log n) overlap lookup.
+
+    Each day keeps meetings sorted by start minute plus a running maximum of end
+    minutes, so "does [start, end) overlap anything?" is one bisect: among the
+    meetings starting before `end`, the one with the latest end decides.
+    """
+
+    def __init__(self):
+        self._pending = {}  # day -> [(start, end, course_id, course_name)]
+        self._days = {}     # day -> (starts, running_max_end, running_max_index, meetings)
+
+    @classmethod
+    def from_schedule(cls, schedule_rows):
+        """Build from Enrollment.get_student_current_schedule rows"""
+        index = cls()
+        for course_id, course_name, day, start_time, end_time in schedule_rows:
+            index.add(day, start_time, end_time, course_id, course_name)
+        return index
+
+    def add(self, day, start_time, end_time, course_id=None, course_name=None):
+        """Add one meeting; rows without a day or time (unscheduled courses) are ignored"""
+        if not day or start_time is None or end_time is None:
+            return
+        day = self._day_key(day)
+        self._pending.setdefault(day, []).append(
+            (to_minutes(start_time), to_minutes(end_time), course_id, course_name)
+        )
+        self._days.pop(day, None)
+
+    def find_conflict(self, day, start_time, end_time):
+        """Return (course_id, course_name) of a meeting overlapping the slot, or None"""
+        if not day or start_time is None or end_time is None:
+            return None
+        entry = self._get_day(self._day_key(day))
+        if entry is None:
+            return None
+
+        starts, running_max_end, running_max_index, meetings = entry
+        start, end = to_minutes(start_time), to_minutes(end_time)
+        count = bisect_left(starts, end)  # meetings starting before the slot ends
+        if count and running_max_end[count - 1] > start:
+            _, _, course_id, course_name = meetings[running_max_index[count - 1]]
+            return course_id, course_name
+        return None
+
+    def find_course_conflict(self, course_meetings):
+        """Return (course_id, course_name) of the first course clashing with any (day, start, end) meeting, or None"""
+        for day, start_time, end_time in course_meetings:
+            conflict = self.find_conflict(day, start_time, end_time)
+            if conflict is not None:
+                return conflict
+        return None
+
+    def meetings(self, day):
+        """Meetings on a day sorted by start time as (start, end, course_id, course_name)"""
+        entry = self._get_day(self._day_key(day))
+        return list(entry[3]) if entry else []
+
+    def _get_day(self, day):
+        entry = self._days.get(day)
+        if entry is None and day in self._pending:
+            meetings = sorted(self._pending[day], key=lambda meeting: (meeting[0], meeting[1]))
+            starts = [meeting[0] for meeting in meetings]
+            running_max_end, running_max_index = [], []
+            best_end, best_index = float("-inf"), -1
+            for i, meeting in enumerate(meetings):
+                if meeting[1] > best_end:
+                    best_end, best_index = meeting[1], i
+                running_max_end.append(best_end)
+                running_max_index.append(best_index)
+            entry = (starts, running_max_end, running_max_index, meetings)
+            self._days[day] = entry
+        return entry
+
+    def _day_key(self, day):
+        return str(day).strip().title()
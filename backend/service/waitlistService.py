@@ -0,0 +1,111 @@
+import mysql.connector
+from mysql.connector import errorcode
+from backend.dal.waitlist import Waitlist
+from backend.dal.enrollment import Enrollment
+from backend.dal.course import Course
+from backend.service.eligibilityService import EligibilityService
+
+
+class WaitlistService:
+    def __init__(self, db):
+        self.db = db
+        self.waitlist = Waitlist(self.db)
+        self.enrollment = Enrollment(self.db)
+        self.course = Course(self.db)
+        self.eligibility = EligibilityService(self.db)
+
+    def join_waitlist(self, student_id, course_id):
+        """Put an eligible student at the end of a full course's waitlist"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            course_data = self.course.getCourseById(cursor, course_id)
+            if not course_data:
+                return {"status": "Error", "message": "Course not found"}
+            if course_data[4] > 0:
+                return {"status": "Error", "message": "Course has available seats, enroll directly"}
+            if self.enrollment.check_existing_enrollment(cursor, student_id, course_id):
+                return {"status": "Error", "message": "Student is already enrolled in this course"}
+            if self.waitlist.get_entry(cursor, student_id, course_id) is not None:
+                return {"status": "Error", "message": "Student is already on the waitlist for this course"}
+
+            # Same rules as enrolling (prerequisites, year, time conflicts), seats aside
+            eligibility = self.eligibility.validate_course(cursor, student_id, course_id, check_capacity=False)
+            if not eligibility["can_enroll"]:
+                return {
+                    "status": "Error",
+                    "message": "Student is not eligible for this course: " + "; ".join(eligibility["issues"]),
+                    "issues": eligibility["issues"]
+                }
+
+            try:
+                waitlist_id = self.waitlist.add_student(cursor, conn, student_id, course_id)
+            except mysql.connector.IntegrityError as e:
+                # A concurrent join won the unique key on waiting entries
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                conn.rollback()
+                return {"status": "Error", "message": "Student is already on the waitlist for this course"}
+            position = self.waitlist.get_position(cursor, course_id, waitlist_id)
+            return {"status": "Success", "message": "Added to waitlist", "position": position}
+        except Exception as e:
+            conn.rollback()
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def leave_waitlist(self, student_id, course_id):
+        """Take a student off a course waitlist"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            if not self.waitlist.remove_student(cursor, conn, student_id, course_id):
+                return {"status": "Error", "message": "Student is not on the waitlist for this course"}
+            return {"status": "Success", "message": "Removed from waitlist"}
+        except Exception as e:
+            conn.rollback()
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_waitlist_position(self, student_id, course_id):
+        """A student's place in line and the total queue length"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            waitlist_id = self.waitlist.get_entry(cursor, student_id, course_id)
+            if waitlist_id is None:
+                return {"status": "Error", "message": "Student is not on the waitlist for this course"}
+            return {
+                "status": "Success",
+                "position": self.waitlist.get_position(cursor, course_id, waitlist_id),
+                "waiting": self.waitlist.get_waiting_count(cursor, course_id)
+            }
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_course_waitlist(self, course_id):
+        """Waiting students for a course in queue order"""
+        conn = self.db.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            students = [
+                {"position": position, "student_id": student_id, "name": name, "email": email}
+                for position, (student_id, name, email)
+                in enumerate(self.waitlist.get_waitlisted_students(cursor, course_id), start=1)
+            ]
+            return {"status": "Success", "data": students}
+        except Exception as e:
+            return {"status": "Error", "message": str(e)}
+        finally:
+            cursor.close()
+            conn.close()
@@ -0,0 +1,134 @@
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+ROOT_LOGGER = "nexusenroll"
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and the record's fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in N records per high-volume event type; warnings and errors always pass"""
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        event = (getattr(record, "fields", None) or {}).get("event")
+        rate = self.rates.get(event)
+        if not rate or rate <= 1:
+            return True
+        with self._lock:
+            counter = self._counters.setdefault(event, itertools.count())
+            return next(counter) % rate == 0
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueues the record untouched so message formatting happens on the writer thread"""
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+_configure_lock = threading.RLock()
+
+
+def parse_sample_rates(value):
+    """'ENROLLMENT_SUCCESSFUL=10,ENROLLMENT_CONFIRMATION=20' -> {event: rate}"""
+    rates = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            event, rate = item.split("=", 1)
+            rates[event.strip()] = int(rate)
+    return rates
+
+
+def configure_logging(level=None, path=None, sample_rates=None, stream=None):
+    """Route every nexusenroll.* logger through a queue to a background JSON-lines writer.
+
+    Defaults come from NEXUS_LOG_LEVEL, NEXUS_LOG_FILE and NEXUS_LOG_SAMPLE.
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+
+        if path or os.getenv("NEXUS_LOG_FILE"):
+            output = RotatingFileHandler(path or os.getenv("NEXUS_LOG_FILE"), maxBytes=20 * 1024 * 1024,
+                                         backupCount=5, encoding="utf-8")
+        else:
+            output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonLineFormatter())
+
+        records = queue.SimpleQueue()
+        handler = _DeferredQueueHandler(records)
+        handler.addFilter(SamplingFilter(
+            sample_rates if sample_rates is not None else parse_sample_rates(os.getenv("NEXUS_LOG_SAMPLE"))
+        ))
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers = [handler]
+        root.setLevel(level or os.getenv("NEXUS_LOG_LEVEL", "INFO").upper())
+        root.propagate = False
+
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name):
+    """Logger under the nexusenroll root, configuring the pipeline on first use"""
+    if _listener is None:
+        with _configure_lock:
+            if _listener is None:
+                configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, level, msg, /, event=None, **fields):
+    """Log a structured record; nothing is built or formatted when the level is disabled"""
+    if logger.isEnabledFor(level):
+        if event is not None:
+            fields["event"] = event
+        logger.log(level, msg, extra={"fields": fields})
+
+
+# Registered at import, so it runs after exit hooks registered later (such as the
+# notification dispatcher drain) and their final records are still written
+atexit.register(shutdown_logging)
@@ -0,0 +1,122 @@
+"""
+Concurrent enrollment stress test.
+
+Fires many enroll calls at one course from a thread pool and checks that the
+course was never oversold. Run against a test database:
+
+    python -m backend.tools.enrollmentStress --course 5 --students 100-499 --concurrency 50 --cleanup
+
+Exits with status 1 if more students were enrolled than there were seats.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.dal.dbconfig import dbconfig
+from backend.dal.studentProgress import StudentProgress
+from backend.service.enrollmentService import EnrollmentService
+
+
+def parse_student_ids(value):
+    """Accept '100-499' or '101,102,103'"""
+    if "-" in value:
+        first, last = value.split("-", 1)
+        return list(range(int(first), int(last) + 1))
+    return [int(student_id) for student_id in value.split(",") if student_id]
+
+
+def read_course_state(db, course_id):
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT capacity, availableSeats FROM Course WHERE course_id = %s", (course_id,))
+        capacity, available_seats = cursor.fetchone()
+        cursor.execute(
+            "SELECT COUNT(*) FROM Enrollment WHERE course_id = %s AND enrollmentStatus = 'Active'",
+            (course_id,)
+        )
+        active_enrollments = cursor.fetchone()[0]
+        return capacity, available_seats, active_enrollments
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def cleanup(db, course_id, student_ids):
+    """Drop the enrollments created by this run and give the seats back"""
+    if not student_ids:
+        return
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(student_ids))
+        cursor.execute(
+            f"""UPDATE Enrollment SET enrollmentStatus = 'Dropped'
+            WHERE course_id = %s AND enrollmentStatus = 'Active' AND student_id IN ({placeholders})""",
+            (course_id, *student_ids)
+        )
+        cursor.execute(
+            "UPDATE Course SET availableSeats = availableSeats + %s WHERE course_id = %s",
+            (cursor.rowcount, course_id)
+        )
+        StudentProgress(db).refresh_students(cursor, student_ids)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent enrollment oversell check")
+    parser.add_argument("--course", type=int, required=True, help="course_id to enroll into")
+    parser.add_argument("--students", required=True, help="student IDs, e.g. 100-499 or 1,2,3")
+    parser.add_argument("--concurrency", type=int, default=50, help="parallel enroll calls")
+    parser.add_argument("--cleanup", action="store_true", help="drop created enrollments afterwards")
+    args = parser.parse_args(argv)
+
+    student_ids = parse_student_ids(args.students)
+    dbconfig.configure_pool(max_size=args.concurrency + 2, checkout_timeout=30)
+    db = dbconfig()
+
+    capacity, seats_before, active_before = read_course_state(db, args.course)
+    print(f"Course {args.course}: capacity={capacity} availableSeats={seats_before} active={active_before}")
+    print(f"Enrolling {len(student_ids)} students with concurrency {args.concurrency}...")
+
+    def enroll(student_id):
+        started = time.perf_counter()
+        result = EnrollmentService(db).enroll_student_in_course(student_id, args.course)
+        return student_id, result, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(enroll, student_ids))
+    elapsed = time.perf_counter() - started
+
+    enrolled = [student_id for student_id, result, _ in outcomes if result["status"] == "Success"]
+    latencies = sorted(latency for _, _, latency in outcomes)
+    failures = {}
+    for _, result, _ in outcomes:
+        if result["status"] != "Success":
+            failures[result.get("message", "Unknown")] = failures.get(result.get("message", "Unknown"), 0) + 1
+
+    _, seats_after, active_after = read_course_state(db, args.course)
+    oversold = seats_after < 0 or active_after > capacity or len(enrolled) > seats_before
+
+    print(f"Finished {len(outcomes)} calls in {elapsed:.2f}s ({len(outcomes) / elapsed:.1f} calls/s)")
+    print(f"Latency p50={latencies[len(latencies) // 2] * 1000:.1f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"Enrolled: {len(enrolled)} (seats before: {seats_before}, seats after: {seats_after}, "
+          f"active enrollments: {active_after}/{capacity})")
+    for message, count in sorted(failures.items(), key=lambda item: -item[1]):
+        print(f"  rejected x{count}: {message}")
+    print("OVERSOLD" if oversold else "No oversell")
+
+    if args.cleanup:
+        cleanup(db, args.course, enrolled)
+        print(f"Cleaned up {len(enrolled)} enrollments")
+
+    return 1 if oversold else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Creates the tables NexusEnroll adds to the base schema.
+
+    python -m backend.tools.schema          # create the missing tables
+    python -m backend.tools.schema --sql    # print the DDL instead of running it
+
+Run it on deploy, before starting the application. Every statement is
+idempotent: tables are created only if missing. The application never runs
+DDL itself, since MySQL commits implicitly on DDL.
+"""
+import argparse
+import sys
+import textwrap
+from backend.dal.dbconfig import dbconfig
+from backend.dal.gradeAuditLog import GradeAuditLog
+from backend.dal.studentProgress import StudentProgress
+from backend.dal.waitlist import Waitlist
+
+# DAL classes owning a table, each with TABLE and CREATE_TABLE
+TABLES = [Waitlist, GradeAuditLog, StudentProgress]
+
+
+def print_sql(args):
+    for table in TABLES:
+        print(textwrap.dedent(table.CREATE_TABLE).strip() + ";\n")
+    return 0
+
+
+def apply(args):
+    db = dbconfig()
+    conn = db.get_dedicated_connection()
+    cursor = conn.cursor()
+    try:
+        for table in TABLES:
+            cursor.execute(table.CREATE_TABLE)
+            print(f"{table.TABLE}: ready")
+        conn.commit()
+        return 0
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create the tables NexusEnroll adds to the base schema")
+    parser.add_argument("--sql", action="store_true", help="print the DDL instead of running it")
+    args = parser.parse_args(argv)
+    return print_sql(args) if args.sql else apply(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
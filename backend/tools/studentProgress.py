@@ -0,0 +1,80 @@
+"""
+Maintenance of the materialized StudentProgress table.
+
+    python -m backend.tools.studentProgress rebuild
+    python -m backend.tools.studentProgress check [--limit 1000] [--repair]
+    python -m backend.tools.studentProgress refresh 101 102 103
+
+`rebuild` recomputes every row from Enrollment and removes rows of deleted
+students. `check` compares the table with a fresh aggregation and exits with
+status 1 if any row is missing, stale or orphaned (unless --repair fixed them).
+"""
+import argparse
+import sys
+import time
+from backend.dal.dbconfig import dbconfig
+from backend.dal.studentProgress import StudentProgress
+
+
+def rebuild(progress, cursor, conn, args):
+    started = time.perf_counter()
+    counts = progress.rebuild(cursor, conn)
+    print(f"Rebuilt StudentProgress: {counts['rows']} rows, {counts['removed']} orphaned rows removed "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def check(progress, cursor, conn, args):
+    problems = progress.check_consistency(cursor, limit=args.limit)
+    for problem in problems:
+        details = ", ".join(
+            f"{column}: stored={values['stored']} expected={values['expected']}"
+            for column, values in problem.get("columns", {}).items()
+        )
+        print(f"student {problem['student_id']}: {problem['problem']}" + (f" ({details})" if details else ""))
+    if not problems:
+        print("StudentProgress is consistent")
+        return 0
+    print(f"{len(problems)} inconsistent row(s)" + (" (limit reached)" if len(problems) >= args.limit else ""))
+    if not args.repair:
+        return 1
+
+    progress.refresh_students(cursor, [p["student_id"] for p in problems if p["problem"] != "orphaned"])
+    removed = progress.remove_orphans(cursor)
+    conn.commit()
+    print(f"Repaired: refreshed {sum(p['problem'] != 'orphaned' for p in problems)} row(s), removed {removed}")
+    return 0
+
+
+def refresh(progress, cursor, conn, args):
+    progress.refresh_students(cursor, args.student_ids)
+    conn.commit()
+    print(f"Refreshed {len(set(args.student_ids))} student(s)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the StudentProgress table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="recompute every row").set_defaults(run=rebuild)
+    check_parser = commands.add_parser("check", help="compare the table with a fresh aggregation")
+    check_parser.add_argument("--limit", type=int, default=1000, help="maximum rows to report")
+    check_parser.add_argument("--repair", action="store_true", help="refresh or remove the inconsistent rows")
+    check_parser.set_defaults(run=check)
+    refresh_parser = commands.add_parser("refresh", help="recompute the rows of some students")
+    refresh_parser.add_argument("student_ids", type=int, nargs="+")
+    refresh_parser.set_defaults(run=refresh)
+    args = parser.parse_args(argv)
+
+    db = dbconfig()
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        return args.run(StudentProgress(db), cursor, conn, args)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())